@@ -1,5 +1,11 @@
 from logging.config import fileConfig
 
+# Los modelos de della_soft se importan antes que sqlmodel: en el otro orden
+# rx.Model falla con "metaclass conflict" al definirse
+import della_soft.models  # noqa: F401  registra todas las tablas
+from della_soft.repositories.ConnectDB import get_database_url
+from sqlmodel import SQLModel
+
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
@@ -12,13 +18,17 @@ config = context.config
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# La URL sale de las mismas variables que usa la app (DB_URL o
+# DB_USER/DB_PASSWORD/…); si no están definidas, se usa la de alembic.ini.
+try:
+    config.set_main_option("sqlalchemy.url", get_database_url().replace("%", "%%"))
+except RuntimeError:
+    pass
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+# metadata de los modelos SQLModel, para 'autogenerate'
+target_metadata = SQLModel.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
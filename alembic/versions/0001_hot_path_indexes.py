@@ -0,0 +1,55 @@
+"""Índices para los filtros más usados
+
+Revision ID: 0001_hot_path_indexes
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+Las tablas ya existen (las crea `init_db` o una versión anterior de la
+app); esta revisión solo agrega los índices. En PostgreSQL se crean con
+CREATE INDEX CONCURRENTLY, fuera de una transacción, para no bloquear las
+escrituras mientras se construyen. `if_not_exists` permite correrla sobre
+una base creada con los modelos actuales, que ya los tienen.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_hot_path_indexes"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nombre, tabla, columnas) – los nombres coinciden con los de `index=True`
+INDEXES = [
+    ("ix_product_order_id_order", "product_order", ["id_order"]),
+    ("ix_product_order_id_product", "product_order", ["id_product"]),
+    ("ix_transaction_transaction_date", "transaction", ["transaction_date"]),
+    ("ix_order_order_date", "order", ["order_date"]),
+    ("ix_order_delivery_date", "order", ["delivery_date"]),
+    ("ix_customer_username", "customer", ["username"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True,
+                            postgresql_concurrently=True)
+        # Solo se consulta el timbrado activo: índice parcial
+        op.create_index("ix_stamped_active", "stamped", ["active"], if_not_exists=True,
+                        postgresql_where=sa.text("active"),
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_stamped_active", table_name="stamped", if_exists=True,
+                      postgresql_concurrently=True)
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True,
+                          postgresql_concurrently=True)
@@ -0,0 +1,72 @@
+"""Una sola fila de stock por producto y por ingrediente
+
+Revision ID: 0002_unique_stock_rows
+Revises: 0001_hot_path_indexes
+Create Date: 2026-10-18 10:05:00
+
+El código asume una fila de stock por producto/ingrediente (insert_stock
+lo valida y los movimientos de stock actualizan "la" fila). En PostgreSQL
+se construye primero el índice único con CONCURRENTLY y luego se lo
+convierte en restricción (ADD CONSTRAINT … USING INDEX), que solo toma el
+lock un instante. Si ya hay filas duplicadas la migración se detiene y
+las informa para unificarlas a mano.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_unique_stock_rows"
+down_revision: Union[str, None] = "0001_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nombre, tabla, columna)
+CONSTRAINTS = [
+    ("uq_product_stock_product_id", "product_stock", "product_id"),
+    ("uq_ingredient_stock_ingredient_id", "ingredient_stock", "ingredient_id"),
+]
+
+
+def _check_duplicates(table: str, column: str) -> None:
+    if op.get_context().as_sql:
+        return   # modo offline: no hay conexión para verificar
+    duplicated = op.get_bind().execute(sa.text(
+        f"SELECT {column} FROM {table} GROUP BY {column} HAVING COUNT(*) > 1"
+    )).scalars().all()
+    if duplicated:
+        raise RuntimeError(
+            f"{table} tiene más de una fila para {column} = {duplicated}; "
+            "unificarlas antes de aplicar la migración."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgres = op.get_context().dialect.name == "postgresql"
+    for name, table, column in CONSTRAINTS:
+        _check_duplicates(table, column)
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, [column], unique=True, if_not_exists=True,
+                            postgresql_concurrently=True)
+        if postgres:
+            # Una base creada con los modelos actuales ya tiene la restricción
+            op.execute(
+                f"DO $$ BEGIN "
+                f"IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN "
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}; "
+                f"END IF; END $$"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_context().dialect.name == "postgresql"
+    for name, table, _ in reversed(CONSTRAINTS):
+        if postgres:
+            # Al quitar la restricción también se borra su índice
+            op.drop_constraint(name, table, type_="unique")
+        else:
+            op.drop_index(name, table_name=table, if_exists=True)
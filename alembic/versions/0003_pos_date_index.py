@@ -0,0 +1,33 @@
+"""Índice para buscar la caja por fecha
+
+Revision ID: 0003_pos_date_index
+Revises: 0002_unique_stock_rows
+Create Date: 2026-10-18 11:00:00
+
+get_by_pos_date filtra por el rango [día, día siguiente) sobre pos_date
+(en lugar de date(pos_date) = día), que puede usar un índice común.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_pos_date_index"
+down_revision: Union[str, None] = "0002_unique_stock_rows"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index("ix_pos_pos_date", "pos", ["pos_date"], if_not_exists=True,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_pos_pos_date", table_name="pos", if_exists=True,
+                      postgresql_concurrently=True)
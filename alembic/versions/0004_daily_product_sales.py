@@ -0,0 +1,68 @@
+"""Tabla de resumen daily_product_sales, con su carga inicial
+
+Revision ID: 0004_daily_product_sales
+Revises: 0003_pos_date_index
+Create Date: 2026-10-18 12:00:00
+
+El resumen diario de ventas por producto es una tabla nueva: sin ella
+fallan el guardado de pedidos (refresh_for_order corre en la misma
+transacción) y el dashboard en modo rollup. Se crea con su restricción
+única (sales_date, id_product), que usa el upsert de refresh_days, y se
+llena con un INSERT … SELECT propio (el mismo agregado que tenía
+`rebuild()` al escribir la migración, copiado para que no cambie si
+cambia el código de la app). Sobre una base creada con los modelos
+actuales la tabla ya existe y solo se recalcula su contenido.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_daily_product_sales"
+down_revision: Union[str, None] = "0003_pos_date_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "daily_product_sales"
+
+# Líneas de pedido agrupadas por (día, producto); date() existe en
+# PostgreSQL y en SQLite
+BACKFILL = f"""
+INSERT INTO {TABLE} (sales_date, id_product, quantity, revenue, order_count)
+SELECT date(o.order_date), po.id_product,
+       SUM(COALESCE(po.quantity, 0)),
+       SUM(COALESCE(po.quantity, 0) * p.price),
+       COUNT(DISTINCT po.id_order)
+FROM product_order po
+JOIN "order" o ON o.id = po.id_order
+JOIN product p ON p.id = po.id_product
+WHERE o.order_date IS NOT NULL
+GROUP BY date(o.order_date), po.id_product
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().as_sql or not sa.inspect(op.get_bind()).has_table(TABLE):
+        op.create_table(
+            TABLE,
+            sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+            sa.Column("sales_date", sa.Date(), nullable=False),
+            sa.Column("id_product", sa.Integer(), sa.ForeignKey("product.id"), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("revenue", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.UniqueConstraint("sales_date", "id_product"),
+        )
+        op.create_index("ix_daily_product_sales_sales_date", TABLE, ["sales_date"])
+    # Carga inicial en la transacción de la migración
+    op.execute(f"DELETE FROM {TABLE}")
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_daily_product_sales_sales_date", table_name=TABLE, if_exists=True)
+    op.drop_table(TABLE)
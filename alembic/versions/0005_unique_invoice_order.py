@@ -0,0 +1,67 @@
+"""Una sola factura por pedido
+
+Revision ID: 0005_unique_invoice_order
+Revises: 0004_daily_product_sales
+Create Date: 2026-10-18 14:00:00
+
+La facturación por lotes y la descarga de una factura comprueban que el
+pedido no tenga Invoice antes de insertarlo; sin restricción, dos
+procesos que lo comprueban a la vez emiten dos facturas (y consumen dos
+números) para el mismo pedido. Como en 0002, en PostgreSQL se construye
+el índice único con CONCURRENTLY y luego se lo convierte en restricción.
+Si ya hay pedidos con más de una factura la migración se detiene y los
+informa para anularlas a mano.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_unique_invoice_order"
+down_revision: Union[str, None] = "0004_daily_product_sales"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME = "uq_invoice_id_order"
+TABLE = "invoice"
+COLUMN = "id_order"
+
+
+def _check_duplicates() -> None:
+    if op.get_context().as_sql:
+        return   # modo offline: no hay conexión para verificar
+    duplicated = op.get_bind().execute(sa.text(
+        f"SELECT {COLUMN} FROM {TABLE} GROUP BY {COLUMN} HAVING COUNT(*) > 1"
+    )).scalars().all()
+    if duplicated:
+        raise RuntimeError(
+            f"{TABLE} tiene más de una factura para {COLUMN} = {duplicated}; "
+            "dejar una sola por pedido antes de aplicar la migración."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_duplicates()
+    with op.get_context().autocommit_block():
+        op.create_index(NAME, TABLE, [COLUMN], unique=True, if_not_exists=True,
+                        postgresql_concurrently=True)
+    if op.get_context().dialect.name == "postgresql":
+        # Una base creada con los modelos actuales ya tiene la restricción
+        op.execute(
+            f"DO $$ BEGIN "
+            f"IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{NAME}') THEN "
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {NAME} UNIQUE USING INDEX {NAME}; "
+            f"END IF; END $$"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == "postgresql":
+        # Al quitar la restricción también se borra su índice
+        op.drop_constraint(NAME, TABLE, type_="unique")
+    else:
+        op.drop_index(NAME, table_name=TABLE, if_exists=True)
@@ -10,7 +10,19 @@ from della_soft.views import POSView
 from della_soft.views import Login
 from della_soft.views import RegisterView
 from della_soft.repositories.LoginRepository import AuthState
+from della_soft.repositories.ConnectDB import init_db
+from della_soft.repositories.QueryStats import QueryStatsMiddleware
+from della_soft.services.EventProfiler import EventProfilerMiddleware, profile_endpoint
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+# Endpoints propios (fuera de las páginas de Reflex)
+api = Starlette(routes=[Route("/admin/event-stats", profile_endpoint)])
 
 #Publicación de páginas
-app = rx.App()
+app = rx.App(api_transformer=api)
+app.register_lifespan_task(init_db)  # create_all una sola vez al arrancar
+# El profiler va antes que QueryStats: lee el tiempo en BD del evento antes de que se cierre
+app.add_middleware(EventProfilerMiddleware())  # latencia por handler (ver EventProfiler)
+app.add_middleware(QueryStatsMiddleware())  # consultas SQL por evento (ver QueryStats)
 app.add_page(MenuView.menu, route="/menu", on_load=AuthState.load_roles_once)
@@ -24,7 +24,7 @@ class Customer(rx.Model, table=True):
     ci: str = Field(nullable=True)
     contact: str = Field(nullable=False)
     div: int | None = Field(default=None, nullable=True)
-    username: str | None = Field(default=None, nullable=True)
+    username: str | None = Field(default=None, nullable=True, index=True)
     password: str | None = Field(default=None, nullable=True)
     id_rol: int = Field(foreign_key="rol.id_rol", nullable=False) #Se declara FK de rol
 
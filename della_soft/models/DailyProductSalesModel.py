@@ -0,0 +1,25 @@
+from datetime import date
+import reflex as rx
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field
+
+
+class DailyProductSales(rx.Model, table=True):
+    """
+    Resumen diario de ventas por producto (tabla de agregados).
+
+    Se mantiene al registrar/editar las líneas de un pedido; se puede
+    reconstruir completa con
+    `python -m della_soft.scripts.rebuild_daily_sales`.
+    """
+
+    __tablename__ = "daily_product_sales"
+    __table_args__ = (UniqueConstraint("sales_date", "id_product"),)
+
+    id: int = Field(default=None, primary_key=True, nullable=False)
+    sales_date: date = Field(nullable=False, index=True)
+    id_product: int = Field(foreign_key="product.id", nullable=False)
+
+    quantity: int = Field(default=0, nullable=False)      # unidades vendidas
+    revenue: int = Field(default=0, nullable=False)       # cantidad × precio
+    order_count: int = Field(default=0, nullable=False)   # pedidos con el producto
@@ -1,4 +1,5 @@
 import reflex as rx
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship
 from typing import TYPE_CHECKING
 
@@ -8,6 +9,8 @@ if TYPE_CHECKING:
 
 class IngredientStock(rx.Model, table=True):
     __tablename__ = "ingredient_stock"
+    # Una sola fila de stock por ingrediente
+    __table_args__ = (UniqueConstraint("ingredient_id", name="uq_ingredient_stock_ingredient_id"),)
 
     id: int = Field(primary_key=True, default=None)
     ingredient_id: int = Field(foreign_key="ingredient.id", nullable=False)
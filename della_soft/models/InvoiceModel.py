@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, TYPE_CHECKING
 import reflex as rx
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship
 
 if TYPE_CHECKING:
@@ -12,6 +13,8 @@ if TYPE_CHECKING:
 class Invoice(rx.Model, table=True):
 
     __tablename__ = "invoice"
+    # Una sola factura por pedido
+    __table_args__ = (UniqueConstraint("id_order", name="uq_invoice_id_order"),)
 
     id: int = Field(default=None, primary_key=True, nullable=False)
 
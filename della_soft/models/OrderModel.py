@@ -24,8 +24,8 @@ class Order(rx.Model, table=True):
     observation: str = Field(nullable=True)
     total_order: int | None = Field(default=None, nullable=False)
     total_paid: int | None = Field(default=None, nullable=False)
-    order_date: datetime | None = Field(default=None, nullable=True)
-    delivery_date: datetime | None = Field(default=None, nullable=True)
+    order_date: datetime | None = Field(default=None, nullable=True, index=True)
+    delivery_date: datetime | None = Field(default=None, nullable=True, index=True)
     id_customer: int = Field(foreign_key="customer.id")
 
     order_detail: List["ProductOrder"] = Relationship(
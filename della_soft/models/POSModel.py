@@ -13,7 +13,7 @@ class POS(rx.Model, table=True):
     id: int = Field(default=None, primary_key=True, nullable=False)
     initial_amount: int = Field(nullable=False)
     final_amount: int = Field(nullable=False)
-    pos_date: datetime | None = Field(default=None, nullable=True)
+    pos_date: datetime | None = Field(default=None, nullable=True, index=True)
 
     transactions: Optional [List["Transaction"]] = Relationship(
         back_populates="pos"
@@ -13,8 +13,8 @@ class ProductOrder(rx.Model, table=True):
 
     id: int = Field(default=None, primary_key=True, nullable=False)
     quantity: int | None = Field(default=None, nullable=True)
-    id_product: int = Field(foreign_key="product.id")
-    id_order: int = Field(foreign_key="order.id")
+    id_product: int = Field(foreign_key="product.id", index=True)
+    id_order: int = Field(foreign_key="order.id", index=True)
 
     order: "Order" = Relationship(
         back_populates="order_detail"
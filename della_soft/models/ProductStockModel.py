@@ -1,4 +1,5 @@
 import reflex as rx
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship
 from typing import TYPE_CHECKING
 
@@ -7,6 +8,8 @@ if TYPE_CHECKING:
 
 class ProductStock(rx.Model, table=True):
     __tablename__ = "product_stock"
+    # Una sola fila de stock por producto
+    __table_args__ = (UniqueConstraint("product_id", name="uq_product_stock_product_id"),)
 
     id: int = Field(primary_key=True, default=None)
     product_id: int = Field(foreign_key="product.id", nullable=False)
@@ -1,6 +1,7 @@
 from datetime import date
 from typing import List, TYPE_CHECKING
 import reflex as rx
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship
 
 if TYPE_CHECKING:
@@ -10,6 +11,8 @@ if TYPE_CHECKING:
 class Stamped(rx.Model, table=True):
 
     __tablename__ = "stamped"
+    # Solo se busca el timbrado activo: índice parcial en PostgreSQL
+    __table_args__ = (Index("ix_stamped_active", "active", postgresql_where=text("active")),)
 
     id: int = Field(default=None, primary_key=True, nullable=False)
 
@@ -19,7 +19,7 @@ class Transaction(rx.Model, table=True):
     id: int = Field(default=None, primary_key=True, nullable=False)
     observation: str = Field(nullable=True)
     amount: int = Field(nullable=False)
-    transaction_date: datetime | None = Field(default=None, nullable=False)
+    transaction_date: datetime | None = Field(default=None, nullable=False, index=True)
     status: str = Field(nullable=False)
     id_POS: int = Field(foreign_key="pos.id")
     id_user: int = Field(foreign_key="customer.id")
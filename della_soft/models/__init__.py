@@ -12,4 +12,5 @@ from .IngredientModel import Ingredient
 from .MeasureModel import Measure
 from .RecipeDetailModel import RecipeDetail
 from .RecipeModel import Recipe
-from .StampedModel   import Stamped 
\ No newline at end of file
+from .StampedModel   import Stamped
+from .DailyProductSalesModel import DailyProductSales
\ No newline at end of file
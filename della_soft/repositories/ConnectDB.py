@@ -1,11 +1,61 @@
 # della_soft/repositories/ConnectDB.py
 import os
-from sqlmodel import create_engine, SQLModel
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv   # pip install python-dotenv
 
+from .QueryStats import instrument_engine
+
 load_dotenv()  # lee .env si existe
 
-def connect():
+# Engine único por proceso: se crea la primera vez que se pide y se reutiliza
+# (con su pool de conexiones) en todas las llamadas a los repositorios.
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+_schema_lock = threading.RLock()
+_schema_ready = False
+
+# Driver async equivalente a cada driver sync
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Contadores para benchmarks / diagnóstico
+_stats = {
+    "engines_created": 0,
+    "connections_created": 0,
+    "checkouts": 0,
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "si", "on")
+
+
+def get_database_url() -> str:
+    """Arma la URL de conexión a partir de las variables de entorno."""
+    url = os.getenv("DB_URL")
+    if url:
+        return url
+
     db_user = os.getenv("DB_USER")
     db_pass = os.getenv("DB_PASSWORD")
     db_host = os.getenv("DB_HOST", "localhost")
@@ -18,11 +68,169 @@ def connect():
             "Agrégalas a tu entorno o al archivo .env."
         )
 
-    url = f"postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-    engine = create_engine(url, pool_pre_ping=True, echo=False)
+    return f"postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+
+
+def get_async_database_url() -> str:
+    """URL para el engine async: ASYNC_DB_URL o la sync con driver asyncpg/aiosqlite."""
+    url = os.getenv("ASYNC_DB_URL")
+    if url:
+        return url
+    url = get_database_url()
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_pool_options() -> dict:
+    """Configuración del pool leída del entorno (DB_POOL_*)."""
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+def _on_connect(dbapi_connection, connection_record):
+    _stats["connections_created"] += 1
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _stats["checkouts"] += 1
+
+
+def init_db(engine=None) -> None:
+    """Crea las tablas una sola vez por proceso (solo en desarrollo)."""
+    global _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return
+        # Se marca antes de pedir el engine: get_engine() vuelve a llamar a
+        # init_db al crearlo y esa llamada anidada no debe repetir create_all.
+        _schema_ready = True
+        try:
+            # ⚠️ crea tablas solo en desarrollo
+            if os.getenv("ENV", "dev") == "dev":
+                SQLModel.metadata.create_all(engine or get_engine())
+        except Exception:
+            _schema_ready = False
+            raise
+
+
+def get_engine():
+    """Devuelve el engine compartido del proceso, creándolo la primera vez."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    get_database_url(), echo=False, **get_pool_options()
+                )
+                event.listen(engine, "connect", _on_connect)
+                event.listen(engine, "checkout", _on_checkout)
+                instrument_engine(engine)
+                _stats["engines_created"] += 1
+                _engine = engine
+        # fuera del lock: init_db toma el suyo y puede volver a pedir el engine
+        init_db(_engine)
+    return _engine
+
+
+def connect():
+    """Alias histórico: ya no crea un engine nuevo, devuelve el compartido."""
+    return get_engine()
+
+
+def get_async_engine():
+    """
+    Engine async compartido (asyncpg), para los repositorios de `repositories/aio`.
+
+    Sus conexiones quedan atadas al event loop que las abrió: en la app hay
+    un solo loop; en tests hay que llamar a `dispose_async_engine()` al final.
+    """
+    global _async_engine
+    if _async_engine is None:
+        init_db()
+        with _engine_lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    get_async_database_url(), echo=False, **get_pool_options()
+                )
+                event.listen(engine.sync_engine, "connect", _on_connect)
+                event.listen(engine.sync_engine, "checkout", _on_checkout)
+                instrument_engine(engine.sync_engine)
+                _stats["engines_created"] += 1
+                _async_engine = engine
+    return _async_engine
+
+
+def dispose_engine() -> None:
+    """Cierra el pool y olvida el engine (tests, fork de procesos)."""
+    global _engine, _async_engine, _schema_ready
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        if _async_engine is not None:
+            # sin loop: se descartan las conexiones sin cerrarlas ordenadamente
+            _async_engine.sync_engine.dispose(close=False)
+        _engine = None
+        _async_engine = None
+        _schema_ready = False
+
+
+async def dispose_async_engine() -> None:
+    """Cierra el pool async desde el loop que lo usó."""
+    global _async_engine
+    engine, _async_engine = _async_engine, None
+    if engine is not None:
+        await engine.dispose()
+
+
+def engine_stats() -> dict:
+    """Copia de los contadores de engines/conexiones creados."""
+    return dict(_stats)
+
+
+def reset_engine_stats() -> None:
+    for key in _stats:
+        _stats[key] = 0
+
+
+@contextmanager
+def session_scope(session: Session | None = None):
+    """
+    Sesión para una función de repositorio.
+
+    - Si se recibe `session` (unidad de trabajo de un service) se usa tal
+      cual: el commit/rollback lo decide quien la abrió.
+    - Si no, se abre una propia que se confirma al salir o se revierte si
+      hubo error.
+    """
+    if session is not None:
+        yield session
+        return
+
+    with Session(get_engine(), expire_on_commit=False) as own:
+        try:
+            yield own
+            own.commit()
+        except Exception:
+            own.rollback()
+            raise
+
 
-    # ⚠️ crea tablas solo en desarrollo
-    if os.getenv("ENV", "dev") == "dev":
-        SQLModel.metadata.create_all(engine)
+@asynccontextmanager
+async def async_session_scope(session: AsyncSession | None = None):
+    """Igual que `session_scope` pero con una AsyncSession del engine async."""
+    if session is not None:
+        yield session
+        return
 
-    return engine
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as own:
+        try:
+            yield own
+            await own.commit()
+        except Exception:
+            await own.rollback()
+            raise
@@ -1,58 +1,63 @@
 from ..models.CustomerModel import Customer
-from .ConnectDB import connect
+from .ConnectDB import get_engine
+from .KeysetPagination import KeysetPage, keyset_page
 from sqlmodel import Session, select, or_, String, func
 
 
  
 def select_all():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer)
         return session.exec(query).all()
     
 def select_all_users():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).where(
             Customer.id_rol != 3
         )
         return session.exec(query).all()
     
+def _customer_search(value: str):
+    return select(Customer).where(
+        or_(
+            Customer.first_name.ilike(f"%{value}%"),  # Busca coincidencias parciales en nombre
+            Customer.last_name.ilike(f"%{value}%"),   # Busca coincidencias parciales en apellido
+            Customer.ci.cast(String).ilike(f"%{value}%"),
+            Customer.contact.cast(String).ilike(f"%{value}%"),
+            Customer.div.cast(String).ilike(f"%{value}%") # Convierte ID a string y busca coincidencias
+        ))
+
+def _user_search(value: str):
+    return select(Customer).where(
+        or_(
+            Customer.first_name.ilike(f"%{value}%"),  # Busca coincidencias parciales en nombre
+            Customer.last_name.ilike(f"%{value}%"),   # Busca coincidencias parciales en apellido
+            Customer.username.cast(String).ilike(f"%{value}%"),
+            Customer.contact.cast(String).ilike(f"%{value}%"),
+        )).where(
+        Customer.id_rol != 3
+    )
+
 def select_by_parameter(value: str):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
-        query = select(Customer).where(
-            or_(
-                Customer.first_name.ilike(f"%{value}%"),  # Busca coincidencias parciales en nombre
-                Customer.last_name.ilike(f"%{value}%"),   # Busca coincidencias parciales en apellido
-                Customer.ci.cast(String).ilike(f"%{value}%"),
-                Customer.contact.cast(String).ilike(f"%{value}%"),
-                Customer.div.cast(String).ilike(f"%{value}%") # Convierte ID a string y busca coincidencias
-            ))
-        return session.exec(query).all()
+        return session.exec(_customer_search(value)).all()
     
 def select_users_by_parameter(value: str):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
-        query = select(Customer).where(
-            or_(
-                Customer.first_name.ilike(f"%{value}%"),  # Busca coincidencias parciales en nombre
-                Customer.last_name.ilike(f"%{value}%"),   # Busca coincidencias parciales en apellido
-                Customer.username.cast(String).ilike(f"%{value}%"),
-                Customer.contact.cast(String).ilike(f"%{value}%"),
-            )).where(
-            Customer.id_rol != 3
-        )
-        return session.exec(query).all()
+        return session.exec(_user_search(value)).all()
     
 def select_by_id(id: int):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).where(Customer.id == id)
         return session.exec(query).all()
     
 def create_customer(customer: Customer):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         print(customer)
         session.add(customer)
@@ -62,7 +67,7 @@ def create_customer(customer: Customer):
 
 def update_customer(customer: Customer):
     print(f'customer {customer}')
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).where(Customer.id == customer.id)
         c = session.exec(query).first()
@@ -79,7 +84,7 @@ def update_customer(customer: Customer):
 
 def update_user(customer: Customer):
     print(f'customer {customer}')
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).where(Customer.id == customer.id)
         c = session.exec(query).first()
@@ -98,7 +103,7 @@ def update_user(customer: Customer):
             return session.exec(query).all()
 
 def create_user(customer: Customer):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         session.add(customer)
         session.commit()
@@ -106,7 +111,7 @@ def create_user(customer: Customer):
         return session.exec(query).all()
     
 def delete_customer(id: int):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).where(Customer.id == id)
         user_delete = session.exec(query).one()
@@ -115,19 +120,31 @@ def delete_customer(id: int):
         return session.exec(query).all()
     
 def get_total_items():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         return session.exec(select(func.count(Customer.id))).one()
 
 def get_customer_section(offset: int, limit: int):
-    """Obtiene una lista de clientes con paginación usando OFFSET y LIMIT."""
-    engine = connect()
+    """Obtiene una lista de clientes con paginación usando OFFSET y LIMIT.
+
+    Para tablas grandes usar `get_customer_page` (keyset)."""
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).offset(offset).limit(limit)
         return session.exec(query).all()
     
+def get_customer_page(cursor: str | None = None, limit: int = 5) -> KeysetPage:
+    """Página de clientes por keyset sobre el id (el cursor reemplaza al offset)."""
+    engine = get_engine()
+    with Session(engine) as session:
+        return keyset_page(
+            session, select(Customer), Customer.id, Customer.id,
+            lambda c: (c.id, c.id),
+            cursor=cursor, limit=limit, scalars=True,
+        )
+
 def select_by_name(name: str) -> Customer:
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Customer).where(
             Customer.first_name.ilike(f"%{name}%") | Customer.last_name.ilike(f"%{name}%")
@@ -0,0 +1,134 @@
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select, func
+
+from .ConnectDB import session_scope
+from ..models.DailyProductSalesModel import DailyProductSales
+from ..models.OrderModel import Order
+from ..models.ProductModel import Product
+from ..models.ProductOrderModel import ProductOrder
+
+_ROLLUP_COLUMNS = ["sales_date", "id_product", "quantity", "revenue", "order_count"]
+_ROLLUP_VALUES = ["quantity", "revenue", "order_count"]
+
+# INSERT con ON CONFLICT según la BD (las dos lo soportan con la misma API)
+_UPSERT_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _aggregate_lines(start: datetime | None = None, end: datetime | None = None):
+    """SELECT de las líneas de pedido agrupadas por (día, producto) en [start, end)."""
+    day = func.date(Order.order_date)
+    quantity = func.coalesce(ProductOrder.quantity, 0)
+    query = (
+        select(
+            day,
+            ProductOrder.id_product,
+            func.sum(quantity),
+            func.sum(quantity * Product.price),
+            func.count(func.distinct(ProductOrder.id_order)),
+        )
+        .join(Order, Order.id == ProductOrder.id_order)
+        .join(Product, Product.id == ProductOrder.id_product)
+        .where(Order.order_date.is_not(None))
+        .group_by(day, ProductOrder.id_product)
+    )
+    if start is not None:
+        query = query.where(Order.order_date >= start)
+    if end is not None:
+        query = query.where(Order.order_date < end)
+    return query
+
+
+def _day_range(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def _lines_of_day(start: datetime, end: datetime):
+    """Productos con alguna línea de pedido en [start, end)."""
+    return (
+        select(ProductOrder.id_product)
+        .join(Order, Order.id == ProductOrder.id_order)
+        .where(Order.order_date >= start, Order.order_date < end)
+    )
+
+
+def refresh_days(days: Iterable[date], *, session: Session | None = None) -> None:
+    """
+    Recalcula el resumen de los días indicados:
+
+        INSERT … SELECT <agregado del día>
+        ON CONFLICT (sales_date, id_product) DO UPDATE SET quantity = excluded.quantity, …
+
+    y borra las filas de productos que ya no tienen líneas ese día. Corre
+    dentro de la transacción que guarda el pedido: con el upsert, dos cajas
+    que escriben el mismo día no chocan en la clave única (con DELETE +
+    INSERT las dos borraban y la segunda fallaba al insertar).
+    """
+    with session_scope(session) as session:
+        upsert = _UPSERT_INSERT[session.get_bind().dialect.name]
+        for day in sorted(set(days)):
+            start, end = _day_range(day)
+            stmt = upsert(DailyProductSales).from_select(_ROLLUP_COLUMNS, _aggregate_lines(start, end))
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=["sales_date", "id_product"],
+                set_={column: stmt.excluded[column] for column in _ROLLUP_VALUES},
+            ))
+            session.execute(
+                delete(DailyProductSales)
+                .where(DailyProductSales.sales_date == day)
+                .where(DailyProductSales.id_product.not_in(_lines_of_day(start, end)))
+            )
+        session.flush()
+
+
+def refresh_for_order(order_id: int, *, session: Session | None = None) -> None:
+    """Recalcula el día del pedido (tras guardar o cambiar sus líneas)."""
+    with session_scope(session) as session:
+        order_date = session.exec(select(Order.order_date).where(Order.id == order_id)).first()
+        if order_date is not None:
+            refresh_days([order_date.date()], session=session)
+
+
+def rebuild(start: date | None = None, end: date | None = None, *, session: Session | None = None) -> int:
+    """
+    Reconstruye el resumen completo, o solo los días en [start, end] si se indican.
+    Devuelve la cantidad de filas generadas.
+    """
+    start_dt = datetime.combine(start, time.min) if start else None
+    end_dt = datetime.combine(end + timedelta(days=1), time.min) if end else None
+    with session_scope(session) as session:
+        stmt = delete(DailyProductSales)
+        if start:
+            stmt = stmt.where(DailyProductSales.sales_date >= start)
+        if end:
+            stmt = stmt.where(DailyProductSales.sales_date <= end)
+        session.execute(stmt)
+        session.execute(
+            insert(DailyProductSales).from_select(_ROLLUP_COLUMNS, _aggregate_lines(start_dt, end_dt))
+        )
+        session.flush()
+        count = select(func.count(DailyProductSales.id))
+        if start:
+            count = count.where(DailyProductSales.sales_date >= start)
+        if end:
+            count = count.where(DailyProductSales.sales_date <= end)
+        return session.exec(count).one()
+
+
+def sold_by_product(start: date, end: date):
+    """Subconsulta (id_product, sold, revenue) sobre el resumen, días en [start, end)."""
+    return (
+        select(
+            DailyProductSales.id_product.label("id_product"),
+            func.sum(DailyProductSales.quantity).label("sold"),
+            func.sum(DailyProductSales.revenue).label("revenue"),
+        )
+        .where(DailyProductSales.sales_date >= start)
+        .where(DailyProductSales.sales_date < end)
+        .group_by(DailyProductSales.id_product)
+        .subquery()
+    )
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from sqlmodel import Session, select, func
+
+from .ConnectDB import get_engine
+from .DailySalesRepository import sold_by_product as rollup_sold_by_product
+from ..models.OrderModel import Order
+from ..models.ProductModel import Product
+from ..models.ProductOrderModel import ProductOrder
+from ..models.ProductStockModel import ProductStock
+
+
+def _sold_by_product(start: datetime, end: datetime, use_rollup: bool = False):
+    """
+    Unidades vendidas por producto en [start, end): desde el resumen
+    daily_product_sales o, con use_rollup=False, desde product_order → order.
+    """
+    if use_rollup:
+        return rollup_sold_by_product(start.date(), end.date())
+    return (
+        select(
+            ProductOrder.id_product.label("id_product"),
+            func.sum(ProductOrder.quantity).label("sold"),
+        )
+        .join(Order, Order.id == ProductOrder.id_order)
+        .where(Order.order_date >= start)
+        .where(Order.order_date < end)
+        .group_by(ProductOrder.id_product)
+        .subquery()
+    )
+
+
+def _first_stock_row():
+    """Fila de stock vigente por producto (la de menor id si hubiera varias)."""
+    return (
+        select(
+            ProductStock.product_id.label("product_id"),
+            func.min(ProductStock.id).label("stock_id"),
+        )
+        .group_by(ProductStock.product_id)
+        .subquery()
+    )
+
+
+def select_stock_rotation(start: datetime, end: datetime, use_rollup: bool = False) -> list[dict]:
+    """Por producto: nombre, stock actual y unidades vendidas en el rango."""
+    sold = _sold_by_product(start, end, use_rollup)
+    first = _first_stock_row()
+    engine = get_engine()
+    with Session(engine) as session:
+        query = (
+            select(
+                Product.id,
+                Product.name,
+                func.coalesce(ProductStock.quantity, 0).label("stock"),
+                func.coalesce(sold.c.sold, 0).label("sold"),
+            )
+            .outerjoin(first, first.c.product_id == Product.id)
+            .outerjoin(ProductStock, ProductStock.id == first.c.stock_id)
+            .outerjoin(sold, sold.c.id_product == Product.id)
+            .order_by(Product.id)
+        )
+        return [dict(row) for row in session.exec(query).mappings()]
+
+
+def select_top_products(start: datetime, end: datetime, limit: int = 5,
+                        use_rollup: bool = False) -> list[dict]:
+    """Los `limit` productos más vendidos en el rango (empate → menor id)."""
+    sold = _sold_by_product(start, end, use_rollup)
+    total = func.coalesce(sold.c.sold, 0)
+    engine = get_engine()
+    with Session(engine) as session:
+        query = (
+            select(Product.id, Product.name, total.label("sold"))
+            .outerjoin(sold, sold.c.id_product == Product.id)
+            .order_by(total.desc(), Product.id)
+            .limit(limit)
+        )
+        return [dict(row) for row in session.exec(query).mappings()]
+
+
+def select_orders_per_day(start: datetime, end: datetime) -> list[tuple]:
+    """(día, cantidad de pedidos) en [start, end); solo los días con pedidos."""
+    day = func.date(Order.order_date)
+    engine = get_engine()
+    with Session(engine) as session:
+        query = (
+            select(day.label("day"), func.count(Order.id).label("orders"))
+            .where(Order.order_date >= start)
+            .where(Order.order_date < end)
+            .group_by(day)
+            .order_by(day)
+        )
+        return [tuple(row) for row in session.exec(query).all()]
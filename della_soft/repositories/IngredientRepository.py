@@ -1,17 +1,17 @@
 # repositories/IngredientRepository.py
 from sqlmodel import Session, select, or_
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 from ..models.IngredientModel import Ingredient
 
 from sqlalchemy.orm import joinedload
 from sqlmodel import select, Session
 from ..models.IngredientModel import Ingredient
-from .ConnectDB import connect        # tu helper
+from .ConnectDB import get_engine        # tu helper
 
 def select_all(*, session: Session | None = None):
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         stmt = (
@@ -26,7 +26,7 @@ def select_all(*, session: Session | None = None):
 
 
 def get_ingredient(value: str) -> list[Ingredient]:   # 👈 quitar async
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Ingredient).where(
             or_(Ingredient.name.ilike(f"%{value}%"))
@@ -34,7 +34,7 @@ def get_ingredient(value: str) -> list[Ingredient]:   # 👈 quitar async
         return session.exec(query).all()
     
 def insert_ingredient(ingredient: Ingredient):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         session.add(ingredient)
         session.commit()
@@ -43,7 +43,7 @@ def insert_ingredient(ingredient: Ingredient):
     
 
 def update_ingredient(ingredient: Ingredient):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         merged = session.merge(ingredient)  
         session.commit()
@@ -2,14 +2,16 @@
 from typing import List, Optional
 
 from sqlmodel import Session, select
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 from ..models.IngredientStockModel import IngredientStock
+from ..models.IngredientModel import Ingredient
+from ..models.MeasureModel import Measure
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 def select_all() -> List[IngredientStock]:
     """Devuelve todas las filas de stock de ingredientes."""
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         return session.exec(select(IngredientStock)).all()
 
@@ -17,7 +19,7 @@ def select_all() -> List[IngredientStock]:
 # ──────────────────────────────────────────────────────────────────────────────
 def get_by_ingredient(ingredient_id: int) -> Optional[IngredientStock]:
     """Devuelve la fila de stock de un ingrediente (o None si no existe)."""
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         stmt = select(IngredientStock).where(
             IngredientStock.ingredient_id == ingredient_id
@@ -31,7 +33,7 @@ def insert_stock(stock_row: IngredientStock) -> IngredientStock:
     Inserta una fila de stock.
     - Si ya existe un registro para ese ingrediente -> ValueError.
     """
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         # ¿existe ya?
         if get_by_ingredient(stock_row.ingredient_id):
@@ -50,7 +52,7 @@ def update_stock(
     min_quantity: float
 ) -> IngredientStock:
     """Actualiza las cantidades de un stock de ingrediente."""
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         db_row = session.get(IngredientStock, stock_id)
         if db_row is None:
@@ -62,3 +64,22 @@ def update_stock(
         session.commit()
         session.refresh(db_row)
         return db_row
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+def _stock_rows_query(filter: str = ""):
+    query = (
+        select(
+            IngredientStock.id.label("stock_id"),
+            Ingredient.id.label("id"),
+            Ingredient.name.label("name"),
+            IngredientStock.quantity.label("qty"),
+            IngredientStock.min_quantity.label("min"),
+            Measure.description.label("measure"),
+        )
+        .join(Ingredient, Ingredient.id == IngredientStock.ingredient_id)
+        .join(Measure, Measure.id == Ingredient.measure_id)
+    )
+    if filter:
+        query = query.where(Ingredient.name.ilike(f"%{filter}%"))
+    return query
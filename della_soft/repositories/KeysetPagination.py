@@ -0,0 +1,174 @@
+# della_soft/repositories/KeysetPagination.py
+"""
+Paginación por clave (keyset / seek) para tablas grandes.
+
+En vez de `OFFSET n` (que obliga a la BD a recorrer y descartar n filas)
+cada página se pide "a partir de" la última fila vista:
+
+    WHERE (sort, id) > (:ultimo_sort, :ultimo_id) ORDER BY sort, id LIMIT n
+
+El cursor es un string opaco (base64 de un JSON) que guarda el valor de
+orden, el id y la dirección; los estados de Reflex lo almacenan tal cual en
+lugar de `offset`.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+
+from sqlalchemy import func, select, tuple_
+
+NEXT = "next"
+PREV = "prev"
+
+
+@dataclass
+class KeysetPage:
+    rows: list = field(default_factory=list)
+    next_cursor: Optional[str] = None   # None → no hay página siguiente
+    prev_cursor: Optional[str] = None   # None → es la primera página
+
+
+def _encode_value(value: Any) -> dict:
+    if isinstance(value, datetime):
+        return {"t": "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {"t": "date", "v": value.isoformat()}
+    return {"t": None, "v": value}
+
+
+def _decode_value(data: dict) -> Any:
+    if data["t"] == "datetime":
+        return datetime.fromisoformat(data["v"])
+    if data["t"] == "date":
+        return date.fromisoformat(data["v"])
+    return data["v"]
+
+
+def encode_cursor(sort_value: Any, row_id: int, direction: str = NEXT) -> str:
+    payload = {"s": _encode_value(sort_value), "id": row_id, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int, str]:
+    """Devuelve (valor_de_orden, id, dirección). ValueError si es inválido."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        direction = payload["d"]
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return _decode_value(payload["s"]), int(payload["id"]), direction
+    except (KeyError, TypeError, ValueError, json.JSONDecodeError) as err:
+        raise ValueError(f"Cursor de paginación inválido: {cursor!r}") from err
+
+
+def _seek(query, sort_column, id_column, cursor: Optional[str], limit: int, descending: bool):
+    """Agrega a `query` el WHERE/ORDER BY/LIMIT del keyset; devuelve (query, dirección)."""
+    direction = NEXT
+    if cursor:
+        sort_value, last_id, direction = decode_cursor(cursor)
+        key = tuple_(sort_column, id_column)
+        bound = tuple_(sort_value, last_id)
+        # Hacia adelante en orden ascendente (o hacia atrás en descendente)
+        # se buscan claves mayores; en los otros dos casos, menores.
+        if (direction == NEXT) != descending:
+            query = query.where(key > bound)
+        else:
+            query = query.where(key < bound)
+
+    # Hacia atrás se recorre en orden inverso y luego se da vuelta la página.
+    reverse = (direction == PREV) != descending
+    if reverse:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    return query.limit(limit + 1), direction
+
+
+def _rows(result, scalars: bool) -> list:
+    if scalars:
+        return list(result.scalars())
+    return [dict(row) for row in result.mappings()]
+
+
+def _build_page(rows: list, row_key, cursor: Optional[str], direction: str, limit: int) -> KeysetPage:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == PREV:
+        rows.reverse()
+
+    page = KeysetPage(rows=rows)
+    if not rows:
+        return page
+
+    first_key = row_key(rows[0])
+    last_key = row_key(rows[-1])
+    if direction == NEXT:
+        page.next_cursor = encode_cursor(*last_key, NEXT) if has_more else None
+        page.prev_cursor = encode_cursor(*first_key, PREV) if cursor else None
+    else:
+        page.next_cursor = encode_cursor(*last_key, NEXT)
+        page.prev_cursor = encode_cursor(*first_key, PREV) if has_more else None
+    return page
+
+
+def keyset_page(
+    session,
+    query,
+    sort_column,
+    id_column,
+    row_key: Callable[[Any], tuple[Any, int]],
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 5,
+    descending: bool = False,
+    scalars: bool = False,
+) -> KeysetPage:
+    """
+    Ejecuta `query` paginada por (sort_column, id_column).
+
+    - `sort_column` debe ser NOT NULL (o un coalesce) para que el orden sea total;
+      `id_column` desempata.
+    - `row_key(row)` devuelve (valor_de_orden, id) de una fila del resultado,
+      para armar los cursores de la página.
+    - `scalars=True` para consultas de una sola entidad (`select(Modelo)`).
+    """
+    query, direction = _seek(query, sort_column, id_column, cursor, limit, descending)
+    rows = _rows(session.execute(query), scalars)
+    return _build_page(rows, row_key, cursor, direction, limit)
+
+
+async def keyset_page_async(
+    session,
+    query,
+    sort_column,
+    id_column,
+    row_key: Callable[[Any], tuple[Any, int]],
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 5,
+    descending: bool = False,
+    scalars: bool = False,
+) -> KeysetPage:
+    """`keyset_page` sobre una AsyncSession de SQLModel."""
+    query, direction = _seek(query, sort_column, id_column, cursor, limit, descending)
+    # `exec` ya devuelve escalares para `select(Modelo)`
+    result = await session.exec(query)
+    rows = list(result) if scalars else [dict(row) for row in result.mappings()]
+    return _build_page(rows, row_key, cursor, direction, limit)
+
+
+def _count_query(query):
+    subquery = query.order_by(None).subquery()
+    return select(func.count()).select_from(subquery)
+
+
+def count_rows(session, query) -> int:
+    """Total de filas de `query` (para mostrar "página X de Y")."""
+    return session.execute(_count_query(query)).scalar_one()
+
+
+async def count_rows_async(session, query) -> int:
+    return (await session.exec(_count_query(query))).scalar_one()
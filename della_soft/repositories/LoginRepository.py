@@ -4,7 +4,7 @@ from della_soft.services.CustomerService import create_user_service
 from ..models.CustomerModel import Customer
 from sqlmodel import select, Session
 from ..services.SystemService import verify_password, hash_password
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 from ..services.RolService import select_all_roles_service
 from ..views import MenuView
 
@@ -30,7 +30,7 @@ class AuthState(rx.State):
 
 
     def login(self):
-        engine = connect()
+        engine = get_engine()
         with Session(engine) as session:
             query = select(Customer).where(Customer.username == self.username)
             user = session.exec(query).first()
@@ -1,15 +1,15 @@
 from ..models.MeasureModel import Measure
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 from sqlmodel import Session, or_, select
 
 def select_all():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Measure)
         return session.exec(query).all()
     
 def select_by_id(id: int):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Measure).where(Measure.id == id)
         return session.exec(query).all()
\ No newline at end of file
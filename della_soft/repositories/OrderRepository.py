@@ -1,24 +1,21 @@
+from datetime import datetime
+
 from della_soft.models.CustomerModel import Customer
 from ..models.OrderModel import Order
-from .ConnectDB import connect
+from .ConnectDB import get_engine, session_scope
+from sqlalchemy import case, cast, func, update
 from sqlmodel import Session, String, or_, select
-from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 def select_all():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Order)
         return session.exec(query).all()
-    
-from sqlmodel import select, or_
-from sqlalchemy.orm import joinedload
-from sqlmodel.ext.asyncio.session import AsyncSession
-from ..models.OrderModel import Order
-from ..models.CustomerModel import Customer
+
 
 def get_order(value: str):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:  # Usar sesión síncrona
         query = (
             select(Order)
@@ -39,30 +36,105 @@ def get_order(value: str):
         return result.scalars().all()
 
     
-def insert_order(order: Order) -> Order:
-    engine = connect()
-    with Session(engine) as session:
+def _order_rows_query():
+    """SELECT de pedidos con el nombre del cliente y el saldo pendiente."""
+    return (
+        select(
+            Order.id,
+            Order.id_customer,
+            (Customer.first_name + " " + Customer.last_name).label("customer_name"),
+            Order.observation,
+            Order.total_order,
+            Order.total_paid,
+            (Order.total_order - Order.total_paid).label("pending"),
+            Order.order_date,
+            Order.delivery_date,
+        )
+        .join(Customer, Customer.id == Order.id_customer)
+    )
+
+
+CUSTOMER_NAME = (Customer.first_name + " " + Customer.last_name)
+PAID_STATUS = case(
+    (Order.total_paid == Order.total_order, "PAGADO"), else_="FALTA PAGO"
+)
+
+# Las fechas pueden ser NULL y la comparación por tupla del keyset descarta
+# esas filas: se ordena por la fecha con NULL reemplazado por NO_DATE
+# (quedan primeras en orden ascendente).
+NO_DATE = datetime(1900, 1, 1)
+
+# Columnas por las que se puede ordenar la tabla ("-" delante = descendente);
+# todas NOT NULL, como pide el keyset
+ORDER_SORT_COLUMNS = {
+    "id": Order.id,
+    "customer_name": CUSTOMER_NAME,
+    "total_order": Order.total_order,
+    "total_paid": Order.total_paid,
+    "order_date": func.coalesce(Order.order_date, NO_DATE),
+    "delivery_date": func.coalesce(Order.delivery_date, NO_DATE),
+}
+
+
+def _order_search_filter(value: str):
+    """Búsqueda de texto en SQL sobre las mismas columnas que muestra la tabla."""
+    like = f"%{value}%"
+    return or_(
+        cast(Order.id, String).ilike(like),
+        CUSTOMER_NAME.ilike(like),
+        Order.observation.ilike(like),
+        cast(Order.total_order, String).ilike(like),
+        cast(Order.total_paid, String).ilike(like),
+        PAID_STATUS.ilike(like),
+        cast(Order.order_date, String).ilike(like),
+        cast(Order.delivery_date, String).ilike(like),
+    )
+
+
+def insert_order(order: Order, *, session: Session | None = None) -> Order:
+    with session_scope(session) as session:
         session.add(order)
-        session.commit()
+        session.flush()
         session.refresh(order)   # Trae el ID generado por la BD
         return order
     
-def update_order(order: Order):
-    engine = connect()
-    with Session(engine) as session:
+def update_order(order: Order, *, session: Session | None = None):
+    with session_scope(session) as session:
         merged = session.merge(order)  # merge devuelve la instancia vinculada a la sesión
-        session.commit()
+        session.flush()
         session.refresh(merged)       # refrescamos la instancia que sí pertenece a la sesión
         return merged
     
-def update_pay_amount(order: Order):
-    engine = connect()
-    with Session(engine) as session:
+def update_pay_amount(order: Order, *, session: Session | None = None):
+    with session_scope(session) as session:
         # Traemos la instancia gestionada
         db_order = session.get(Order, order.id)
         if not db_order:
             raise ValueError(f"Pedido con id={order.id} no existe")
         # Cambiamos solo el campo que nos interesa
         db_order.total_paid = order.total_paid
-        session.commit()
-        return db_order
\ No newline at end of file
+        session.flush()
+        return db_order
+
+
+def add_to_total_paid(order_id: int, amount: int, *, session: Session | None = None) -> tuple[int, int]:
+    """
+    Suma `amount` (negativo en un reverso) al total pagado en la BD:
+
+        UPDATE orders SET total_paid = total_paid + :amount WHERE id = :id
+        RETURNING total_paid, total_order
+
+    Dos cajas que pagan el mismo pedido a la vez no se pisan. Devuelve
+    (total_paid, total_order) ya actualizados.
+    """
+    stmt = (
+        update(Order)
+        .where(Order.id == order_id)
+        .values(total_paid=Order.total_paid + amount)
+        .returning(Order.total_paid, Order.total_order)
+    )
+    with session_scope(session) as session:
+        row = session.execute(stmt).first()
+        if row is None:
+            raise ValueError(f"Pedido con id={order_id} no existe")
+        return row.total_paid, row.total_order
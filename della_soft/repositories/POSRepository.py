@@ -1,34 +1,41 @@
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
 from ..models.POSModel import POS
-from .ConnectDB import connect
-from sqlmodel import Session, String, cast, exists, func, or_, select
+from .ConnectDB import get_engine, session_scope
+from sqlalchemy import update
+from sqlmodel import Session, select
 
-def get_by_pos_date(value) -> POS | None:
+def parse_pos_date(value) -> date:
+    """Acepta date, datetime o texto 'YYYY-MM-DD' / 'DD/MM/YYYY'."""
     if isinstance(value, datetime):
-        fecha = value.date()
-    elif isinstance(value, date):
-        fecha = value
-    else:
-        try:
-            fecha = datetime.strptime(value, "%Y-%m-%d").date()
-        except ValueError:
-            fecha = datetime.strptime(value, "%d/%m/%Y").date()
-    engine = connect()
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return datetime.strptime(value, "%d/%m/%Y").date()
+
+def get_by_pos_date(value) -> POS | None:
+    fecha = parse_pos_date(value)
+    start = datetime.combine(fecha, time.min)
+    engine = get_engine()
     with Session(engine) as session:
+        # Rango [día, día siguiente) en vez de date(pos_date) = día:
+        # así la consulta puede usar el índice ix_pos_pos_date
         stmt = select(POS).where(
-            func.date(POS.pos_date) == fecha
+            POS.pos_date >= start,
+            POS.pos_date < start + timedelta(days=1),
         )
         return session.exec(stmt).first()
     
 def insert_pos(pos: POS):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         session.add(pos)
         session.commit()
 
-def update_pos(pos: POS):
-    engine = connect()
-    with Session(engine) as session:
+def update_pos(pos: POS, *, session: Session | None = None):
+    with session_scope(session) as session:
         query = select(POS).where(POS.id == pos.id)
         c = session.exec(query).first()
         if c:
@@ -36,4 +43,23 @@ def update_pos(pos: POS):
             c.final_amount = pos.final_amount
             c.pos_date = pos.pos_date
             session.add(c)
-            session.commit()
\ No newline at end of file
+            session.flush()
+
+
+def add_to_final_amount(pos_id: int, amount: int, *, session: Session | None = None) -> int:
+    """
+    Suma `amount` al saldo de la caja en la BD (UPDATE … SET final_amount =
+    final_amount + :amount RETURNING final_amount), sin partir de un POS
+    leído antes. Devuelve el saldo actualizado.
+    """
+    stmt = (
+        update(POS)
+        .where(POS.id == pos_id)
+        .values(final_amount=POS.final_amount + amount)
+        .returning(POS.final_amount)
+    )
+    with session_scope(session) as session:
+        final_amount = session.execute(stmt).scalar_one_or_none()
+        if final_amount is None:
+            raise ValueError(f"Caja con id={pos_id} no existe")
+        return final_amount
@@ -1,25 +1,25 @@
-from sqlalchemy import and_
+from typing import Iterable
+
+from sqlalchemy import and_, delete, insert, update
 from ..models.ProductOrderModel import ProductOrder
 from ..models.ProductModel import Product, ProductType
-from .ConnectDB import connect
+from .ConnectDB import get_engine, session_scope
 from sqlmodel import Session, or_, select
 
 
 def select_all():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(ProductOrder)
         return session.exec(query).all()
 
-def select_by_order_id(id_order: int):
-    engine = connect()
-    with Session(engine) as session:
+def select_by_order_id(id_order: int, *, session: Session | None = None):
+    with session_scope(session) as session:
         query = select(ProductOrder).where(ProductOrder.id_order == id_order)
         return session.exec(query).all()
     
-def select_fixed_products(id_order: int):
-    engine = connect()
-    with Session(engine) as session:
+def select_fixed_products(id_order: int, *, session: Session | None = None):
+    with session_scope(session) as session:
         stmt = (
             select(ProductOrder)
             .join(Product)
@@ -33,7 +33,7 @@ def select_fixed_products(id_order: int):
         return session.exec(stmt).all()
 
 def insert_product_order(product_order: ProductOrder) -> ProductOrder:
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         session.add(product_order)
         session.commit()
@@ -41,10 +41,47 @@ def insert_product_order(product_order: ProductOrder) -> ProductOrder:
         return product_order
 
 def delete_product_order(id: int):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(ProductOrder).where(ProductOrder.id == id)
         user_delete = session.exec(query).one()
         session.delete(user_delete)
         session.commit()
-        return session.exec(query).all()
\ No newline at end of file
+        return session.exec(query).all()
+
+
+def insert_product_orders(lines: Iterable[ProductOrder], *, session: Session | None = None) -> int:
+    """Inserta varias líneas en un solo INSERT de varias filas (executemany)."""
+    rows = [
+        {"quantity": po.quantity, "id_product": po.id_product, "id_order": po.id_order}
+        for po in lines
+    ]
+    if not rows:
+        return 0
+    with session_scope(session) as session:
+        session.execute(insert(ProductOrder), rows)
+        session.flush()
+    return len(rows)
+
+
+def update_product_order_quantities(changes: Iterable[tuple[int, int]], *,
+                                    session: Session | None = None) -> int:
+    """Actualiza la cantidad de varias líneas (id, cantidad) por clave primaria."""
+    rows = [{"id": line_id, "quantity": quantity} for line_id, quantity in changes]
+    if not rows:
+        return 0
+    with session_scope(session) as session:
+        session.execute(update(ProductOrder), rows)
+        session.flush()
+    return len(rows)
+
+
+def delete_product_orders(ids: Iterable[int], *, session: Session | None = None) -> int:
+    """Borra varias líneas por id en un solo DELETE."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    with session_scope(session) as session:
+        session.execute(delete(ProductOrder).where(ProductOrder.id.in_(ids)))
+        session.flush()
+    return len(ids)
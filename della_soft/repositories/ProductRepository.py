@@ -1,15 +1,15 @@
 from ..models.ProductModel import Product
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 from sqlmodel import Session, String, cast, or_, select
 
 def select_all():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Product)
         return session.exec(query).all()
     
 def insert_product(product: Product):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         session.add(product)
         session.commit()
@@ -17,20 +17,22 @@ def insert_product(product: Product):
         return session.exec(query).all()
     
 
+def _product_search(value: str):
+    return select(Product).where(
+        or_(
+            Product.name.ilike(f"%{value}%"),
+            Product.description.ilike(f"%{value}%"),
+            cast(Product.product_type, String).ilike(f"%{value}%"),
+        )
+    )
+
 def get_product(value: str):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
-        query = select(Product).where(
-            or_(
-                Product.name.ilike(f"%{value}%"),
-                Product.description.ilike(f"%{value}%"),
-                cast(Product.product_type, String).ilike(f"%{value}%"),
-            )
-        )
-        return session.exec(query).all()
+        return session.exec(_product_search(value)).all()
 
 def update_product(product: Product):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Product).where(Product.id == product.id)
         c = session.exec(query).first()
@@ -45,13 +47,13 @@ def update_product(product: Product):
             return session.exec(query).all()
     
 def get_by_id(id: int):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Product).where(Product.id == id)
         return session.exec(query).all()
     
 def delete_product(id: int):
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Product).where(Product.id == id)
         user_delete = session.exec(query).one()
@@ -1,23 +1,38 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
 
+from sqlalchemy import Integer, column, literal, union_all, update, values
 from sqlmodel import Session, select
 
-from .ConnectDB import connect
+from .ConnectDB import get_engine, session_scope
 from ..models.ProductStockModel import ProductStock
+from ..models.ProductModel import Product
 
 def select_all() -> List[ProductStock]:
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         return session.exec(select(ProductStock)).all()
 
-def get_by_product(product_id: int) -> Optional[ProductStock]:
-    engine = connect()
-    with Session(engine) as session:
+def get_by_product(product_id: int, *, session: Session | None = None) -> Optional[ProductStock]:
+    with session_scope(session) as session:
         stmt = select(ProductStock).where(ProductStock.product_id == product_id)
         return session.exec(stmt).first()
 
+def select_quantities(product_ids: Iterable[int], *,
+                      session: Session | None = None) -> dict[int, int]:
+    """Stock de varios productos en una consulta (product_id IN (…)); product_id -> cantidad."""
+    ids = set(product_ids)
+    if not ids:
+        return {}
+    with session_scope(session) as session:
+        stmt = (
+            select(ProductStock.product_id, ProductStock.quantity)
+            .where(ProductStock.product_id.in_(ids))
+        )
+        return {pid: qty for pid, qty in session.exec(stmt).all()}
+
 def insert_stock(stock_row: ProductStock) -> ProductStock:
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         if get_by_product(stock_row.product_id):
             raise ValueError("Ya existe stock para ese producto.")
@@ -27,7 +42,7 @@ def insert_stock(stock_row: ProductStock) -> ProductStock:
         return stock_row
 
 def update_stock(stock_id: int, quantity: float, min_quantity: float) -> ProductStock:
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         db_row = session.get(ProductStock, stock_id)
         if db_row is None:
@@ -39,30 +54,117 @@ def update_stock(stock_id: int, quantity: float, min_quantity: float) -> Product
         session.refresh(db_row)
         return db_row
     
-def update_stock_with_pay(product_id: int, quantity: int) -> ProductStock:
-    engine = connect()
-    with Session(engine) as session:
-        stock_row = session.exec(
-            select(ProductStock).where(ProductStock.product_id == product_id)
-        ).first()
-        if stock_row is None:
-            raise ValueError(f"Stock no encontrado para product_id={product_id}")
-        stock_row.quantity -= quantity
-        session.add(stock_row)
-        session.commit()
-        session.refresh(stock_row)
-        return stock_row
-    
-def update_stock_with_reverse(product_id: int, quantity: int) -> ProductStock:
-    engine = connect()
-    with Session(engine) as session:
-        stock_row = session.exec(
-            select(ProductStock).where(ProductStock.product_id == product_id)
-        ).first()
-        if stock_row is None:
+@dataclass
+class StockMovementResult:
+    applied: dict[int, int] = field(default_factory=dict)        # product_id -> cantidad nueva
+    failed: list[tuple[int, int]] = field(default_factory=list)  # (product_id, cantidad) no aplicados
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _group_lines(lines: Iterable[tuple[int, int]]) -> dict[int, int]:
+    """Suma las cantidades por producto (un pedido puede repetir un producto)."""
+    grouped: dict[int, int] = {}
+    for product_id, quantity in lines:
+        grouped[product_id] = grouped.get(product_id, 0) + quantity
+    return grouped
+
+
+def _movement_source(grouped: dict[int, int], dialect: str):
+    """Tabla derivada v(product_id, qty) con las líneas del movimiento."""
+    if dialect == "postgresql":
+        # FROM (VALUES (…), (…)) AS v (product_id, qty)
+        return (
+            values(column("product_id", Integer), column("qty", Integer), name="v")
+            .data(list(grouped.items()))
+        )
+    # SQLite no acepta nombres de columna en el alias de un VALUES; se usa
+    # una subconsulta equivalente (SELECT … UNION ALL SELECT …).
+    return union_all(*(
+        select(literal(pid, Integer).label("product_id"), literal(qty, Integer).label("qty"))
+        for pid, qty in grouped.items()
+    )).subquery("v")
+
+
+def _apply_stock_movement(lines: Iterable[tuple[int, int]], sign: int,
+                          session: Session | None) -> StockMovementResult:
+    """
+    Aplica todas las líneas en una única sentencia:
+
+        UPDATE product_stock SET quantity = quantity ± v.qty
+        FROM (VALUES …) AS v (product_id, qty)
+        WHERE product_stock.product_id = v.product_id [AND quantity >= v.qty]
+        RETURNING product_id, quantity
+
+    Al descontar, la condición `quantity >= v.qty` impide dejar stock
+    negativo; las líneas que no devolvió el RETURNING (sin stock suficiente
+    o sin fila de stock) quedan en `failed`. Al ser un UPDATE condicional,
+    dos cajas que venden el mismo producto no pisan sus descuentos.
+    """
+    grouped = _group_lines(lines)
+    if not grouped:
+        return StockMovementResult()
+
+    with session_scope(session) as session:
+        movement = _movement_source(grouped, session.get_bind().dialect.name)
+        stmt = (
+            update(ProductStock)
+            .where(ProductStock.product_id == movement.c.product_id)
+            .values(quantity=ProductStock.quantity + sign * movement.c.qty)
+            .returning(ProductStock.product_id, ProductStock.quantity)
+        )
+        if sign < 0:
+            stmt = stmt.where(ProductStock.quantity >= movement.c.qty)
+        applied = {pid: qty for pid, qty in session.execute(stmt).all()}
+        session.flush()
+    failed = [(pid, qty) for pid, qty in grouped.items() if pid not in applied]
+    return StockMovementResult(applied=applied, failed=failed)
+
+
+def decrement_stock(lines: Iterable[tuple[int, int]], *,
+                    session: Session | None = None) -> StockMovementResult:
+    """
+    Descuenta el stock de varias líneas (product_id, cantidad) en un solo
+    UPDATE. Solo se descuentan las líneas con stock suficiente; el resto se
+    informa en `failed` y quien llama decide si hace rollback.
+    """
+    return _apply_stock_movement(lines, -1, session)
+
+
+def restore_stock(lines: Iterable[tuple[int, int]], *,
+                  session: Session | None = None) -> StockMovementResult:
+    """Devuelve al stock varias líneas (product_id, cantidad) en un solo UPDATE."""
+    return _apply_stock_movement(lines, 1, session)
+
+
+def update_stock_with_pay(product_id: int, quantity: int, *, session: Session | None = None) -> ProductStock:
+    with session_scope(session) as session:
+        result = decrement_stock([(product_id, quantity)], session=session)
+        if not result.ok:
+            raise ValueError(f"Stock insuficiente o inexistente para product_id={product_id}")
+        return get_by_product(product_id, session=session)
+
+def update_stock_with_reverse(product_id: int, quantity: int, *, session: Session | None = None) -> ProductStock:
+    with session_scope(session) as session:
+        result = restore_stock([(product_id, quantity)], session=session)
+        if not result.ok:
             raise ValueError(f"Stock no encontrado para product_id={product_id}")
-        stock_row.quantity += quantity
-        session.add(stock_row)
-        session.commit()
-        session.refresh(stock_row)
-        return stock_row
\ No newline at end of file
+        return get_by_product(product_id, session=session)
+
+
+def _stock_rows_query(filter: str = ""):
+    query = (
+        select(
+            ProductStock.id.label("stock_id"),
+            Product.id.label("id"),
+            Product.name.label("name"),
+            ProductStock.quantity.label("qty"),
+            ProductStock.min_quantity.label("min"),
+        )
+        .join(Product, Product.id == ProductStock.product_id)
+    )
+    if filter:
+        query = query.where(Product.name.ilike(f"%{filter}%"))
+    return query
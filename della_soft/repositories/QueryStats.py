@@ -0,0 +1,174 @@
+# della_soft/repositories/QueryStats.py
+"""
+Instrumentación de consultas SQL por evento de Reflex.
+
+Se engancha a los eventos `before/after_cursor_execute` de los engines
+(sync y async) y, mientras hay un "scope" activo, cuenta las consultas, el
+tiempo total en la BD y cuántas veces se repite cada forma de sentencia
+(la SQL normalizada, sin literales ni listas de parámetros).
+
+- `QueryStatsMiddleware` abre un scope por cada evento que procesa la app.
+- `track_queries(nombre)` hace lo mismo a mano (tests, scripts).
+- Si una misma forma se ejecuta más de SQL_N_PLUS_ONE_THRESHOLD veces
+  (10 por defecto) en un solo evento, se registra un warning: casi siempre
+  es un N+1 (una consulta por fila dentro de un bucle).
+- `query_stats()` devuelve los acumulados por evento.
+
+El scope viaja en un ContextVar, así que también cubre el trabajo que el
+evento delega con `asyncio.to_thread`.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+
+from reflex.middleware import Middleware
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+
+_current: ContextVar[Optional["QueryScope"]] = ContextVar("query_scope", default=None)
+_handlers: dict[str, dict] = {}
+_handlers_lock = threading.Lock()
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROW_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Forma de la sentencia: literales y parámetros → ?, listas colapsadas."""
+    shape = _PARAM.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    shape = _ROW_LIST.sub("(?)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryScope:
+    name: str
+    queries: int = 0
+    db_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = fingerprint(statement)
+        with self._lock:
+            self.queries += 1
+            self.db_time += elapsed
+            self.statements[shape] += 1
+
+    def repeated(self, threshold: int | None = None) -> dict[str, int]:
+        """Formas de sentencia ejecutadas más de `threshold` veces."""
+        threshold = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        with self._lock:
+            return {shape: n for shape, n in self.statements.items() if n > threshold}
+
+
+# ------------------------------------------------------------------
+# Eventos del engine
+# ------------------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    scope = _current.get()
+    if scope is not None:
+        scope.record(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """Engancha los contadores a un engine sync (o al `sync_engine` de uno async)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ------------------------------------------------------------------
+# Scopes
+# ------------------------------------------------------------------
+def current_scope() -> Optional[QueryScope]:
+    return _current.get()
+
+
+def start_scope(name: str) -> QueryScope:
+    scope = QueryScope(name)
+    _current.set(scope)
+    return scope
+
+
+def finish_scope(scope: QueryScope) -> None:
+    """Cierra el scope: acumula sus números y avisa de posibles N+1."""
+    if _current.get() is scope:
+        _current.set(None)
+
+    with _handlers_lock:
+        stats = _handlers.setdefault(
+            scope.name, {"events": 0, "queries": 0, "db_time": 0.0, "max_queries": 0, "n_plus_one": 0}
+        )
+        stats["events"] += 1
+        stats["queries"] += scope.queries
+        stats["db_time"] += scope.db_time
+        stats["max_queries"] = max(stats["max_queries"], scope.queries)
+
+    repeated = scope.repeated()
+    for shape, count in repeated.items():
+        logger.warning("Posible N+1 en %s: %d ejecuciones de %s", scope.name, count, shape[:300])
+    if repeated:
+        with _handlers_lock:
+            _handlers[scope.name]["n_plus_one"] += 1
+
+
+@contextmanager
+def track_queries(name: str):
+    """Cuenta las consultas del bloque como si fuera un evento llamado `name`."""
+    previous = _current.get()
+    scope = start_scope(name)
+    try:
+        yield scope
+    finally:
+        finish_scope(scope)
+        _current.set(previous)
+
+
+def query_stats() -> dict:
+    """Acumulados por evento: eventos, consultas, tiempo en BD, máximo por evento."""
+    with _handlers_lock:
+        return {name: dict(stats) for name, stats in _handlers.items()}
+
+
+def reset_query_stats() -> None:
+    with _handlers_lock:
+        _handlers.clear()
+
+
+# ------------------------------------------------------------------
+# Middleware de Reflex: un scope por evento procesado
+# ------------------------------------------------------------------
+class QueryStatsMiddleware(Middleware):
+    async def preprocess(self, app, state, event):
+        start_scope(event.name)
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        # Un handler que hace `yield` genera varias actualizaciones; el
+        # evento termina con la última (final=True).
+        scope = _current.get()
+        if scope is not None and getattr(update, "final", True):
+            finish_scope(scope)
+        return update
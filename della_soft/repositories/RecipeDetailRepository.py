@@ -13,7 +13,7 @@ Además incluye utilidades extra:
     * select_all()
 
 Cada función acepta un `session` opcional; si no se provee abre y cierra
-su propia sesión usando `connect()`.
+su propia sesión con el engine compartido (`get_engine()`).
 """
 
 from typing import List, Sequence, Dict, Any, Union
@@ -22,7 +22,7 @@ from sqlmodel import Session, select
 from sqlalchemy.orm import joinedload
 
 from ..models.RecipeDetailModel import RecipeDetail
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 # ---------------------------------------------------------------------------
 # SELECT --------------------------------------------------------------------
 # ---------------------------------------------------------------------------
@@ -31,7 +31,7 @@ def select_by_recipe_id(recipe_id: int, *, session: Session | None = None) -> Li
     """Devuelve todos los detalles de una receta (eager‐load ingrediente)."""
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         stmt = (
@@ -49,7 +49,7 @@ def select_all(*, session: Session | None = None) -> List[RecipeDetail]:
     """Devuelve todos los RecipeDetail – útil para debug."""
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         stmt = select(RecipeDetail).options(joinedload(RecipeDetail.ingredient))
@@ -66,7 +66,7 @@ def insert_recipe_detail(detail: Union[RecipeDetail, Dict[str, Any]], *, session
     """Inserta un único detalle y devuelve el objeto persistido con ID."""
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         if not isinstance(detail, RecipeDetail):
@@ -87,7 +87,7 @@ def update_recipe_detail(detail: RecipeDetail, *, session: Session | None = None
     """Actualiza (merge) un detalle existente."""
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         detail = session.merge(detail)
@@ -106,7 +106,7 @@ def delete_recipe_detail(detail_id: int, *, session: Session | None = None) -> N
     """Elimina un RecipeDetail por su `id`."""
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         stmt = select(RecipeDetail).where(RecipeDetail.id == detail_id)
@@ -123,7 +123,7 @@ def delete_by_recipe(recipe_id: int, *, session: Session | None = None) -> None:
     """Elimina todos los detalles asociados a una receta."""
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         session.exec(
@@ -6,19 +6,19 @@ from sqlalchemy.orm import joinedload
 
 from ..models.RecipeModel import Recipe
 from ..models.RecipeDetailModel import RecipeDetail
-from .ConnectDB import connect  
+from .ConnectDB import get_engine  
 
 from sqlmodel import select, Session
 from sqlalchemy.orm import joinedload
 from ..models.RecipeModel import Recipe
 from ..models.RecipeDetailModel import RecipeDetail
-from .ConnectDB import connect     
+from .ConnectDB import get_engine     
 
 
 def select_all(*, session: Session | None = None) -> list[Recipe]:
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
 
     try:
@@ -40,7 +40,7 @@ def select_all(*, session: Session | None = None) -> list[Recipe]:
 def get_recipe(recipe_id: int, *, session: Session | None = None) -> Recipe | None:
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
 
     try:
@@ -64,7 +64,7 @@ def insert_recipe(recipe: Recipe, *, session: Session | None = None) -> Recipe:
 
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         session.add(recipe)
@@ -79,7 +79,7 @@ def insert_recipe(recipe: Recipe, *, session: Session | None = None) -> Recipe:
 def update_recipe(recipe: Recipe, *, session: Session | None = None) -> Recipe:
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         recipe = session.merge(recipe)
@@ -95,7 +95,7 @@ def delete_recipe(recipe_id: int, *, session: Session | None = None) -> None:
 
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         stmt = select(Recipe).where(Recipe.id == recipe_id)
@@ -127,7 +127,7 @@ def add_details(
 
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         persisted: list[RecipeDetail] = []
@@ -154,7 +154,7 @@ def sync_details(
 ) -> List[RecipeDetail]:
     own = session is None
     if own:
-        engine = connect()
+        engine = get_engine()
         session = Session(engine)
     try:
         
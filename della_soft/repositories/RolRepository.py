@@ -1,10 +1,10 @@
 from ..models.RolModel import Rol
-from .ConnectDB import connect
+from .ConnectDB import get_engine
 from sqlmodel import Session, select
 
 
 def select_all():
-    engine = connect()
+    engine = get_engine()
     with Session(engine) as session:
         query = select(Rol)
         return session.exec(query).all()
\ No newline at end of file
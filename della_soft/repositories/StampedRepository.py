@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from .ConnectDB import session_scope
+from ..models.StampedModel import Stamped
+
+
+@dataclass(frozen=True)
+class SequenceBlock:
+    """Números [first, last] reservados de un timbrado."""
+    stamped_id: int
+    stamped_number: str
+    establishment: str
+    expedition_point: str
+    first: int
+    last: int
+
+    def __len__(self) -> int:
+        return self.last - self.first + 1
+
+    def format(self, sequence: int) -> str:
+        """Número de factura: 001-001-000123"""
+        return f"{self.establishment}-{self.expedition_point}-{sequence:06d}"
+
+    def numbers(self) -> list[str]:
+        return [self.format(seq) for seq in range(self.first, self.last + 1)]
+
+
+def _allocation_error(session: Session, count: int, today: date) -> RuntimeError:
+    """Explica por qué no se pudo reservar (solo se consulta cuando falla)."""
+    stamped = session.exec(
+        select(Stamped).where(Stamped.active.is_(True)).order_by(Stamped.id)
+    ).first()
+    if stamped is None:
+        return RuntimeError("No hay timbrado activo en la base")
+    if today < stamped.date_from:
+        return RuntimeError(f"El timbrado activo rige desde el {stamped.date_from:%d/%m/%Y}")
+    if today > stamped.date_to:
+        return RuntimeError(f"El timbrado activo venció el {stamped.date_to:%d/%m/%Y}")
+    if count == 1:
+        return RuntimeError("El timbrado activo agotó su numeración")
+    return RuntimeError(
+        f"El timbrado activo no tiene {count} números libres "
+        f"(quedan {stamped.max_sequence - stamped.current_sequence})"
+    )
+
+
+def allocate_sequence(count: int = 1, *, today: date | None = None,
+                      session: Session | None = None) -> SequenceBlock:
+    """
+    Reserva `count` números consecutivos del timbrado activo en una sola
+    sentencia:
+
+        UPDATE stamped SET current_sequence = current_sequence + :count
+        WHERE id = (SELECT id FROM stamped WHERE active ORDER BY id LIMIT 1)
+          AND current_sequence + :count <= max_sequence
+          AND date_from <= :today AND date_to >= :today
+        RETURNING …, current_sequence
+
+    El incremento lo hace la BD, así que dos cajas nunca reciben el mismo
+    número, y la vigencia y el tope se validan en el mismo UPDATE. Si no
+    devuelve fila se consulta el motivo y se lanza RuntimeError.
+
+    La fila queda bloqueada hasta el commit de `session`: conviene
+    reservar al final de la transacción. Si se hace rollback, los números
+    vuelven al timbrado.
+    """
+    if count < 1:
+        raise ValueError("count debe ser mayor que cero")
+    today = today or date.today()
+    active_id = (
+        select(Stamped.id).where(Stamped.active.is_(True))
+        .order_by(Stamped.id).limit(1).scalar_subquery()
+    )
+    stmt = (
+        update(Stamped)
+        .where(
+            Stamped.id == active_id,
+            Stamped.current_sequence + count <= Stamped.max_sequence,
+            Stamped.date_from <= today,
+            Stamped.date_to >= today,
+        )
+        .values(current_sequence=Stamped.current_sequence + count)
+        .returning(
+            Stamped.id,
+            Stamped.stamped_number,
+            Stamped.establishment,
+            Stamped.expedition_point,
+            Stamped.current_sequence,
+        )
+    )
+    with session_scope(session) as session:
+        row = session.execute(stmt).first()
+        if row is None:
+            raise _allocation_error(session, count, today)
+        session.flush()
+    return SequenceBlock(
+        stamped_id=row.id,
+        stamped_number=row.stamped_number,
+        establishment=row.establishment,
+        expedition_point=row.expedition_point,
+        first=row.current_sequence - count + 1,
+        last=row.current_sequence,
+    )
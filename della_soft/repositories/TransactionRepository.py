@@ -1,25 +1,96 @@
 from datetime import datetime, timedelta
+from ..models.CustomerModel import Customer
 from ..models.TransactionModel import Transaction
-from .ConnectDB import connect
-from sqlmodel import Session, select
+from .ConnectDB import get_engine, session_scope
+from .KeysetPagination import KeysetPage, keyset_page
+from sqlmodel import Session, String, cast, func, select
 
-def insert_transaction(transaction: Transaction):
-    engine = connect()
-    with Session(engine) as session:
+def insert_transaction(transaction: Transaction, *, session: Session | None = None):
+    with session_scope(session) as session:
         session.add(transaction)
-        session.commit()
+        session.flush()
 
 
-def select_transactions_by_date_range(start_date: str, end_date: str):
-    
-    start_dt = datetime.fromisoformat(start_date)
-    end_dt = datetime.fromisoformat(end_date) + timedelta(days=1) - timedelta(microseconds=1)
+def _date_range(start_date: str, end_date: str) -> tuple[datetime, datetime]:
+    """[start_date, end_date] en días completos como rango semiabierto."""
+    return datetime.fromisoformat(start_date), datetime.fromisoformat(end_date) + timedelta(days=1)
 
-    engine = connect()
-    with Session(engine) as session:
-        query = (
-            select(Transaction)
-            .where(Transaction.transaction_date >= start_dt)
-            .where(Transaction.transaction_date <= end_dt)
+
+def _report_query(with_username: bool):
+    if not with_username:
+        return select(Transaction)
+    return (
+        select(
+            Transaction.id,
+            func.coalesce(Customer.username, cast(Transaction.id_user, String)).label("username"),
+            Transaction.observation,
+            Transaction.amount,
+            Transaction.transaction_date,
+            Transaction.status,
         )
+        .outerjoin(Customer, Customer.id == Transaction.id_user)
+    )
+
+
+def _filtered(query, start_date: str, end_date: str, status: str | None):
+    start_dt, end_dt = _date_range(start_date, end_date)
+    query = query.where(Transaction.transaction_date >= start_dt, Transaction.transaction_date < end_dt)
+    if status:
+        query = query.where(Transaction.status == status)
+    return query
+
+
+def select_transactions_by_date_range(start_date: str, end_date: str, *,
+                                      status: str | None = None, with_username: bool = False):
+    """
+    Transacciones con fecha en [start_date, end_date] (días completos).
+
+    - `status`: filtra por estado en la consulta (None → todos).
+    - `with_username=True`: en vez de entidades devuelve filas livianas
+      (username, observation, amount, transaction_date, status, total_amount)
+      con el usuario unido en el mismo SELECT y `total_amount` = SUM(amount)
+      de todas las filas filtradas.
+    """
+    query = _report_query(with_username)
+    if with_username:
+        query = query.add_columns(func.sum(Transaction.amount).over().label("total_amount"))
+    query = _filtered(query, start_date, end_date, status).order_by(
+        Transaction.transaction_date, Transaction.id
+    )
+
+    engine = get_engine()
+    with Session(engine) as session:
+        if with_username:
+            return session.execute(query).all()
         return session.exec(query).all()
+
+
+def select_transactions_keyset(start_date: str, end_date: str, cursor: str | None = None, limit: int = 5, *,
+                               status: str | None = None, with_username: bool = False) -> KeysetPage:
+    """
+    Transacciones del rango, paginadas por (transaction_date, id). Con
+    `with_username=True` las filas son dicts con el usuario unido, como en
+    `select_transactions_by_date_range`.
+    """
+    query = _filtered(_report_query(with_username), start_date, end_date, status)
+
+    engine = get_engine()
+    with Session(engine) as session:
+        return keyset_page(
+            session, query, Transaction.transaction_date, Transaction.id,
+            (lambda row: (row["transaction_date"], row["id"])) if with_username
+            else (lambda tx: (tx.transaction_date, tx.id)),
+            cursor=cursor, limit=limit, scalars=not with_username,
+        )
+
+
+def summarize_transactions(start_date: str, end_date: str, *, status: str | None = None) -> tuple[int, int]:
+    """(cantidad, suma de amount) de las transacciones del rango, en una consulta."""
+    query = _filtered(
+        select(func.count(Transaction.id), func.coalesce(func.sum(Transaction.amount), 0)),
+        start_date, end_date, status,
+    )
+    engine = get_engine()
+    with Session(engine) as session:
+        count, total = session.execute(query).one()
+        return count, total
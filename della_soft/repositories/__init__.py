@@ -3,4 +3,4 @@ from .CustomerRepository import select_all, select_by_parameter, create_customer
 from .ProductRepository import select_all, get_by_id, delete_product, get_product, insert_product
 from .OrderRepository import select_all
 from .ProductOrderRepository import select_all, select_by_order_id, insert_product_order, delete_product_order
-from .ConnectDB import connect
\ No newline at end of file
+from .ConnectDB import get_engine
\ No newline at end of file
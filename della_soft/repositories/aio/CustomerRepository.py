@@ -0,0 +1,62 @@
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..ConnectDB import async_session_scope
+from ..CustomerRepository import _customer_search, _user_search
+from ..KeysetPagination import KeysetPage, count_rows_async, keyset_page_async
+from ...models.CustomerModel import Customer
+
+
+async def select_all(*, session: AsyncSession | None = None) -> list[Customer]:
+    async with async_session_scope(session) as session:
+        return (await session.exec(select(Customer))).all()
+
+
+async def select_all_users() -> list[Customer]:
+    async with async_session_scope() as session:
+        return (await session.exec(select(Customer).where(Customer.id_rol != 3))).all()
+
+
+async def select_by_parameter(value: str) -> list[Customer]:
+    async with async_session_scope() as session:
+        return (await session.exec(_customer_search(value))).all()
+
+
+async def select_users_by_parameter(value: str) -> list[Customer]:
+    async with async_session_scope() as session:
+        return (await session.exec(_user_search(value))).all()
+
+
+async def select_by_id(id: int) -> list[Customer]:
+    async with async_session_scope() as session:
+        return (await session.exec(select(Customer).where(Customer.id == id))).all()
+
+
+async def select_by_name(name: str) -> Customer | None:
+    async with async_session_scope() as session:
+        query = select(Customer).where(
+            Customer.first_name.ilike(f"%{name}%") | Customer.last_name.ilike(f"%{name}%")
+        )
+        return (await session.exec(query)).first()
+
+
+def _customers_query(filter: str = ""):
+    return _customer_search(filter) if filter.strip() else select(Customer)
+
+
+async def get_total_items(filter: str = "") -> int:
+    """Total de clientes (los que coinciden con `filter`, si se pasa)."""
+    async with async_session_scope() as session:
+        if filter.strip():
+            return await count_rows_async(session, _customers_query(filter))
+        return (await session.exec(select(func.count(Customer.id)))).one()
+
+
+async def get_customer_page(cursor: str | None = None, limit: int = 5, filter: str = "") -> KeysetPage:
+    """Página de clientes por keyset sobre el id; con `filter`, solo los que coinciden."""
+    async with async_session_scope() as session:
+        return await keyset_page_async(
+            session, _customers_query(filter), Customer.id, Customer.id,
+            lambda c: (c.id, c.id),
+            cursor=cursor, limit=limit, scalars=True,
+        )
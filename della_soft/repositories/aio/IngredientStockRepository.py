@@ -0,0 +1,20 @@
+from ..ConnectDB import async_session_scope
+from ..IngredientStockRepository import _stock_rows_query
+from ..KeysetPagination import KeysetPage, count_rows_async, keyset_page_async
+from ...models.IngredientModel import Ingredient
+from ...models.IngredientStockModel import IngredientStock
+
+
+async def select_stock_page(filter: str = "", cursor: str | None = None, limit: int = 5) -> KeysetPage:
+    """Página del listado de stock de ingredientes (con su medida), por nombre."""
+    async with async_session_scope() as session:
+        return await keyset_page_async(
+            session, _stock_rows_query(filter), Ingredient.name, IngredientStock.id,
+            lambda row: (row["name"], row["stock_id"]),
+            cursor=cursor, limit=limit,
+        )
+
+
+async def count_stock(filter: str = "") -> int:
+    async with async_session_scope() as session:
+        return await count_rows_async(session, _stock_rows_query(filter))
@@ -0,0 +1,61 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..ConnectDB import async_session_scope
+from ..KeysetPagination import KeysetPage, count_rows_async, keyset_page_async
+from ..OrderRepository import ORDER_SORT_COLUMNS, _order_rows_query, _order_search_filter
+from ...models.CustomerModel import Customer
+from ...models.OrderModel import Order
+
+
+async def select_all(*, session: AsyncSession | None = None) -> list[Order]:
+    async with async_session_scope(session) as session:
+        return (await session.exec(select(Order))).all()
+
+
+async def select_orders_with_customer(*, session: AsyncSession | None = None) -> list[dict]:
+    """Todos los pedidos con su cliente en una sola consulta (sin N+1)."""
+    async with async_session_scope(session) as session:
+        result = await session.exec(_order_rows_query().order_by(Order.id))
+        return [dict(row) for row in result.mappings()]
+
+
+async def select_orders_keyset(filter: str = "", cursor: str | None = None, limit: int = 5,
+                               sort: str = "id") -> KeysetPage:
+    """
+    Una página de pedidos (con cliente y pendiente) filtrada, ordenada y
+    paginada por keyset en la BD: el costo de una página no depende de qué
+    tan profunda sea. `sort` es una clave de ORDER_SORT_COLUMNS; el valor
+    por el que se ordena viaja en la columna `sort_key` para armar el
+    cursor (en las fechas, NO_DATE en lugar de NULL).
+    """
+    descending = sort.startswith("-")
+    column = ORDER_SORT_COLUMNS.get(sort.lstrip("-"))
+    if column is None:
+        raise ValueError(f"Orden no soportado: {sort}")
+
+    query = _order_rows_query().add_columns(column.label("sort_key"))
+    value = (filter or "").strip()
+    if value:
+        query = query.where(_order_search_filter(value))
+
+    async with async_session_scope() as session:
+        return await keyset_page_async(
+            session, query, column, Order.id,
+            lambda row: (row["sort_key"], row["id"]),
+            cursor=cursor, limit=limit, descending=descending,
+        )
+
+
+async def count_orders(filter: str = "") -> int:
+    query = select(Order.id).join(Customer, Customer.id == Order.id_customer)
+    value = (filter or "").strip()
+    if value:
+        query = query.where(_order_search_filter(value))
+    async with async_session_scope() as session:
+        return await count_rows_async(session, query)
+
+
+async def get_by_id(order_id: int, *, session: AsyncSession | None = None) -> Order | None:
+    async with async_session_scope(session) as session:
+        return await session.get(Order, order_id)
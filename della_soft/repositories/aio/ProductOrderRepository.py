@@ -0,0 +1,16 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..ConnectDB import async_session_scope
+from ...models.ProductOrderModel import ProductOrder
+
+
+async def select_all(*, session: AsyncSession | None = None) -> list[ProductOrder]:
+    async with async_session_scope(session) as session:
+        return (await session.exec(select(ProductOrder))).all()
+
+
+async def select_by_order_id(id_order: int, *, session: AsyncSession | None = None) -> list[ProductOrder]:
+    async with async_session_scope(session) as session:
+        query = select(ProductOrder).where(ProductOrder.id_order == id_order)
+        return (await session.exec(query)).all()
@@ -0,0 +1,15 @@
+from sqlmodel import select
+
+from ..ConnectDB import async_session_scope
+from ..ProductRepository import _product_search
+from ...models.ProductModel import Product
+
+
+async def select_all() -> list[Product]:
+    async with async_session_scope() as session:
+        return (await session.exec(select(Product))).all()
+
+
+async def get_product(value: str) -> list[Product]:
+    async with async_session_scope() as session:
+        return (await session.exec(_product_search(value))).all()
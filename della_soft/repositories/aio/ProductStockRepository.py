@@ -0,0 +1,20 @@
+from ..ConnectDB import async_session_scope
+from ..KeysetPagination import KeysetPage, count_rows_async, keyset_page_async
+from ..ProductStockRepository import _stock_rows_query
+from ...models.ProductModel import Product
+from ...models.ProductStockModel import ProductStock
+
+
+async def select_stock_page(filter: str = "", cursor: str | None = None, limit: int = 5) -> KeysetPage:
+    """Página del listado de stock de productos, ordenado por nombre (keyset)."""
+    async with async_session_scope() as session:
+        return await keyset_page_async(
+            session, _stock_rows_query(filter), Product.name, ProductStock.id,
+            lambda row: (row["name"], row["stock_id"]),
+            cursor=cursor, limit=limit,
+        )
+
+
+async def count_stock(filter: str = "") -> int:
+    async with async_session_scope() as session:
+        return await count_rows_async(session, _stock_rows_query(filter))
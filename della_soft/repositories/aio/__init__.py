@@ -0,0 +1,6 @@
+# della_soft/repositories/aio
+"""
+Variantes async de los repositorios (mismos nombres de función), sobre el
+engine async de ConnectDB. Las usan los services que se llaman desde
+handlers async de Reflex para no bloquear el event loop con I/O de BD.
+"""
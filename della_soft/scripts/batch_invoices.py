@@ -0,0 +1,71 @@
+# della_soft/scripts/batch_invoices.py
+"""
+Facturación de cierre del día: emite las facturas de todos los pedidos pagados sin Invoice.
+
+    python -m della_soft.scripts.batch_invoices
+    python -m della_soft.scripts.batch_invoices --hasta 2025-06-20 --procesos 4 --salida lote.json
+
+Muestra el avance mientras se guardan los PDF y, al final, el rango de
+números emitido, el tiempo de cada etapa y el throughput (facturas/s).
+Con --salida guarda ese resumen en JSON para comparar corridas. Termina
+con código 1 si algún PDF no se pudo generar (la factura queda emitida y
+el PDF se regenera al descargarla).
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+
+def _progress(done: int, total: int) -> None:
+    step = max(1, total // 20)
+    if done == total or done % step == 0:
+        print(f"\r  {done}/{total} PDF ({done / total:.0%})", end="" if done < total else "\n", flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hasta", default=None,
+                        help="solo pedidos con fecha hasta este día inclusive (AAAA-MM-DD)")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos para maquetar (por defecto, uno por CPU; 0 = sin pool)")
+    parser.add_argument("--salida", default=None, help="guardar el resumen en JSON")
+    args = parser.parse_args(argv)
+
+    # Importes diferidos: los procesos del pool ("spawn") vuelven a importar
+    # este módulo, y así no cargan reflex ni los modelos, que no usan.
+    from ..repositories.ConnectDB import init_db
+    from ..services.InvoiceBatchService import invoice_paid_orders
+
+    until = datetime.fromisoformat(args.hasta) + timedelta(days=1) if args.hasta else None
+    init_db()
+    result = invoice_paid_orders(until=until, workers=args.procesos, progress=_progress)
+
+    if not result.invoiced:
+        print("No hay pedidos pagados sin factura.")
+        return 0
+    timings = {stage: round(seconds, 3) for stage, seconds in result.timings.items()}
+    print(f"{result.invoiced} facturas ({result.first_number} … {result.last_number}), "
+          f"{result.rendered} PDF, {len(result.failed)} con error")
+    print("  " + "  ".join(f"{stage} {seconds:.2f} s" for stage, seconds in timings.items())
+          + f"  →  {result.throughput:.1f} facturas/s")
+    for invoice_id, error in list(result.failed.items())[:10]:
+        print(f"ERROR factura {invoice_id}: {error}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            json.dump({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "invoiced": result.invoiced,
+                "rendered": result.rendered,
+                "failed": len(result.failed),
+                "numbers": [result.first_number, result.last_number],
+                "timings_s": timings,
+                "throughput_per_s": round(result.throughput, 2),
+            }, fh, indent=2, ensure_ascii=False)
+        print(f"Resumen en {args.salida}")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# della_soft/scripts/benchmark.py
+"""
+Benchmarks de services y repositorios contra una base local con datos.
+
+    python -m della_soft.scripts.benchmark --salida bench.json
+    python -m della_soft.scripts.benchmark --sembrar --salida bench.json
+    python -m della_soft.scripts.benchmark --salida nuevo.json --comparar bench.json
+
+Con --sembrar, si la base de DB_URL está vacía se carga primero con
+seed_data (10k clientes, 100k pedidos, 300k líneas, 500k transacciones).
+Cada caso se ejecuta una vez para calentar y luego --repeticiones veces;
+el JSON guarda, por caso, los tiempos (ms) y las consultas SQL por llamada.
+Con --comparar se listan los casos cuya mediana empeoró más que
+--tolerancia (20 % por defecto) y el comando termina con código 1.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import exists, func, select
+from sqlmodel import Session
+
+from ..models import Invoice, Order, ProductOrder, Transaction, Customer
+from ..repositories.ConnectDB import dispose_async_engine, get_engine, init_db
+from ..repositories.QueryStats import track_queries
+from ..services.DashboardService import (
+    RANGE_MONTH,
+    get_orders_per_day_month,
+    get_stock_rotation_data_month,
+    get_top_products_month,
+)
+from ..services.OrderService import (
+    count_orders_service,
+    select_order_rows_service,
+    select_orders_keyset_service,
+)
+from ..services.POSService import pos_is_open
+from ..services.ProductStockService import count_stock_service, select_stock_page_service
+from ..services.TransactionService import get_transactions_by_date_range_service
+from ..views.GenerateInvoicePDF import prepare_invoice_data
+from ..views.InvoiceRender import render_invoice_pdf
+from .seed_data import is_seeded, seed
+
+PAGE_SIZE = 10
+
+
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def _cases(loop: asyncio.AbstractEventLoop, rng: random.Random) -> dict[str, Callable[[], object]]:
+    """Casos a medir: nombre → función sin argumentos."""
+    run = loop.run_until_complete
+    today = date.today()
+    month_ago = (today - timedelta(days=30)).isoformat()
+
+    with get_engine().connect() as conn:
+        # Pedidos pagados sin factura: los que de verdad se facturarían
+        pending = conn.execute(
+            select(Order.id)
+            .where(Order.total_paid >= Order.total_order,
+                   ~exists().where(Invoice.id_order == Order.id))
+            .order_by(Order.id)
+        ).scalars().all()
+
+    def invoice():
+        # Se revierte: no consume números del timbrado ni deja el Invoice, y
+        # el PDF queda en memoria (sin escribir en public/facturas), así que
+        # cada corrida mide lo mismo.
+        with Session(get_engine()) as session:
+            data = prepare_invoice_data(rng.choice(pending), session=session)
+            session.rollback()
+        return render_invoice_pdf(data)
+
+    def pos_load_date():
+        # Lo mismo que POSView.load_date: la caja del día y los pedidos
+        return pos_is_open(today.isoformat()), run(select_order_rows_service())
+
+    cases = {
+        "dashboard.stock_rotation.rollup": lambda: run(get_stock_rotation_data_month("rollup")),
+        "dashboard.stock_rotation.sql": lambda: run(get_stock_rotation_data_month("sql")),
+        "dashboard.stock_rotation.python": lambda: run(get_stock_rotation_data_month("python")),
+        "dashboard.top_products.rollup": lambda: run(get_top_products_month("rollup")),
+        "dashboard.top_products.sql": lambda: run(get_top_products_month("sql")),
+        "dashboard.top_products.python": lambda: run(get_top_products_month("python")),
+        "dashboard.orders_per_day": lambda: run(get_orders_per_day_month(RANGE_MONTH)),
+        "orders.list": lambda: (run(select_orders_keyset_service("", None, PAGE_SIZE)),
+                                run(count_orders_service(""))),
+        "orders.search": lambda: (run(select_orders_keyset_service("Nombre12", None, PAGE_SIZE)),
+                                  run(count_orders_service("Nombre12"))),
+        "pos.load_date": pos_load_date,
+        "transactions.load_month": lambda: get_transactions_by_date_range_service(
+            month_ago, today.isoformat(), status=None, with_username=True),
+        "stock.list": lambda: (run(select_stock_page_service("", None, PAGE_SIZE)),
+                               run(count_stock_service(""))),
+    }
+    if pending:
+        cases["invoice.generate"] = invoice
+    return cases
+
+
+def _measure(fn: Callable[[], object], repetitions: int) -> dict:
+    fn()   # calentamiento (cachés, pool, planes)
+    times, queries = [], []
+    for _ in range(repetitions):
+        with track_queries("benchmark") as scope:
+            t0 = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - t0) * 1000)
+        queries.append(scope.queries)
+    return {
+        "runs": repetitions,
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "p95_ms": round(_percentile(times, 95), 3),
+        "max_ms": round(max(times), 3),
+        "queries": max(queries),
+    }
+
+
+def _volumes() -> dict:
+    with get_engine().connect() as conn:
+        return {
+            model.__tablename__: conn.execute(select(func.count()).select_from(model.__table__)).scalar_one()
+            for model in (Customer, Order, ProductOrder, Transaction)
+        }
+
+
+def run_benchmarks(repetitions: int = 5, only: list[str] | None = None,
+                   skip: list[str] | None = None, seed_value: int = 42) -> dict:
+    """Ejecuta los casos (filtrados por prefijo) y devuelve el resultado para el JSON."""
+    loop = asyncio.new_event_loop()
+    try:
+        cases = _cases(loop, random.Random(seed_value))
+        selected = {
+            name: fn for name, fn in cases.items()
+            if (not only or any(name.startswith(p) for p in only))
+            and not any(name.startswith(p) for p in (skip or []))
+        }
+        results = {}
+        for name, fn in selected.items():
+            results[name] = _measure(fn, repetitions)
+            print(f"{name:<34} mediana {results[name]['median_ms']:>10.2f} ms"
+                  f"  p95 {results[name]['p95_ms']:>10.2f} ms  {results[name]['queries']} consultas")
+        loop.run_until_complete(dispose_async_engine())
+    finally:
+        loop.close()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "dialect": get_engine().dialect.name,
+            "python": platform.python_version(),
+            "repetitions": repetitions,
+            "volumes": _volumes(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.2) -> list[dict]:
+    """Casos cuya mediana creció más que `tolerance` (proporción) respecto de `baseline`."""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or before["median_ms"] <= 0:
+            continue
+        change = now["median_ms"] / before["median_ms"] - 1
+        if change > tolerance:
+            regressions.append({
+                "case": name,
+                "before_ms": before["median_ms"],
+                "after_ms": now["median_ms"],
+                "change": round(change, 3),
+            })
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--salida", default="bench_results.json")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--solo", default="", help="prefijos de casos, separados por coma")
+    parser.add_argument("--omitir", default="", help="prefijos de casos a omitir")
+    parser.add_argument("--sembrar", action="store_true", help="cargar datos si la base está vacía")
+    args = parser.parse_args(argv)
+
+    init_db()
+    if args.sembrar and not is_seeded():
+        print("Cargando datos sintéticos…")
+        seed()
+
+    result = run_benchmarks(
+        args.repeticiones,
+        only=[p for p in args.solo.split(",") if p],
+        skip=[p for p in args.omitir.split(",") if p],
+    )
+    with open(args.salida, "w", encoding="utf-8") as fh:
+        json.dump(result, fh, indent=2, ensure_ascii=False)
+    print(f"Resultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fh:
+            regressions = compare(json.load(fh), result, args.tolerancia)
+        for r in regressions:
+            print(f"REGRESIÓN {r['case']}: {r['before_ms']} → {r['after_ms']} ms (+{r['change']:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+# della_soft/scripts/load_test.py
+"""
+Prueba de carga con varias cajas concurrentes sobre la capa de services.
+
+    python -m della_soft.scripts.load_test --cajeros 8 --operaciones 200
+    python -m della_soft.scripts.load_test --cajeros 8 --duracion 60 --salida carga.json
+
+Cada cajero es un hilo (como los event handlers, que llaman a los
+services con asyncio.to_thread) que repite, con pesos configurables:
+
+- create_order: pedido nuevo de 1 a 4 productos (create_order_with_lines_service)
+- payment:      pago total o parcial de uno de esos pedidos (process_payment_service)
+- reverse:      reverso de lo pagado (process_reverse_service)
+- bill:         gasto de caja (process_bill_service)
+
+Igual que en POSView, la caja se toma de pos_is_open y los totales del
+pedido se leen antes de operar, así que las carreras entre cajas son las
+mismas que en producción. Al final se informa el throughput, los
+percentiles de latencia por operación, los rechazos de negocio (stock
+insuficiente), los conflictos de la BD (deadlock, serialización, bloqueo)
+y si la caja, los pedidos y el stock quedaron consistentes con las
+transacciones registradas. Si no, el comando termina con código 1.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+
+from ..models import Customer, Order, POS, Product, ProductOrder, ProductStock, Transaction
+from ..models.ProductModel import ProductType
+from ..repositories.ConnectDB import get_engine, init_db
+from ..services.EventProfiler import Histogram
+from ..services.OrderService import create_order_with_lines_service
+from ..services.POSService import insert_pos_register, pos_is_open
+from ..services.PaymentService import (
+    process_bill_service,
+    process_payment_service,
+    process_reverse_service,
+)
+
+OPERATIONS = ("create_order", "payment", "reverse", "bill")
+DEFAULT_WEIGHTS = {"create_order": 3, "payment": 4, "reverse": 1, "bill": 1}
+MAX_ISSUES = 20   # discrepancias de consistencia que se listan como máximo
+
+# Códigos SQLSTATE de PostgreSQL que indican un conflicto entre transacciones
+_CONFLICT_CODES = {"40001", "40P01", "55P03"}
+_CONFLICT_TEXT = ("deadlock", "could not serialize", "database is locked", "lock timeout")
+
+
+def classify_error(exc: BaseException) -> str:
+    """'rejected' (regla de negocio), 'conflict' (deadlock/serialización/bloqueo) o 'error'."""
+    if isinstance(exc, ValueError):
+        return "rejected"
+    if isinstance(exc, DBAPIError):
+        code = getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+        if code in _CONFLICT_CODES or any(t in str(exc.orig).lower() for t in _CONFLICT_TEXT):
+            return "conflict"
+    return "error"
+
+
+def _parse_weights(text: str) -> dict[str, int]:
+    """'payment=4,bill=1' → pesos; las operaciones no nombradas quedan con su peso por defecto."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, text.split(",")):
+        name, _, value = item.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Operación desconocida: {name}")
+        weights[name] = int(value)
+    return weights
+
+
+class _Run:
+    """Estado compartido entre los cajeros de una corrida."""
+
+    def __init__(self, products: dict[int, int], customers: list[int], users: list[int]):
+        self.products = products        # id → precio
+        self.customers = customers
+        self.users = users
+        self.orders: list[int] = []     # pedidos creados en la corrida
+        self.latency = {op: Histogram(size=1_000_000) for op in OPERATIONS}
+        self.outcomes = {op: Counter() for op in OPERATIONS}
+        self.errors: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add_order(self, order_id: int) -> None:
+        with self._lock:
+            self.orders.append(order_id)
+
+    def pick_order(self, rng: random.Random) -> int | None:
+        with self._lock:
+            return rng.choice(self.orders) if self.orders else None
+
+    def record(self, op: str, ms: float, outcome: str, exc: BaseException | None = None) -> None:
+        with self._lock:
+            self.latency[op].add(ms)
+            self.outcomes[op][outcome] += 1
+            if exc is not None and outcome == "error":
+                self.errors[f"{type(exc).__name__}: {str(exc).splitlines()[0][:120]}"] += 1
+
+
+def _read_order(order_id: int) -> Order:
+    with get_engine().connect() as conn:
+        row = conn.execute(
+            select(Order.total_paid, Order.total_order).where(Order.id == order_id)
+        ).one()
+    return Order(id=order_id, total_paid=row.total_paid, total_order=row.total_order)
+
+
+def _create_order(run: _Run, rng: random.Random, user_id: int) -> str:
+    chosen = rng.sample(list(run.products), min(rng.randrange(1, 5), len(run.products)))
+    lines = [ProductOrder(id_product=pid, quantity=rng.randrange(1, 4)) for pid in chosen]
+    now = datetime.now()
+    order = create_order_with_lines_service(
+        Order(
+            observation="Prueba de carga",
+            total_order=sum(po.quantity * run.products[po.id_product] for po in lines),
+            total_paid=0,
+            order_date=now,
+            delivery_date=now + timedelta(days=1),
+            id_customer=rng.choice(run.customers),
+        ),
+        lines,
+    )
+    run.add_order(order.id)
+    return "create_order"
+
+
+def _pay_or_reverse(run: _Run, rng: random.Random, user_id: int, op: str) -> str:
+    order_id = run.pick_order(rng)
+    if order_id is None:
+        return _create_order(run, rng, user_id)
+    order = _read_order(order_id)
+    pending = order.total_order - order.total_paid
+    # Sin saldo no hay pago posible y sin pagos no hay reverso: se hace el otro
+    if op == "payment" and pending <= 0:
+        op = "reverse"
+    elif op == "reverse" and order.total_paid <= 0:
+        op = "payment"
+    pos = pos_is_open(date.today().isoformat())
+    if op == "payment":
+        amount = pending if rng.random() < 0.7 else max(1, pending // 2)
+        process_payment_service(order.id, amount, pos, user_id)
+    else:
+        process_reverse_service(order.id, -order.total_paid, pos, user_id)
+    return op
+
+
+def _bill(run: _Run, rng: random.Random, user_id: int) -> str:
+    pos = pos_is_open(date.today().isoformat())
+    process_bill_service(-rng.randrange(1, 20) * 1000, "Gasto de prueba de carga", pos, user_id)
+    return "bill"
+
+
+def _cashier(run: _Run, number: int, operations: int, deadline: float,
+             weights: dict[str, int], seed: int) -> None:
+    rng = random.Random(seed * 1000 + number)
+    user_id = run.users[number % len(run.users)]
+    names, shares = list(weights), list(weights.values())
+    done = 0
+    while (not operations or done < operations) and (not deadline or time.monotonic() < deadline):
+        op = rng.choices(names, shares)[0]
+        t0 = time.perf_counter()
+        try:
+            if op == "create_order":
+                executed = _create_order(run, rng, user_id)
+            elif op == "bill":
+                executed = _bill(run, rng, user_id)
+            else:
+                executed = _pay_or_reverse(run, rng, user_id, op)
+            run.record(executed, (time.perf_counter() - t0) * 1000, "ok")
+        except Exception as exc:   # se registra y el cajero sigue
+            run.record(op, (time.perf_counter() - t0) * 1000, classify_error(exc), exc)
+        done += 1
+
+
+# ------------------------------------------------------------------
+# Preparación y verificación
+# ------------------------------------------------------------------
+def _today_pos() -> POS:
+    pos = pos_is_open(date.today().isoformat())
+    if pos is None:
+        insert_pos_register(None, 0, 0, datetime.now())
+        pos = pos_is_open(date.today().isoformat())
+    return pos
+
+
+def _snapshot(conn, pos_id: int) -> dict:
+    """Valores de partida para comparar deltas al final."""
+    return {
+        "pos_final": conn.execute(select(POS.final_amount).where(POS.id == pos_id)).scalar_one(),
+        "max_transaction": conn.execute(select(func.max(Transaction.id))).scalar_one() or 0,
+        "stock": dict(conn.execute(select(ProductStock.product_id, ProductStock.quantity)).all()),
+    }
+
+
+def check_consistency(pos_id: int, start: dict, order_ids: list[int]) -> dict:
+    """
+    Compara el estado final con lo registrado en `transaction`:
+
+    - caja:    final_amount varió exactamente la suma de las transacciones nuevas de la caja
+    - pedidos: total_paid de cada pedido de la corrida = suma de sus transacciones
+    - stock:   cada producto bajó exactamente lo de las líneas de los pedidos
+               de la corrida que quedaron pagados, y ninguno quedó negativo
+    """
+    issues: list[str] = []
+    with get_engine().connect() as conn:
+        pos_final = conn.execute(select(POS.final_amount).where(POS.id == pos_id)).scalar_one()
+        pos_moved = conn.execute(
+            select(func.coalesce(func.sum(Transaction.amount), 0))
+            .where(Transaction.id > start["max_transaction"], Transaction.id_POS == pos_id)
+        ).scalar_one()
+        if pos_final - start["pos_final"] != pos_moved:
+            issues.append(f"caja {pos_id}: final_amount varió {pos_final - start['pos_final']}, "
+                          f"transacciones {pos_moved}")
+
+        paid_orders = set()
+        for chunk in range(0, len(order_ids), 500):
+            ids = order_ids[chunk:chunk + 500]
+            tx_sums = dict(conn.execute(
+                select(Transaction.id_order, func.sum(Transaction.amount))
+                .where(Transaction.id_order.in_(ids)).group_by(Transaction.id_order)
+            ).all())
+            for oid, total_paid, total_order in conn.execute(
+                select(Order.id, Order.total_paid, Order.total_order).where(Order.id.in_(ids))
+            ).all():
+                if total_paid != tx_sums.get(oid, 0):
+                    issues.append(f"pedido {oid}: total_paid {total_paid}, transacciones {tx_sums.get(oid, 0)}")
+                if total_paid >= total_order:
+                    paid_orders.add(oid)
+
+        sold: Counter = Counter()
+        ids = list(paid_orders)
+        for chunk in range(0, len(ids), 500):
+            for pid, qty in conn.execute(
+                select(ProductOrder.id_product, func.sum(ProductOrder.quantity))
+                .join(Product, Product.id == ProductOrder.id_product)
+                .where(ProductOrder.id_order.in_(ids[chunk:chunk + 500]),
+                       Product.product_type == ProductType.IN_STOCK.name)
+                .group_by(ProductOrder.id_product)
+            ).all():
+                sold[pid] += qty
+        for pid, quantity in conn.execute(select(ProductStock.product_id, ProductStock.quantity)).all():
+            expected = start["stock"].get(pid, 0) - sold[pid]
+            if quantity < 0:
+                issues.append(f"producto {pid}: stock negativo ({quantity})")
+            elif quantity != expected:
+                issues.append(f"producto {pid}: stock {quantity}, esperado {expected}")
+
+    return {"consistent": not issues, "issues": issues[:MAX_ISSUES], "issue_count": len(issues)}
+
+
+def run_load(cashiers: int = 4, operations: int = 100, duration: float = 0.0,
+             weights: dict[str, int] | None = None, seed: int = 42) -> dict:
+    """Ejecuta la carga y devuelve el informe (también es lo que se guarda como JSON)."""
+    init_db()
+    weights = {op: w for op, w in (weights or DEFAULT_WEIGHTS).items() if w > 0}
+    pos = _today_pos()
+    with get_engine().connect() as conn:
+        products = dict(conn.execute(select(Product.id, Product.price)).all())
+        users = list(conn.execute(select(Customer.id).where(Customer.username.is_not(None))).scalars())
+        customers = list(conn.execute(select(Customer.id).limit(1000)).scalars())
+        start = _snapshot(conn, pos.id)
+    if not products or not customers:
+        raise ValueError("La base no tiene productos o clientes: cargarla con seed_data")
+
+    run = _Run(products, customers, users or customers[:1])
+    deadline = time.monotonic() + duration if duration else 0.0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=cashiers, thread_name_prefix="cajero") as pool:
+        futures = [pool.submit(_cashier, run, n, operations, deadline, weights, seed)
+                   for n in range(cashiers)]
+        for f in futures:
+            f.result()
+    elapsed = time.perf_counter() - t0
+
+    outcomes = Counter()
+    for counter in run.outcomes.values():
+        outcomes.update(counter)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "dialect": get_engine().dialect.name,
+            "cashiers": cashiers,
+            "operations_per_cashier": operations,
+            "duration_s": round(elapsed, 3),
+            "weights": weights,
+        },
+        "throughput_ops_s": round(outcomes["ok"] / elapsed, 2) if elapsed else 0.0,
+        "totals": {k: outcomes[k] for k in ("ok", "rejected", "conflict", "error")},
+        "operations": {
+            op: {"outcomes": dict(run.outcomes[op]), "latency_ms": run.latency[op].summary()}
+            for op in OPERATIONS if run.latency[op].count
+        },
+        "errors": dict(run.errors.most_common(10)),
+        "consistency": check_consistency(pos.id, start, run.orders),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cajeros", type=int, default=4)
+    parser.add_argument("--operaciones", type=int, default=100, help="por cajero (0 = sin límite)")
+    parser.add_argument("--duracion", type=float, default=0.0, help="segundos (0 = sin límite)")
+    parser.add_argument("--pesos", default="", help="p. ej. payment=4,reverse=1,bill=1,create_order=3")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default=None, help="guardar el informe en JSON")
+    args = parser.parse_args(argv)
+    if not args.operaciones and not args.duracion:
+        parser.error("indicar --operaciones o --duracion")
+
+    report = run_load(args.cajeros, args.operaciones, args.duracion,
+                      _parse_weights(args.pesos), args.semilla)
+
+    totals = report["totals"]
+    print(f"{args.cajeros} cajeros, {report['meta']['duration_s']} s: "
+          f"{report['throughput_ops_s']} ops/s  (ok {totals['ok']}, rechazos {totals['rejected']}, "
+          f"conflictos {totals['conflict']}, errores {totals['error']})")
+    for op, data in report["operations"].items():
+        lat = data["latency_ms"]
+        print(f"  {op:<13} p50 {lat['p50']:>9.2f} ms  p95 {lat['p95']:>9.2f} ms  "
+              f"p99 {lat['p99']:>9.2f} ms  {data['outcomes']}")
+    for issue in report["consistency"]["issues"]:
+        print(f"INCONSISTENCIA {issue}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+        print(f"Informe en {args.salida}")
+    return 0 if report["consistency"]["consistent"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+# della_soft/scripts/rebuild_daily_sales.py
+"""
+Reconstruye el resumen diario daily_product_sales a partir de los pedidos.
+
+    python -m della_soft.scripts.rebuild_daily_sales
+    python -m della_soft.scripts.rebuild_daily_sales --desde 2025-05-01 --hasta 2025-05-31
+
+Sin fechas recalcula todo el historial (p. ej. después de crear la tabla o
+de corregir pedidos directamente en la base).
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from ..repositories.ConnectDB import init_db
+from ..services.DailySalesService import rebuild_daily_sales_service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--desde", type=date.fromisoformat, default=None)
+    parser.add_argument("--hasta", type=date.fromisoformat, default=None)
+    args = parser.parse_args(argv)
+
+    init_db()
+    t0 = time.perf_counter()
+    rows = rebuild_daily_sales_service(args.desde, args.hasta)
+    print(f"daily_product_sales: {rows} filas en {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
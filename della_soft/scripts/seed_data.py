@@ -0,0 +1,336 @@
+# della_soft/scripts/seed_data.py
+"""
+Carga datos sintéticos con volúmenes de producción en la base de DB_URL.
+
+    python -m della_soft.scripts.seed_data
+    python -m della_soft.scripts.seed_data --clientes 500 --pedidos 2000 --semilla 7
+
+Genera todos los modelos: roles, clientes/usuarios, productos de los dos
+ProductType, unidades de medida, ingredientes con stock, recetas con su
+detalle, stock de productos, pedidos con líneas, cajas diarias con sus
+transacciones, timbrado y facturas. Los datos son coherentes entre sí:
+cada pedido tiene líneas y cliente, su total_paid es la suma de sus pagos
+y reversos (en la caja de su día), el saldo final de cada caja es el
+inicial más sus transacciones y las facturas usan la numeración del
+timbrado. Con la misma semilla se generan siempre las mismas filas.
+
+Las filas se insertan con ids explícitos: en PostgreSQL con COPY … FROM
+STDIN (CSV en memoria, por lotes) y en otras bases con INSERT de varias
+filas (executemany); al final se ajustan las secuencias.
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from ..models import (
+    Customer,
+    Ingredient,
+    IngredientStock,
+    Invoice,
+    Measure,
+    Order,
+    POS,
+    Product,
+    ProductOrder,
+    ProductStock,
+    Recipe,
+    RecipeDetail,
+    Rol,
+    Stamped,
+    Transaction,
+)
+from ..models.ProductModel import ProductType
+from ..repositories.ConnectDB import get_engine
+from ..repositories.DailySalesRepository import rebuild
+from ..services.SystemService import hash_password
+
+BATCH_SIZE = 5000
+COPY_BATCH_SIZE = 50_000
+USERS = 10   # los primeros clientes son usuarios del sistema (cajeros/admin)
+MEASURES = ["Kilogramo", "Gramo", "Litro", "Mililitro", "Unidad"]
+
+
+@dataclass
+class SeedSizes:
+    customers: int = 10_000
+    products: int = 60
+    orders: int = 100_000
+    lines: int = 300_000
+    transactions: int = 500_000
+    days: int = 365
+    ingredients: int = 80
+    invoices: int = 20_000   # como máximo, uno por pedido pagado
+
+
+def _batches(rows, size: int = BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_value(value):
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    return value   # None → campo vacío = NULL en COPY … CSV
+
+
+def _copy(conn, table, batch: list[dict]) -> None:
+    """COPY de un lote (PostgreSQL): mucho más rápido que INSERT fila a fila."""
+    preparer = conn.dialect.identifier_preparer
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([_csv_value(row[c]) for c in columns])
+    buffer.seek(0)
+    sql = (f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(c) for c in columns)}) "
+           f"FROM STDIN WITH (FORMAT csv)")
+    with conn.connection.dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+def _insert(conn, model, rows) -> int:
+    table = model.__table__
+    use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+    count = 0
+    for batch in _batches(rows, COPY_BATCH_SIZE if use_copy else BATCH_SIZE):
+        if use_copy:
+            _copy(conn, table, batch)
+        else:
+            conn.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+
+def _reset_sequences(conn, models) -> None:
+    """En PostgreSQL, deja las secuencias después de los ids insertados a mano."""
+    if conn.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__table__
+        pk = list(table.primary_key.columns)[0].name
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', '{pk}'), "
+            f"COALESCE((SELECT MAX({pk}) FROM \"{table.name}\"), 1))"
+        ))
+
+
+def _split_lines(rng: random.Random, orders: int, lines: int) -> list[int]:
+    """Cantidad de líneas por pedido (al menos 1) que suma `lines`."""
+    counts = [1] * orders
+    for _ in range(max(lines - orders, 0)):
+        counts[rng.randrange(orders)] += 1
+    return counts
+
+
+def seed(sizes: SeedSizes | None = None, *, seed: int = 42, today: date | None = None) -> dict:
+    """Genera todos los datos; devuelve la cantidad de filas por tabla."""
+    sizes = sizes or SeedSizes()
+    today = today or date.today()
+    rng = random.Random(seed)
+    first_day = today - timedelta(days=sizes.days - 1)
+    counts: dict[str, int] = {}
+
+    with get_engine().begin() as conn:
+        counts["rol"] = _insert(conn, Rol, [
+            {"id_rol": 1, "description": "Administrador"},
+            {"id_rol": 2, "description": "Cajero"},
+            {"id_rol": 3, "description": "Cliente"},
+        ])
+
+        password = hash_password("della")   # un solo hash: bcrypt es lento a propósito
+        counts["customer"] = _insert(conn, Customer, (
+            {
+                "id": i,
+                "first_name": f"Nombre{i}",
+                "last_name": f"Apellido{rng.randrange(2000)}",
+                "ci": str(1_000_000 + i),
+                "contact": f"09{rng.randrange(10**8):08d}",
+                "div": rng.randrange(10),
+                "username": f"usuario{i}" if i <= USERS else None,
+                "password": password if i <= USERS else None,
+                "id_rol": (1 if i == 1 else 2) if i <= USERS else 3,
+            }
+            for i in range(1, sizes.customers + 1)
+        ))
+
+        prices = {}
+        products = []
+        for pid in range(1, sizes.products + 1):
+            kind = ProductType.IN_STOCK if pid % 2 else ProductType.ON_DEMAND
+            prices[pid] = rng.randrange(10, 300) * 500
+            products.append({
+                "id": pid, "name": f"Producto {pid}", "description": None,
+                "product_type": kind.name, "price": prices[pid],
+            })
+        counts["product"] = _insert(conn, Product, products)
+        in_stock = [p["id"] for p in products if p["product_type"] == ProductType.IN_STOCK.name]
+        counts["product_stock"] = _insert(conn, ProductStock, (
+            {"id": i, "product_id": pid, "quantity": rng.randrange(50, 500), "min_quantity": 10}
+            for i, pid in enumerate(in_stock, start=1)
+        ))
+
+        # Insumos: medidas, ingredientes con stock y una receta por producto
+        counts["measure"] = _insert(conn, Measure, (
+            {"id": i, "description": name} for i, name in enumerate(MEASURES, start=1)
+        ))
+        counts["ingredient"] = _insert(conn, Ingredient, (
+            {"id": i, "name": f"Ingrediente {i}", "measure_id": rng.randrange(1, len(MEASURES) + 1)}
+            for i in range(1, sizes.ingredients + 1)
+        ))
+        counts["ingredient_stock"] = _insert(conn, IngredientStock, (
+            {"id": i, "ingredient_id": i, "quantity": round(rng.uniform(5, 200), 2), "min_quantity": 5.0}
+            for i in range(1, sizes.ingredients + 1)
+        ))
+        counts["recipe"] = _insert(conn, Recipe, (
+            {"id": pid, "description": f"Receta de Producto {pid}", "id_product": pid}
+            for pid in range(1, sizes.products + 1)
+        ))
+        details = []
+        if sizes.ingredients:
+            for pid in range(1, sizes.products + 1):
+                for ingredient in rng.sample(range(1, sizes.ingredients + 1), min(rng.randrange(3, 9), sizes.ingredients)):
+                    details.append({"id": len(details) + 1, "quantity": round(rng.uniform(0.05, 2), 3),
+                                    "id_ingredient": ingredient, "id_recipe": pid})
+        counts["recipe_detail"] = _insert(conn, RecipeDetail, details)
+
+        # Pedidos y líneas: el total del pedido es la suma de sus líneas
+        line_counts = _split_lines(rng, sizes.orders, sizes.lines)
+        orders, lines, transactions, paid_orders = [], [], [], []
+        line_id = 0
+        for oid in range(1, sizes.orders + 1):
+            day = rng.randrange(sizes.days)
+            order_date = datetime.combine(first_day + timedelta(days=day), datetime.min.time()) + \
+                timedelta(hours=rng.randrange(8, 20), minutes=rng.randrange(60))
+            total = 0
+            for pid in rng.sample(range(1, sizes.products + 1), min(line_counts[oid - 1], sizes.products)):
+                line_id += 1
+                quantity = rng.randrange(1, 4)
+                total += quantity * prices[pid]
+                lines.append({"id": line_id, "quantity": quantity, "id_product": pid, "id_order": oid})
+            paid = total if rng.random() < 0.8 else rng.choice((0, total // 2))
+            order = {
+                "id": oid, "observation": None, "total_order": total, "total_paid": 0,
+                "order_date": order_date, "delivery_date": order_date + timedelta(days=rng.randrange(1, 4)),
+                "id_customer": rng.randrange(USERS + 1, sizes.customers + 1) if sizes.customers > USERS else 1,
+            }
+            orders.append(order)
+            # Un pago en la caja del día por pedido pagado, mientras alcancen
+            # las transacciones; los demás pedidos quedan sin pagar
+            if paid and len(transactions) < sizes.transactions:
+                order["total_paid"] = paid
+                paid_orders.append((order, day))
+                transactions.append({
+                    "id": len(transactions) + 1, "observation": f"Pago por {paid}", "amount": paid,
+                    "transaction_date": order_date, "status": "PAGO", "id_POS": day + 1,
+                    "id_user": rng.randrange(1, USERS + 1), "id_order": oid,
+                })
+
+        # El resto de las transacciones: gastos y reversos. Un reverso solo
+        # toca un pedido con algo pagado, en la caja del día del pago, y le
+        # descuenta el monto a total_paid.
+        while len(transactions) < sizes.transactions:
+            tid = len(transactions) + 1
+            order, day = rng.choice(paid_orders) if paid_orders else (None, None)
+            if order is not None and order["total_paid"] > 0 and rng.random() < 0.1:
+                amount = -min(rng.randrange(1, 50) * 1000, order["total_paid"])
+                order["total_paid"] += amount
+                transactions.append({
+                    "id": tid, "observation": "Reverso", "amount": amount,
+                    "transaction_date": order["order_date"] + timedelta(minutes=rng.randrange(1, 60)),
+                    "status": "REVERSO", "id_POS": day + 1,
+                    "id_user": rng.randrange(1, USERS + 1), "id_order": order["id"],
+                })
+                continue
+            day = rng.randrange(sizes.days)
+            when = datetime.combine(first_day + timedelta(days=day), datetime.min.time()) + \
+                timedelta(hours=rng.randrange(8, 20), minutes=rng.randrange(60))
+            transactions.append({
+                "id": tid, "observation": "Insumos", "amount": -rng.randrange(1, 100) * 1000,
+                "transaction_date": when, "status": "GASTO", "id_POS": day + 1,
+                "id_user": rng.randrange(1, USERS + 1), "id_order": None,
+            })
+
+        # Cajas diarias: el saldo final es el inicial más sus transacciones
+        movements = [0] * sizes.days
+        for tx in transactions:
+            movements[tx["id_POS"] - 1] += tx["amount"]
+        counts["pos"] = _insert(conn, POS, (
+            {"id": d + 1, "initial_amount": 500_000, "final_amount": 500_000 + movements[d],
+             "pos_date": datetime.combine(first_day + timedelta(days=d), datetime.min.time()).replace(hour=7)}
+            for d in range(sizes.days)
+        ))
+        counts["order"] = _insert(conn, Order, orders)
+        counts["product_order"] = _insert(conn, ProductOrder, lines)
+        counts["transaction"] = _insert(conn, Transaction, transactions)
+
+        # Facturas de una parte de los pedidos pagados, con numeración correlativa
+        fully_paid = [o for o in orders if o["total_paid"] == o["total_order"]]
+        invoiced = sorted(rng.sample(fully_paid, min(sizes.invoices, len(fully_paid))),
+                          key=lambda o: (o["order_date"], o["id"]))
+        counts["stamped"] = _insert(conn, Stamped, [{
+            "id": 1, "stamped_number": "12345678", "establishment": "001", "expedition_point": "001",
+            "current_sequence": len(invoiced), "max_sequence": 9_999_999,
+            "date_from": first_day, "date_to": today + timedelta(days=365), "active": True,
+        }])
+        counts["invoice"] = _insert(conn, Invoice, (
+            {"id": n, "iva": round(o["total_order"] / 11, 2), "invoice_date": o["order_date"],
+             "id_order": o["id"], "id_stamped": 1, "nro_factura": f"001-001-{n:06d}",
+             "pdf_hash": None, "canceled": False}
+            for n, o in enumerate(invoiced, start=1)
+        ))
+
+        _reset_sequences(conn, [Rol, Customer, Product, ProductStock, Measure, Ingredient,
+                                IngredientStock, Recipe, RecipeDetail, POS, Order,
+                                ProductOrder, Transaction, Stamped, Invoice])
+
+    counts["daily_product_sales"] = rebuild()
+    return counts
+
+
+def is_seeded() -> bool:
+    with get_engine().connect() as conn:
+        return conn.execute(select(func.count()).select_from(Order.__table__)).scalar_one() > 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = SeedSizes()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clientes", type=int, default=defaults.customers)
+    parser.add_argument("--productos", type=int, default=defaults.products)
+    parser.add_argument("--pedidos", type=int, default=defaults.orders)
+    parser.add_argument("--lineas", type=int, default=defaults.lines)
+    parser.add_argument("--transacciones", type=int, default=defaults.transactions)
+    parser.add_argument("--dias", type=int, default=defaults.days)
+    parser.add_argument("--ingredientes", type=int, default=defaults.ingredients)
+    parser.add_argument("--facturas", type=int, default=defaults.invoices)
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    sizes = SeedSizes(args.clientes, args.productos, args.pedidos, args.lineas,
+                      args.transacciones, args.dias, args.ingredientes, args.facturas)
+    t0 = time.perf_counter()
+    counts = seed(sizes, seed=args.semilla)
+    elapsed = time.perf_counter() - t0
+    for table, rows in counts.items():
+        print(f"{table:>22}: {rows}")
+    print(f"{sum(counts.values())} filas en {elapsed:.1f}s ({asdict(sizes)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
-from ..repositories.CustomerRepository import select_all, select_by_name, select_by_parameter, create_customer, select_by_id, delete_customer, get_total_items, get_customer_section, create_user, select_all_users, select_users_by_parameter, update_customer, update_user
+from ..repositories.CustomerRepository import select_all, select_by_parameter, create_customer, select_by_id, delete_customer, get_total_items, create_user, select_all_users, select_users_by_parameter, update_customer, update_user
+from ..repositories.aio import CustomerRepository as aio_customers
+from ..repositories.aio.CustomerRepository import select_by_name
 from ..models.CustomerModel import Customer
 
 def select_all_customer_service():
@@ -22,8 +24,8 @@ def select_users_by_parameter_service(value: str):
 def select_by_id_service(id: int):
     return select_by_id(id)
 
-def select_by_name_service(name: str):
-    return select_by_name(name)
+async def select_by_name_service(name: str):
+    return await select_by_name(name)
 
 def select_name_by_id(customer_id: int) -> str:
     """Obtiene el nombre del cliente a partir de su ID."""
@@ -80,8 +82,34 @@ def delete_customer_service(id: int):
 def get_total_items_service():
     return get_total_items()
 
-def get_customer_section_service(offset: int, limit: int):
-    return get_customer_section(offset, limit)
+# ── variantes async (handlers de Reflex) ─────────────────────────────────────
+async def select_all_customer_service_async():
+    return await aio_customers.select_all()
+
+async def select_all_users_service_async():
+    return await aio_customers.select_all_users()
+
+async def select_by_parameter_service_async(value: str):
+    if value.strip():
+        return await aio_customers.select_by_parameter(value)
+    return await aio_customers.select_all()
+
+async def select_users_by_parameter_service_async(value: str):
+    if value.strip():
+        return await aio_customers.select_users_by_parameter(value)
+    return await aio_customers.select_all_users()
+
+async def select_name_by_id_async(customer_id: int) -> str:
+    customer = await aio_customers.select_by_id(customer_id)
+    if customer:
+        return f"{customer[0].first_name} {customer[0].last_name}"
+    raise ValueError(f"No se encontró un cliente con ID {customer_id}")
+
+async def get_total_items_service_async(filter: str = "") -> int:
+    return await aio_customers.get_total_items(filter)
+
+async def get_customer_page_service_async(cursor: str | None, limit: int, filter: str = ""):
+    return await aio_customers.get_customer_page(cursor, limit, filter)
 
 async def get_customer_id_by_name_service(name: str) -> int:
     customer = await select_by_name(name)
@@ -0,0 +1,13 @@
+from datetime import date
+
+from ..repositories.DailySalesRepository import rebuild, refresh_days, refresh_for_order
+
+
+def refresh_order_sales_service(order_id: int):
+    return refresh_for_order(order_id)
+
+def refresh_sales_days_service(days: list[date]):
+    return refresh_days(days)
+
+def rebuild_daily_sales_service(start: date | None = None, end: date | None = None) -> int:
+    return rebuild(start, end)
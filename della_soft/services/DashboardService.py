@@ -1,90 +1,184 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
 from ..repositories.ProductRepository import select_all as select_all_products
 from ..repositories.ProductStockRepository import select_all as select_all_product_stocks
 from ..repositories.ProductOrderRepository import select_all as select_all_product_orders
-from ..repositories.OrderRepository import select_all as select_all_orders
-from datetime import date, timedelta
-
-async def get_stock_rotation_data_month():
-    productos = select_all_products()
-    product_stocks = select_all_product_stocks()  # Trae TODAS las filas ProductStock
-    product_orders = select_all_product_orders()
-    orders = select_all_orders()
-
-    mes_actual = date.today().month
-    anho_actual = date.today().year
-
-    data = []
-    for producto in productos:
-        # Buscar el stock actual directo (NO sumar, solo el valor actual cargado para ese producto)
-        fila_stock = next((ps for ps in product_stocks if ps.product_id == producto.id), None)
-        stock_disponible = fila_stock.quantity if fila_stock else 0
-
-        cantidad_vendida_mes = sum(
-            po.quantity for po in product_orders
-            if po.id_product == producto.id and
-                any(
-                    o.id == po.id_order and
-                    o.order_date and
-                    o.order_date.month == mes_actual and
-                    o.order_date.year == anho_actual
-                    for o in orders
-                )
-        )
-
-        data.append({
-            "Producto": producto.name,
-            "Stock Disponible": stock_disponible,
-            "Cantidad Vendida (Rotación)": cantidad_vendida_mes
-        })
-    return data
-
-
-async def get_top_products_month():
-    productos = select_all_products()
-    product_orders = select_all_product_orders()
-    orders = select_all_orders()
-
-    mes_actual = date.today().month
-    anho_actual = date.today().year
-
-    ventas = []
-    for producto in productos:
-        cantidad_vendida = sum([
-            po.quantity for po in product_orders
-            if po.id_product == producto.id and
-                any(
-                    o.id == po.id_order and
-                    o.order_date.month == mes_actual and
-                    o.order_date.year == anho_actual
-                    for o in orders
-                )
-        ])
-        ventas.append({
+from ..repositories.aio.OrderRepository import select_all as select_all_orders
+from ..repositories.DashboardRepository import (
+    select_orders_per_day,
+    select_stock_rotation,
+    select_top_products,
+)
+
+# "rollup": lee el resumen diario daily_product_sales (por defecto).
+# "sql": la BD agrupa y suma sobre product_order/order.
+# "python": se cargan las tablas y se agregan con índices en memoria
+#           (respaldo para bases sin las consultas agrupadas o para comparar).
+DASHBOARD_MODE = os.getenv("DASHBOARD_MODE", "rollup")
+
+TOP_LIMIT = 5
+
+# Ventanas del gráfico de pedidos por día
+RANGE_WEEK = "semana"
+RANGE_MONTH = "mes"
+RANGE_CUSTOM = "personalizado"
+
+
+def _month_bounds(day: date) -> tuple[datetime, datetime]:
+    """Rango semiabierto [primer día del mes, primer día del mes siguiente)."""
+    primer_dia = day.replace(day=1)
+    if primer_dia.month == 12:
+        siguiente = primer_dia.replace(year=primer_dia.year + 1, month=1)
+    else:
+        siguiente = primer_dia.replace(month=primer_dia.month + 1)
+    return datetime.combine(primer_dia, time.min), datetime.combine(siguiente, time.min)
+
+
+def _in_range(value, start: datetime, end: datetime) -> bool:
+    if value is None:
+        return False
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    return start <= value < end
+
+
+# ------------------------------------------------------------------
+# Modo "python": índices construidos una sola vez → O(P + PO + O)
+# ------------------------------------------------------------------
+def sold_by_product_indexed(product_orders, orders, start: datetime, end: datetime) -> dict:
+    """{id_producto: unidades vendidas} de los pedidos dentro del rango."""
+    pedidos_del_mes = {o.id for o in orders if _in_range(o.order_date, start, end)}
+    vendidos = defaultdict(int)
+    for po in product_orders:
+        if po.id_order in pedidos_del_mes:
+            vendidos[po.id_product] += po.quantity or 0
+    return vendidos
+
+
+def stock_rotation_indexed(productos, product_stocks, product_orders, orders,
+                           start: datetime, end: datetime) -> list[dict]:
+    stock_por_producto = {}
+    for ps in product_stocks:
+        # Mismo criterio que antes: la primera fila encontrada, sin sumar
+        stock_por_producto.setdefault(ps.product_id, ps.quantity)
+    vendidos = sold_by_product_indexed(product_orders, orders, start, end)
+    return [
+        {
             "Producto": producto.name,
-            "Cantidad Vendida": cantidad_vendida
-        })
+            "Stock Disponible": stock_por_producto.get(producto.id, 0),
+            "Cantidad Vendida (Rotación)": vendidos.get(producto.id, 0),
+        }
+        for producto in productos
+    ]
+
+
+def top_products_indexed(productos, product_orders, orders,
+                         start: datetime, end: datetime, limit: int = TOP_LIMIT) -> list[dict]:
+    vendidos = sold_by_product_indexed(product_orders, orders, start, end)
+    ventas = [
+        {"Producto": producto.name, "Cantidad Vendida": vendidos.get(producto.id, 0)}
+        for producto in productos
+    ]
     ventas.sort(key=lambda x: x["Cantidad Vendida"], reverse=True)
-    return ventas[:5]
+    return ventas[:limit]
 
-async def get_orders_per_day_month():
-    orders = select_all_orders()
-    mes_actual = date.today().month
-    anho_actual = date.today().year
 
-    today = date.today()
-    primer_dia = today.replace(day=1)
-    if mes_actual == 12:
-        primer_dia_siguiente_mes = primer_dia.replace(year=anho_actual+1, month=1)
-    else:
-        primer_dia_siguiente_mes = primer_dia.replace(month=mes_actual+1)
-    dias = (primer_dia_siguiente_mes - primer_dia).days
+async def _stock_rotation_python(start: datetime, end: datetime) -> list[dict]:
+    orders = await select_all_orders()
+    productos, stocks, product_orders = await asyncio.to_thread(
+        lambda: (select_all_products(), select_all_product_stocks(), select_all_product_orders())
+    )
+    return stock_rotation_indexed(productos, stocks, product_orders, orders, start, end)
+
+
+async def _top_products_python(start: datetime, end: datetime) -> list[dict]:
+    orders = await select_all_orders()
+    productos, product_orders = await asyncio.to_thread(
+        lambda: (select_all_products(), select_all_product_orders())
+    )
+    return top_products_indexed(productos, product_orders, orders, start, end)
+
+
+# ------------------------------------------------------------------
+# Métricas del mes en curso
+# ------------------------------------------------------------------
+async def get_stock_rotation_data_month(mode: str | None = None):
+    start, end = _month_bounds(date.today())
+    mode = mode or DASHBOARD_MODE
+    if mode == "python":
+        return await _stock_rotation_python(start, end)
+
+    rows = await asyncio.to_thread(select_stock_rotation, start, end, mode == "rollup")
+    return [
+        {
+            "Producto": row["name"],
+            "Stock Disponible": row["stock"],
+            "Cantidad Vendida (Rotación)": row["sold"],
+        }
+        for row in rows
+    ]
+
+
+async def get_top_products_month(mode: str | None = None):
+    start, end = _month_bounds(date.today())
+    mode = mode or DASHBOARD_MODE
+    if mode == "python":
+        return await _top_products_python(start, end)
+
+    rows = await asyncio.to_thread(select_top_products, start, end, TOP_LIMIT, mode == "rollup")
+    return [{"Producto": row["name"], "Cantidad Vendida": row["sold"]} for row in rows]
+
+def dashboard_range(kind: str = RANGE_MONTH, start: date | None = None,
+                    end: date | None = None, today: date | None = None) -> tuple[datetime, datetime]:
+    """
+    Ventana del gráfico de pedidos como rango semiabierto [inicio, fin).
+
+    - "semana": de lunes a domingo de la semana actual.
+    - "mes": el mes calendario actual.
+    - "personalizado": de `start` a `end`, ambos inclusive.
+    """
+    today = today or date.today()
+    if kind == RANGE_WEEK:
+        lunes = today - timedelta(days=today.weekday())
+        return (datetime.combine(lunes, time.min),
+                datetime.combine(lunes + timedelta(days=7), time.min))
+    if kind == RANGE_CUSTOM:
+        if start is None or end is None:
+            raise ValueError("El rango personalizado necesita fecha desde y hasta")
+        if end < start:
+            raise ValueError("Hasta no puede ser menor a Desde")
+        return (datetime.combine(start, time.min),
+                datetime.combine(end + timedelta(days=1), time.min))
+    return _month_bounds(today)
+
+
+def _as_date(value) -> date:
+    # PostgreSQL devuelve date; SQLite, el texto 'AAAA-MM-DD'
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+async def get_orders_per_day(start: datetime, end: datetime):
+    """Pedidos por día en [start, end); los días sin pedidos se completan con 0."""
+    rows = await asyncio.to_thread(select_orders_per_day, start, end)
+    conteo = {_as_date(day): count for day, count in rows}
 
-    conteo = { (primer_dia + timedelta(days=i)).strftime("%d/%m") : 0 for i in range(dias) }
+    dias = (end.date() - start.date()).days
+    return [
+        {
+            "Fecha": (start.date() + timedelta(days=i)).strftime("%d/%m"),
+            "Pedidos": conteo.get(start.date() + timedelta(days=i), 0),
+        }
+        for i in range(dias)
+    ]
 
-    for order in orders:
-        if order.order_date.month == mes_actual and order.order_date.year == anho_actual:
-            clave = order.order_date.strftime("%d/%m")
-            if clave in conteo:
-                conteo[clave] += 1
 
-    return [{"Fecha": k, "Pedidos": v} for k, v in sorted(conteo.items())]
+async def get_orders_per_day_month(kind: str = RANGE_MONTH, start: date | None = None,
+                                   end: date | None = None):
+    return await get_orders_per_day(*dashboard_range(kind, start, end, date.today()))
@@ -0,0 +1,165 @@
+# della_soft/services/EventProfiler.py
+"""
+Latencia de los event handlers de Reflex, por handler.
+
+Para cada evento de un estado marcado con `@profile_events` se registra:
+
+- wall_ms:     tiempo total del handler (de preprocess a la última actualización)
+- db_ms:       tiempo en la BD, tomado del scope de QueryStats del evento
+- delta_bytes: tamaño del delta de estado serializado que se envía al navegador
+
+Las muestras se guardan en histogramas en memoria (las últimas
+PROFILE_WINDOW por handler, 2000 por defecto) y `profile_report()`
+devuelve p50/p95/p99 de cada métrica. `profile_endpoint` lo expone como
+JSON en /admin/event-stats.
+"""
+import hmac
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from reflex.middleware import Middleware
+from reflex.utils import format
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from ..repositories.QueryStats import current_scope, query_stats
+
+PROFILE_WINDOW = int(os.getenv("PROFILE_WINDOW", "2000"))
+PERCENTILES = (50, 95, 99)
+METRICS = ("wall_ms", "db_ms", "delta_bytes")
+
+_profiled_states: set[str] = set()
+_histograms: dict[str, dict[str, "Histogram"]] = {}
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Ventana de las últimas `size` muestras, con percentiles exactos sobre ella."""
+
+    def __init__(self, size: int = PROFILE_WINDOW):
+        self._samples: deque = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> float:
+        """Percentil por rango más cercano (0 si no hay muestras)."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(1, -(-len(ordered) * p // 100))   # ceil(n·p/100)
+        return ordered[int(rank) - 1]
+
+    def summary(self) -> dict:
+        data = {f"p{p}": round(self.percentile(p), 3) for p in PERCENTILES}
+        data["max"] = round(max(self._samples, default=0.0), 3)
+        data["mean"] = round(self.total / self.count, 3) if self.count else 0.0
+        return data
+
+
+def profile_events(state_cls):
+    """
+    Decorador de clase: mide todos los event handlers del estado.
+
+        @profile_events
+        class POSView(rx.State): ...
+    """
+    _profiled_states.add(state_cls.get_full_name())
+    return state_cls
+
+
+def is_profiled(event_name: str) -> bool:
+    state_name, _, _ = event_name.rpartition(".")
+    return state_name in _profiled_states
+
+
+def record_event(handler: str, wall_ms: float, db_ms: float, delta_bytes: int) -> None:
+    with _lock:
+        histograms = _histograms.setdefault(handler, {m: Histogram() for m in METRICS})
+        histograms["wall_ms"].add(wall_ms)
+        histograms["db_ms"].add(db_ms)
+        histograms["delta_bytes"].add(delta_bytes)
+
+
+def profile_report() -> dict:
+    """{handler: {"count": n, "wall_ms": {p50, p95, p99, max, mean}, ...}}"""
+    with _lock:
+        return {
+            handler: {"count": h["wall_ms"].count, **{m: h[m].summary() for m in METRICS}}
+            for handler, h in sorted(_histograms.items())
+        }
+
+
+def reset_profile() -> None:
+    with _lock:
+        _histograms.clear()
+
+
+# ------------------------------------------------------------------
+# Middleware: debe ir ANTES de QueryStatsMiddleware, para leer el scope
+# de consultas del evento antes de que se cierre.
+# ------------------------------------------------------------------
+@dataclass
+class _EventTiming:
+    started: float
+    delta_bytes: int = 0
+
+
+_timing: ContextVar[Optional[_EventTiming]] = ContextVar("event_timing", default=None)
+
+
+def _handler_name(event_name: str) -> str:
+    # "reflex___state____state.della_soft___views___pos_view___pos_view.load_date"
+    # → "pos_view.load_date"
+    state_name, _, handler = event_name.rpartition(".")
+    return f"{state_name.rpartition('___')[2]}.{handler}"
+
+
+class EventProfilerMiddleware(Middleware):
+    async def preprocess(self, app, state, event):
+        profiled = is_profiled(event.name)
+        _timing.set(_EventTiming(started=time.perf_counter()) if profiled else None)
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        timing = _timing.get()
+        if timing is None:
+            return update
+        timing.delta_bytes += len(format.json_dumps(update.delta).encode("utf-8"))
+        if update.final:
+            _timing.set(None)
+            scope = current_scope()
+            record_event(
+                _handler_name(event.name),
+                (time.perf_counter() - timing.started) * 1000,
+                scope.db_time * 1000 if scope is not None else 0.0,
+                timing.delta_bytes,
+            )
+        return update
+
+
+# ------------------------------------------------------------------
+# Endpoint JSON
+# ------------------------------------------------------------------
+async def profile_endpoint(request: Request) -> JSONResponse:
+    """
+    GET /admin/event-stats – percentiles por handler y totales de consultas.
+
+    En desarrollo está abierto; en otros entornos exige la cabecera
+    X-Profile-Token igual a PROFILE_TOKEN (sin PROFILE_TOKEN, no responde).
+    """
+    if os.getenv("ENV", "dev") != "dev":
+        expected = os.getenv("PROFILE_TOKEN", "")
+        given = request.headers.get("x-profile-token", "")
+        if not expected or not hmac.compare_digest(expected, given):
+            return JSONResponse({"detail": "Not Found"}, status_code=404)
+    return JSONResponse({"handlers": profile_report(), "queries": query_stats()})
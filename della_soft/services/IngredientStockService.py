@@ -8,6 +8,7 @@ from ..repositories.IngredientStockRepository import (
     insert_stock,
     update_stock,
 )
+from ..repositories.aio.IngredientStockRepository import select_stock_page, count_stock
 
 # ──────────────────────────────────────────────────────────────────────────────
 async def select_all_stock_service() -> List[IngredientStock]:
@@ -39,3 +40,13 @@ async def update_ingredient_stock_service(
     return await asyncio.to_thread(
         update_stock, stock_id, quantity, min_quantity
     )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+async def select_stock_page_service(filter: str, cursor: str | None, limit: int):
+    """Página del listado de stock de ingredientes (keyset)."""
+    return await select_stock_page(filter, cursor, limit)
+
+
+async def count_stock_service(filter: str) -> int:
+    return await count_stock(filter)
@@ -0,0 +1,208 @@
+# della_soft/services/InvoiceBatchService.py
+"""
+Facturación por lotes (cierre del día): factura de una vez todos los
+pedidos pagados que todavía no tienen Invoice.
+
+1. Una consulta trae los pedidos elegibles con su cliente (JOIN),
+   bloqueándolos, y otra, por cada INVOICE_BATCH_CHUNK pedidos, las
+   líneas con su producto.
+2. Se reserva un bloque contiguo de números del timbrado activo y se
+   insertan todos los Invoice en un INSERT de varias filas; todo en una
+   transacción, así que si algo falla no se consume ningún número. La
+   restricción uq_invoice_id_order impide una segunda factura del mismo
+   pedido: si otro proceso lo facturó igual, el INSERT falla y el lote
+   se revierte entero (números incluidos).
+3. Los PDF se maquetan en paralelo en un pool de procesos (en envíos de
+   INVOICE_RENDER_CHUNK facturas), se guardan en public/facturas y sus
+   hashes se registran con un UPDATE por lotes.
+
+Si un PDF falla, su factura ya está emitida: queda en `failed` y se
+regenera la primera vez que se descargue (generate_invoice_pdf).
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import exists, insert, update
+from sqlmodel import select
+
+from ..models import Customer, Invoice, Order
+from ..views.GenerateInvoicePDF import (
+    build_invoice_data,
+    invoice_pdf_path,
+    invoice_totals,
+    load_invoice_lines,
+)
+from ..views.InvoiceRender import InvoiceData, render_invoice_pdfs
+from ..views.PDFOutput import RenderedPDF
+from .InvoiceNumberService import reserve_invoice_numbers
+from .UnitOfWork import unit_of_work
+
+INVOICE_BATCH_CHUNK = int(os.getenv("INVOICE_BATCH_CHUNK", "500"))
+INVOICE_RENDER_CHUNK = int(os.getenv("INVOICE_RENDER_CHUNK", "50"))
+
+
+@dataclass
+class BatchInvoiceResult:
+    invoiced: int = 0
+    rendered: int = 0
+    first_number: Optional[str] = None
+    last_number: Optional[str] = None
+    failed: dict[int, str] = field(default_factory=dict)   # invoice_id → error del render
+    timings: dict[str, float] = field(default_factory=dict)  # segundos por etapa
+
+    @property
+    def throughput(self) -> float:
+        """Facturas emitidas (con PDF) por segundo, sobre el tiempo total."""
+        total = sum(self.timings.values())
+        return self.rendered / total if total else 0.0
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _eligible_orders(session, until: Optional[datetime]):
+    """
+    Pedidos pagados sin factura, con los datos del cliente, en una consulta.
+    Bloquea las filas de los pedidos (FOR UPDATE SKIP LOCKED) hasta el fin
+    de la transacción: otro lote o una descarga que esté facturando alguno
+    lo deja fuera en vez de esperarlo, y así no se reservan números para
+    pedidos que no se van a facturar acá.
+    """
+    stmt = (
+        select(Order.id, Customer.first_name, Customer.last_name, Customer.ci, Customer.div)
+        .join(Customer, Customer.id == Order.id_customer)
+        .where(
+            Order.total_paid >= Order.total_order,
+            ~exists().where(Invoice.id_order == Order.id),
+        )
+        .order_by(Order.id)
+        .with_for_update(of=Order, skip_locked=True)
+    )
+    if until is not None:
+        stmt = stmt.where(Order.order_date < until)
+    return session.exec(stmt).all()
+
+
+def _issue_invoices(until: Optional[datetime]) -> tuple[list[InvoiceData], tuple[str, str] | None]:
+    """Pasos 1 y 2: datos de los pedidos, números e Invoice, en una transacción."""
+    with unit_of_work() as session:
+        orders = _eligible_orders(session, until)
+        if not orders:
+            return [], None
+        lines: dict[int, list[dict]] = {}
+        for chunk in _chunks([o.id for o in orders], INVOICE_BATCH_CHUNK):
+            lines.update(load_invoice_lines(chunk, session))
+
+        issued_at = datetime.now()
+        # Al final de la transacción, para bloquear la fila de stamped lo menos posible
+        block = reserve_invoice_numbers(len(orders), session=session)
+        rows = [
+            {
+                "iva": invoice_totals(lines[order.id])[1],
+                "invoice_date": issued_at,
+                "id_order": order.id,
+                "id_stamped": block.stamped_id,
+                "nro_factura": block.format(block.first + i),
+                "canceled": False,
+            }
+            for i, order in enumerate(orders)
+        ]
+        ids = {}
+        for chunk in _chunks(rows, INVOICE_BATCH_CHUNK):
+            ids.update(
+                (id_order, invoice_id)
+                for invoice_id, id_order in session.execute(
+                    insert(Invoice).returning(Invoice.id, Invoice.id_order), chunk
+                ).all()
+            )
+
+    datas = [
+        build_invoice_data(
+            Invoice(id=ids[order.id], nro_factura=row["nro_factura"], invoice_date=issued_at),
+            block.stamped_number,
+            order,
+            lines[order.id],
+        )
+        for order, row in zip(orders, rows)
+    ]
+    return datas, (rows[0]["nro_factura"], rows[-1]["nro_factura"])
+
+
+def invoice_paid_orders(
+    *,
+    until: Optional[datetime] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> BatchInvoiceResult:
+    """
+    Factura los pedidos pagados sin Invoice (con `until`, solo los de
+    order_date anterior). `workers` procesos maquetan los PDF (por defecto
+    uno por CPU; 0 = en este proceso) y `progress(hechos, total)` se llama
+    tras cada factura procesada.
+    """
+    result = BatchInvoiceResult()
+    if workers is None:
+        # con una sola CPU el pool no gana nada y suma el envío entre procesos
+        cpus = os.cpu_count() or 1
+        workers = cpus if cpus > 1 else 0
+
+    t0 = time.perf_counter()
+    datas, numbers = _issue_invoices(until)
+    result.timings["issue"] = time.perf_counter() - t0
+    if not datas:
+        return result
+    result.invoiced = len(datas)
+    result.first_number, result.last_number = numbers
+
+    t0 = time.perf_counter()
+    hashes = []
+
+    def _store(data: InvoiceData, pdf_bytes: bytes) -> None:
+        path = invoice_pdf_path(data.invoice_id)
+        rendered = RenderedPDF.from_bytes(pdf_bytes, os.path.basename(path))
+        rendered.save(os.path.dirname(path))
+        hashes.append({"id": data.invoice_id, "pdf_hash": rendered.sha256})
+        result.rendered += 1
+
+    def _collect(chunk: list[InvoiceData], outcomes: list) -> None:
+        for data, outcome in zip(chunk, outcomes):
+            if isinstance(outcome, Exception):
+                result.failed[data.invoice_id] = str(outcome) or type(outcome).__name__
+            else:
+                _store(data, outcome)
+            if progress is not None:
+                progress(result.rendered + len(result.failed), result.invoiced)
+
+    if workers > 0:
+        # Lotes de INVOICE_RENDER_CHUNK facturas por envío, para no pagar el
+        # pickle y la ida y vuelta entre procesos por cada PDF. "spawn": los
+        # procesos no heredan conexiones ni hilos del llamador.
+        chunks = list(_chunks(datas, INVOICE_RENDER_CHUNK))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(render_invoice_pdfs, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    outcomes = future.result()
+                except Exception as exc:   # el proceso murió: se pierde el lote entero
+                    outcomes = [exc] * len(chunk)
+                _collect(chunk, outcomes)
+    else:
+        _collect(datas, render_invoice_pdfs(datas))
+    result.timings["render"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if hashes:
+        with unit_of_work() as session:
+            for chunk in _chunks(hashes, INVOICE_BATCH_CHUNK):
+                session.execute(update(Invoice), chunk)   # UPDATE por clave primaria, en lote
+    result.timings["hashes"] = time.perf_counter() - t0
+    return result
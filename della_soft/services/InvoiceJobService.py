@@ -0,0 +1,157 @@
+# della_soft/services/InvoiceJobService.py
+"""
+Generación de facturas en segundo plano.
+
+    job_id = submit_invoice_job(order_id)      # vuelve enseguida
+    get_invoice_job(job_id).status             # "pending" | "running" | "ready" | "failed"
+    job = await wait_invoice_job(job_id)       # desde un event handler
+    job.path                                   # ruta del PDF cuando está "ready"
+
+Si la factura ya fue emitida y su PDF en disco coincide con pdf_hash, el
+trabajo termina enseguida con ese archivo. Si no, corre en un hilo: el
+paso de datos (prepare_invoice_data, con la BD) se hace en el hilo y el
+maquetado (render_invoice_pdf) en un pool de INVOICE_WORKERS procesos,
+para que fpdf no compita por el GIL con el servidor. Con
+INVOICE_WORKERS=0 se maqueta en el mismo hilo.
+
+Si ya hay un trabajo en curso para el pedido se devuelve ese mismo, y se
+guardan los últimos INVOICE_JOB_HISTORY trabajos para consultar su estado.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+from ..views.GenerateInvoicePDF import find_invoice_pdf, prepare_invoice_data, store_invoice_pdf
+from ..views.InvoiceRender import render_invoice_pdf
+
+INVOICE_WORKERS = int(os.getenv("INVOICE_WORKERS", "2"))
+INVOICE_JOB_HISTORY = int(os.getenv("INVOICE_JOB_HISTORY", "500"))
+
+PENDING, RUNNING, READY, FAILED = "pending", "running", "ready", "failed"
+
+_jobs: OrderedDict[str, "InvoiceJob"] = OrderedDict()
+_active_by_order: dict[int, str] = {}
+_lock = threading.Lock()
+_threads: Optional[ThreadPoolExecutor] = None
+_processes: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass
+class InvoiceJob:
+    id: str
+    order_id: int
+    status: str = PENDING
+    path: Optional[str] = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    future: Optional[Future] = field(default=None, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (READY, FAILED)
+
+
+def _executors() -> tuple[ThreadPoolExecutor, Optional[ProcessPoolExecutor]]:
+    global _threads, _processes
+    with _lock:
+        if _threads is None:
+            # un hilo por proceso de maquetado, más uno para el paso de datos
+            _threads = ThreadPoolExecutor(max_workers=max(INVOICE_WORKERS, 1) + 1,
+                                          thread_name_prefix="factura")
+        if _processes is None and INVOICE_WORKERS > 0:
+            # "spawn": no se hereda el estado del servidor (hilos, conexiones)
+            _processes = ProcessPoolExecutor(max_workers=INVOICE_WORKERS,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return _threads, _processes
+
+
+def _update(job: InvoiceJob, **changes) -> None:
+    with _lock:
+        for name, value in changes.items():
+            setattr(job, name, value)
+        if job.done:
+            job.finished = time.monotonic()
+            if _active_by_order.get(job.order_id) == job.id:
+                del _active_by_order[job.order_id]
+
+
+def _run(job: InvoiceJob, processes: Optional[ProcessPoolExecutor]) -> InvoiceJob:
+    _update(job, status=RUNNING)
+    try:
+        path = find_invoice_pdf(job.order_id)
+        if path is not None:   # ya emitida y el archivo coincide con su hash
+            _update(job, status=READY, path=path)
+            return job
+        data = prepare_invoice_data(job.order_id)
+        if processes is not None:
+            pdf_bytes = processes.submit(render_invoice_pdf, data).result()
+        else:
+            pdf_bytes = render_invoice_pdf(data)
+        _update(job, status=READY, path=store_invoice_pdf(data.invoice_id, pdf_bytes))
+    except Exception as exc:   # el error queda en el trabajo
+        _update(job, status=FAILED, error=str(exc) or type(exc).__name__)
+    return job
+
+
+def submit_invoice_job(order_id: int) -> str:
+    """Encola la factura del pedido y devuelve el id del trabajo."""
+    threads, processes = _executors()
+    with _lock:
+        active = _active_by_order.get(order_id)
+        if active is not None:
+            return active
+        job = InvoiceJob(id=uuid.uuid4().hex, order_id=order_id)
+        _jobs[job.id] = job
+        _active_by_order[order_id] = job.id
+        while len(_jobs) > INVOICE_JOB_HISTORY:
+            _jobs.popitem(last=False)
+    job.future = threads.submit(_run, job, processes)
+    return job.id
+
+
+def get_invoice_job(job_id: str) -> Optional[InvoiceJob]:
+    """Estado actual del trabajo (una copia), o None si no existe o ya se descartó."""
+    with _lock:
+        job = _jobs.get(job_id)
+        return replace(job) if job is not None else None
+
+
+async def wait_invoice_job(job_id: str, timeout: float = 60.0) -> Optional[InvoiceJob]:
+    """Espera, sin bloquear el event loop, a que el trabajo termine."""
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    while job.future is None:   # submit_invoice_job aún no lo encoló
+        await asyncio.sleep(0.01)
+    try:
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return get_invoice_job(job_id)
+
+
+def shutdown_invoice_jobs(wait: bool = True) -> None:
+    """Cierra los pools (tests y apagado ordenado)."""
+    global _threads, _processes
+    with _lock:
+        threads, processes = _threads, _processes
+        _threads = _processes = None
+    if threads is not None:
+        threads.shutdown(wait=wait)
+    if processes is not None:
+        processes.shutdown(wait=wait)
+
+
+def reset_invoice_jobs() -> None:
+    with _lock:
+        _jobs.clear()
+        _active_by_order.clear()
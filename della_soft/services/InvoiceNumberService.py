@@ -0,0 +1,24 @@
+# della_soft/services/InvoiceNumberService.py
+"""
+Numeración de facturas.
+
+- `next_invoice_number(session=…)`: un número, reservado con un UPDATE …
+  RETURNING dentro de la transacción que inserta la factura (si se revierte,
+  el número vuelve al timbrado y no quedan huecos).
+- `reserve_invoice_numbers(n)`: un bloque de n números consecutivos, para
+  facturar varios pedidos de una vez (en la misma transacción que los
+  inserta, así que tampoco deja huecos).
+"""
+from sqlmodel import Session
+
+from ..repositories.StampedRepository import SequenceBlock, allocate_sequence
+
+
+def next_invoice_number(*, session: Session | None = None) -> tuple[SequenceBlock, str]:
+    """Reserva el siguiente número del timbrado activo; devuelve (bloque, número)."""
+    block = allocate_sequence(1, session=session)
+    return block, block.format(block.first)
+
+
+def reserve_invoice_numbers(count: int, *, session: Session | None = None) -> SequenceBlock:
+    return allocate_sequence(count, session=session)
@@ -1,11 +1,14 @@
 import asyncio
 
 from ..repositories.MeasureRepository import select_all, select_by_id
+from .TTLCache import cached
 
+@cached("measures")
 def select_all_measure_service():
     measures = select_all()
     return measures
 
+@cached("measure_names")
 def select_name_by_id(measure_id: int) -> str:
     measure = select_by_id(measure_id)
     if measure:
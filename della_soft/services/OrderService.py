@@ -1,17 +1,38 @@
-from ..repositories.OrderRepository import select_all, get_order, insert_order, update_order, update_pay_amount
+from ..repositories.OrderRepository import get_order, insert_order, update_order, update_pay_amount
+from ..repositories.DailySalesRepository import refresh_for_order
+from ..repositories.ProductOrderRepository import insert_product_orders
+from ..repositories.aio.OrderRepository import select_all, get_by_id, select_orders_with_customer, select_orders_keyset, count_orders
 
 from .CustomerService import select_by_id_service
+from .ProductOrderService import apply_order_lines
+from .UnitOfWork import unit_of_work
 
 from datetime import datetime
 
 from ..models.OrderModel import Order
+from ..models.ProductOrderModel import ProductOrder
 
 
 async def select_all_order_service():
-    orders = select_all()
+    orders = await select_all()
     return orders
 
+async def get_order_by_id_service(order_id: int) -> Order | None:
+    return await get_by_id(order_id)
+
+async def select_order_rows_service() -> list[dict]:
+    """Pedidos con nombre de cliente y saldo pendiente (una sola consulta)."""
+    return await select_orders_with_customer()
+
+async def select_orders_keyset_service(filter: str, cursor: str | None, limit: int, sort: str = "id"):
+    """Página de pedidos por keyset: el estado guarda el cursor en vez del offset."""
+    return await select_orders_keyset(filter, cursor, limit, sort)
+
+async def count_orders_service(filter: str) -> int:
+    return await count_orders(filter)
+
 def select_order(value: str):
+    # Sin filtro devuelve el awaitable de select_all (async)
     if(len(value) != 0):
         return get_order(value)
     else:
@@ -25,5 +46,27 @@ def create_order(id: int, id_customer: int, observation: str, total_order: str,
 def update_order_service(order: Order):
     return update_order(order)
 
+def create_order_with_lines_service(order: Order, lines: list[ProductOrder]) -> Order:
+    """
+    Guarda el pedido y todas sus líneas en una sola transacción: un INSERT
+    para la cabecera y un INSERT de varias filas para las líneas.
+    """
+    with unit_of_work() as session:
+        new_order = insert_order(order, session=session)
+        for po in lines:
+            po.id_order = new_order.id
+        insert_product_orders(lines, session=session)
+        refresh_for_order(new_order.id, session=session)
+    return new_order
+
+def update_order_with_lines_service(order: Order, lines: list[ProductOrder]) -> Order:
+    """Actualiza la cabecera y aplica solo las líneas que cambiaron, en una transacción."""
+    with unit_of_work() as session:
+        updated = update_order(order, session=session)
+        diff = apply_order_lines(order.id, lines, session=session)
+        if not diff.empty:
+            refresh_for_order(order.id, session=session)
+    return updated
+
 def update_pay_amount_service(order: Order):
     return update_pay_amount(order)
\ No newline at end of file
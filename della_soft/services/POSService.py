@@ -3,6 +3,9 @@ from datetime import datetime
 from ..models.POSModel import POS
 from ..repositories.POSRepository import get_by_pos_date, insert_pos, update_pos
 
+# La caja no se cachea: final_amount cambia con cada pago, reverso y gasto
+# (de cualquier proceso), y una copia vieja mostraría un saldo desactualizado.
+# La consulta usa el índice ix_pos_pos_date.
 def pos_is_open(value: str):
     return get_by_pos_date(value)
 
@@ -13,4 +16,4 @@ def insert_pos_register(id: int, initial_amount: int, final_amount: int, pos_dat
 
 def update_final_amount(id: int, initial_amount: int, final_amount: int, pos_date: datetime):
     pos_update = POS(id=id, initial_amount=initial_amount, final_amount=final_amount, pos_date=pos_date)
-    update_pos(pos_update)
\ No newline at end of file
+    update_pos(pos_update)
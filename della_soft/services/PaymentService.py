@@ -0,0 +1,122 @@
+# services/PaymentService.py
+from datetime import datetime
+
+from sqlmodel import Session
+
+from ..models.POSModel import POS
+from ..models.ProductOrderModel import ProductOrder
+from ..models.TransactionModel import Transaction
+from ..repositories.OrderRepository import add_to_total_paid
+from ..repositories.POSRepository import add_to_final_amount
+from ..repositories.ProductOrderRepository import select_fixed_products
+from ..repositories.ProductStockRepository import (
+    decrement_stock,
+    restore_stock,
+    select_quantities,
+)
+from ..repositories.TransactionRepository import insert_transaction
+from .UnitOfWork import unit_of_work
+
+
+def check_stock(order_id: int, *, session: Session | None = None) -> list[ProductOrder]:
+    """Valida el stock de los productos de precio fijo del pedido y los devuelve."""
+    fixed_products = select_fixed_products(order_id, session=session)
+    stock = select_quantities((po.id_product for po in fixed_products), session=session)
+    for po in fixed_products:
+        available = stock.get(po.id_product, 0)
+        if available < po.quantity:
+            raise ValueError(
+                f"Stock insuficiente – producto {po.id_product} "
+                f"(disponible: {available}, solicitado: {po.quantity})"
+            )
+    return fixed_products
+
+
+def _order_lines(products: list[ProductOrder]) -> list[tuple[int, int]]:
+    return [(po.id_product, po.quantity) for po in products]
+
+
+def process_payment_service(order_id: int, amount: int, pos: POS, user_id: int) -> int:
+    """
+    Registra un pago en una sola transacción: valida stock, crea la
+    transacción, suma el monto al pedido y a la caja y, si con este pago el
+    pedido queda pagado, descuenta el stock. Si falta stock no se escribe
+    nada. Devuelve el nuevo total pagado. Un pago no cambia las líneas del
+    pedido, así que no toca daily_product_sales.
+
+    Los montos se suman en la BD (UPDATE … RETURNING), no a partir de los
+    totales que tenía la pantalla, así que dos cajas no se pisan; de `pos`
+    solo se usa el id.
+    """
+    with unit_of_work() as session:
+        fixed_products = check_stock(order_id, session=session)
+        insert_transaction(
+            Transaction(
+                id=None,
+                observation=f"Pago por {amount}",
+                amount=amount,
+                transaction_date=datetime.now(),
+                status="PAGO",
+                id_POS=pos.id,
+                id_user=user_id,
+                id_order=order_id,
+            ),
+            session=session,
+        )
+        new_total_paid, total_order = add_to_total_paid(order_id, amount, session=session)
+        add_to_final_amount(pos.id, amount, session=session)
+        if new_total_paid - amount < total_order <= new_total_paid:
+            # Un solo UPDATE para todas las líneas; si otra caja vendió el
+            # mismo producto entretanto, la línea falla y se revierte todo.
+            result = decrement_stock(_order_lines(fixed_products), session=session)
+            if not result.ok:
+                detail = ", ".join(f"producto {pid} (solicitado: {qty})" for pid, qty in result.failed)
+                raise ValueError(f"Stock insuficiente – {detail}")
+    return new_total_paid
+
+
+def process_reverse_service(order_id: int, amount: int, pos: POS, user_id: int) -> int:
+    """
+    Registra un reverso (amount negativo) en una sola transacción y, si el
+    pedido deja de estar pagado, devuelve su stock. Devuelve el nuevo total
+    pagado.
+    """
+    with unit_of_work() as session:
+        insert_transaction(
+            Transaction(
+                id=None,
+                observation=f"Reverso de {amount}",
+                amount=amount,
+                transaction_date=datetime.now(),
+                status="REVERSO",
+                id_POS=pos.id,
+                id_user=user_id,
+                id_order=order_id,
+            ),
+            session=session,
+        )
+        new_total_paid, total_order = add_to_total_paid(order_id, amount, session=session)
+        add_to_final_amount(pos.id, amount, session=session)
+        if new_total_paid < total_order <= new_total_paid - amount:
+            restore_stock(_order_lines(select_fixed_products(order_id, session=session)),
+                          session=session)
+    return new_total_paid
+
+
+def process_bill_service(amount: int, observation: str, pos: POS, user_id: int) -> None:
+    """Registra un gasto de caja (amount negativo) en una sola transacción."""
+    with unit_of_work() as session:
+        insert_transaction(
+            Transaction(
+                id=None,
+                observation=observation,
+                amount=amount,
+                transaction_date=datetime.now(),
+                status="GASTO",
+                id_POS=pos.id,
+                id_user=user_id,
+                id_order=None,
+            ),
+            session=session,
+        )
+        add_to_final_amount(pos.id, amount, session=session)
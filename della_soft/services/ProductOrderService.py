@@ -1,8 +1,29 @@
-from ..repositories.ProductOrderRepository import select_all, select_by_order_id, delete_product_order, insert_product_order, select_fixed_products
+from dataclasses import dataclass, field
+
+from sqlmodel import Session
+
+from ..repositories.ProductOrderRepository import select_all, select_by_order_id, delete_product_order, select_fixed_products
 from ..models.ProductOrderModel import ProductOrder
 from ..repositories.ProductOrderRepository import (
     insert_product_order as insert_repo_product_order,
+    insert_product_orders,
+    update_product_order_quantities,
+    delete_product_orders,
 )
+from ..repositories.DailySalesRepository import refresh_for_order
+from ..repositories.aio import ProductOrderRepository as aio_product_orders
+from .UnitOfWork import unit_of_work
+
+
+@dataclass
+class OrderLinesDiff:
+    to_insert: list[ProductOrder] = field(default_factory=list)
+    to_update: list[tuple[int, int]] = field(default_factory=list)   # (id de línea, cantidad)
+    to_delete: list[int] = field(default_factory=list)               # ids de línea
+
+    @property
+    def empty(self) -> bool:
+        return not (self.to_insert or self.to_update or self.to_delete)
 
 def select_all_product_order_service():
     products_order = select_all()
@@ -11,19 +32,64 @@ def select_all_product_order_service():
 def select_by_order_id_service(id_order: int):
     return select_by_order_id(id_order)
 
+async def select_by_order_id_service_async(id_order: int):
+    return await aio_product_orders.select_by_order_id(id_order)
+
 def get_fixed_products_by_order_id(order_id: int):
     products_order = select_fixed_products(order_id)
     return products_order
 
 def insert_product_order_service(product_order: ProductOrder):
-    return insert_repo_product_order(product_order)
+    inserted = insert_repo_product_order(product_order)
+    refresh_for_order(product_order.id_order)   # mantiene daily_product_sales
+    return inserted
             
 def delete_product_order_service(id: int):
      return delete_product_order(id)
 
-def update_product_orders(order_id: int, new_product_orders: list[ProductOrder]):
-    existing = select_by_order_id(order_id)
-    for po in existing:
-        delete_product_order(po.id)
+def diff_order_lines(order_id: int, existing: list[ProductOrder],
+                     new_product_orders: list[ProductOrder]) -> OrderLinesDiff:
+    """
+    Compara las líneas guardadas con las nuevas, por producto: inserta los
+    productos nuevos, actualiza las cantidades que cambiaron y borra los que
+    ya no están (o las líneas repetidas de un mismo producto).
+    """
+    wanted: dict[int, int] = {}
     for po in new_product_orders:
-        insert_product_order(po)
\ No newline at end of file
+        wanted[po.id_product] = wanted.get(po.id_product, 0) + (po.quantity or 0)
+
+    diff = OrderLinesDiff()
+    kept: set[int] = set()
+    for po in existing:
+        if po.id_product not in wanted or po.id_product in kept:
+            diff.to_delete.append(po.id)
+            continue
+        kept.add(po.id_product)
+        if po.quantity != wanted[po.id_product]:
+            diff.to_update.append((po.id, wanted[po.id_product]))
+
+    diff.to_insert = [
+        ProductOrder(id=None, quantity=quantity, id_product=id_product, id_order=order_id)
+        for id_product, quantity in wanted.items()
+        if id_product not in kept
+    ]
+    return diff
+
+
+def apply_order_lines(order_id: int, new_product_orders: list[ProductOrder], *,
+                      session: Session) -> OrderLinesDiff:
+    """Aplica dentro de `session` solo los cambios de líneas del pedido."""
+    existing = select_by_order_id(order_id, session=session)
+    diff = diff_order_lines(order_id, existing, new_product_orders)
+    delete_product_orders(diff.to_delete, session=session)
+    update_product_order_quantities(diff.to_update, session=session)
+    insert_product_orders(diff.to_insert, session=session)
+    return diff
+
+
+def update_product_orders(order_id: int, new_product_orders: list[ProductOrder]) -> OrderLinesDiff:
+    with unit_of_work() as session:
+        diff = apply_order_lines(order_id, new_product_orders, session=session)
+        if not diff.empty:
+            refresh_for_order(order_id, session=session)
+    return diff
\ No newline at end of file
@@ -1,7 +1,10 @@
 import asyncio
 from ..repositories.ProductRepository import select_all, delete_product, get_product, insert_product, update_product
 from ..models.ProductModel import Product
+from ..repositories.aio import ProductRepository as aio_products
+from .TTLCache import cached
 
+@cached("products")
 def select_all_product_service():
     products = select_all()
     return products
@@ -12,13 +15,26 @@ def select_product(value: str):
     else:
         return select_all()
 
+async def select_product_async(value: str):
+    if value:
+        return await aio_products.get_product(value)
+    return await select_all_product_service_async()   # listado completo: caché
+
+async def select_all_product_service_async():
+    """Listado completo desde la caché; si no está, la consulta corre en un hilo."""
+    return await select_all_product_service.load_async()
+
 def create_product(id: int, name: str, description: str, product_type: str, price: int):
 
     product_save = Product(id=id, name=name, description=description, product_type=product_type, price=price)
-    return insert_product(product_save)
+    inserted = insert_product(product_save)
+    select_all_product_service.invalidate()
+    return inserted
 
 def delete_product_service(id: int):
-    return delete_product(id)  
+    deleted = delete_product(id)
+    select_all_product_service.invalidate()
+    return deleted
 
 def update_product_service(**kwargs):
     print(kwargs)
@@ -27,4 +43,5 @@ def update_product_service(**kwargs):
         update_product(product)
     except Exception as e:
         print(e)
+    select_all_product_service.invalidate()
     return product
\ No newline at end of file
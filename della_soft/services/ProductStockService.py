@@ -8,8 +8,9 @@ from ..repositories.ProductStockRepository import (
     update_stock,
     update_stock_with_pay,
     get_by_product,
-    update_stock_with_reverse
+    update_stock_with_reverse,
 )
+from ..repositories.aio.ProductStockRepository import select_stock_page, count_stock
 
 async def select_all_stock_service() -> List[ProductStock]:
     return await asyncio.to_thread(select_all)
@@ -29,3 +30,9 @@ async def update_stock_with_reverse_service(product_id: int, quantity: float):
 
 async def get_stock_by_product_service(product_id: int):
     return await asyncio.to_thread(get_by_product, product_id)
+
+async def select_stock_page_service(filter: str, cursor: str | None, limit: int):
+    return await select_stock_page(filter, cursor, limit)
+
+async def count_stock_service(filter: str) -> int:
+    return await count_stock(filter)
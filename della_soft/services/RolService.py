@@ -1,6 +1,8 @@
 from ..repositories.RolRepository import select_all
+from .TTLCache import cached
 
 
+@cached("roles")
 def select_all_roles_service():
     roles = select_all()
     print (roles)
@@ -0,0 +1,143 @@
+# della_soft/services/TTLCache.py
+"""
+Caché en memoria con vencimiento (TTL) para datos de referencia
+(roles, unidades de medida, productos).
+
+- Cada entrada vence `ttl` segundos después de cargarse.
+- Como máximo `maxsize` entradas por caché; se descarta la menos usada.
+- Los services que modifican el dato llaman a `invalidate()`.
+
+La caché es por proceso: la invalidación explícita solo alcanza al proceso
+que hizo el cambio; en los demás el dato se refresca al vencer el TTL.
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+DEFAULT_TTL = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+DEFAULT_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "256"))
+
+_ALL = object()
+_registry: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: OrderedDict = OrderedDict()   # clave -> (vence, valor)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        _registry[name] = self
+
+    def get_or_load(self, key, loader: Callable[[], Any]):
+        """Devuelve el valor vigente de `key` o lo carga con `loader()`."""
+        found, value, generation = self._lookup(key)
+        if found:
+            return value
+        # La consulta se hace fuera del lock para no frenar a los demás hilos
+        value = loader()
+        self._store(key, value, generation)
+        return value
+
+    async def get_or_load_async(self, key, loader: Callable[[], Any]):
+        """
+        Igual que `get_or_load`, para handlers async: un acierto se
+        resuelve en el momento y solo la carga corre en un hilo
+        (`asyncio.to_thread`), así la consulta no frena el event loop.
+        """
+        found, value, generation = self._lookup(key)
+        if found:
+            return value
+        value = await asyncio.to_thread(loader)
+        self._store(key, value, generation)
+        return value
+
+    def _lookup(self, key) -> tuple[bool, Any, int]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, entry[1], self._generation
+            self.misses += 1
+            return False, None, self._generation
+
+    def _store(self, key, value, generation: int) -> None:
+        with self._lock:
+            # Si hubo una invalidación mientras se cargaba, no se guarda el dato viejo
+            if generation == self._generation:
+                self._data[key] = (self._clock() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def invalidate(self, key=_ALL) -> None:
+        """Descarta una clave o, sin argumentos, toda la caché."""
+        with self._lock:
+            self._generation += 1
+            if key is _ALL:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "ttl": self.ttl,
+                "maxsize": self.maxsize,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+def cached(name: str, ttl: float | None = None, maxsize: int | None = None):
+    """
+    Decorador: cachea el resultado de la función según sus argumentos.
+
+        @cached("roles")
+        def select_all_roles_service(): ...
+
+        select_all_roles_service.invalidate()
+        await select_all_roles_service.load_async()   # desde un handler async
+    """
+    cache = TTLCache(name, DEFAULT_TTL if ttl is None else ttl,
+                     DEFAULT_MAXSIZE if maxsize is None else maxsize)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return cache.get_or_load(args, lambda: fn(*args))
+
+        wrapper.cache = cache
+        wrapper.load_async = lambda *args: cache.get_or_load_async(args, lambda: fn(*args))
+        wrapper.invalidate = lambda *args: cache.invalidate(args) if args else cache.invalidate()
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    """Contadores de aciertos/fallos de todas las cachés, por nombre."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def clear_all_caches() -> None:
+    for cache in _registry.values():
+        cache.invalidate()
+        cache.reset_stats()
@@ -1,10 +1,28 @@
 import asyncio
 from datetime import datetime
-from ..repositories.TransactionRepository import insert_transaction, select_transactions_by_date_range
+from ..repositories.TransactionRepository import (
+    insert_transaction,
+    select_transactions_by_date_range,
+    select_transactions_keyset,
+    summarize_transactions,
+)
 from ..models.TransactionModel import Transaction
 
 def create_transaction(transaction: Transaction):
     return insert_transaction(transaction)
 
-def get_transactions_by_date_range_service(start_date: str, end_date: str):
-    return select_transactions_by_date_range(start_date, end_date)
\ No newline at end of file
+def get_transactions_by_date_range_service(start_date: str, end_date: str, status: str | None = None,
+                                           with_username: bool = False):
+    return select_transactions_by_date_range(
+        start_date, end_date, status=status, with_username=with_username
+    )
+
+def get_transactions_page_service(start_date: str, end_date: str, cursor: str | None, limit: int,
+                                  status: str | None = None):
+    """Página de la pantalla de transacciones (filas con usuario), por keyset."""
+    return select_transactions_keyset(start_date, end_date, cursor, limit,
+                                      status=status, with_username=True)
+
+def get_transactions_summary_service(start_date: str, end_date: str, status: str | None = None) -> tuple[int, int]:
+    """Cantidad y monto total de las transacciones filtradas."""
+    return summarize_transactions(start_date, end_date, status=status)
@@ -0,0 +1,23 @@
+# services/UnitOfWork.py
+from contextlib import contextmanager
+
+from sqlmodel import Session
+
+from ..repositories.ConnectDB import get_engine
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Abre una sesión (una conexión, una transacción) para una operación de
+    negocio completa. Las funciones de repositorio que reciben `session=`
+    trabajan dentro de ella sin confirmar; aquí se hace un único commit al
+    final o rollback si algo falló.
+    """
+    with Session(get_engine(), expire_on_commit=False) as session:
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
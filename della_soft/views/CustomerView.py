@@ -9,11 +9,11 @@ from typing import Optional, TYPE_CHECKING
 # ─── Modelos / Servicios ────────────────────────────────────────────────
 from ..models.CustomerModel import Customer
 from ..services.CustomerService import (
-    select_all_customer_service,
-    select_by_parameter_service,
     create_customer_service,
     delete_customer_service,
     update_customer_service,
+    get_customer_page_service_async,
+    get_total_items_service_async,
 )
 
 if TYPE_CHECKING:  # para evitar import circular en tiempo de chequeo
@@ -37,30 +37,38 @@ class CustomerView(rx.State):
     customer_search: str = ""
     error_message: str = ""
 
-    # Paginación
-    offset: int = 0
+    # Paginación (keyset: se guarda el cursor de la página, no un offset)
+    page_cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_number: int = 1
     limit: int = 5
     total_items: int = 0
 
     # ──────────────────────────── CARGA INICIAL ─────────────────────────
     @rx.event
     async def load_customers(self):
-        self.customers = select_all_customer_service()
-        self.total_items = len(self.customers)
-        self.customers = self.customers[self.offset : self.offset + self.limit]
+        # la búsqueda activa (si hay) filtra en la misma consulta paginada
+        page = await get_customer_page_service_async(self.page_cursor, self.limit, self.customer_search)
+        self.customers = page.rows
+        self.next_cursor = page.next_cursor
+        self.prev_cursor = page.prev_cursor
+        self.total_items = await get_total_items_service_async(self.customer_search)
         self.set()
 
     # ─────────────────────────── Paginación ────────────────────────────
     @rx.event
     async def next_page(self):
-        if self.offset + self.limit < self.total_items:
-            self.offset += self.limit
+        if self.next_cursor:
+            self.page_cursor = self.next_cursor
+            self.page_number += 1
             await self.load_customers()
 
     @rx.event
     async def prev_page(self):
-        if self.offset > 0:
-            self.offset -= self.limit
+        if self.prev_cursor:
+            self.page_cursor = self.prev_cursor
+            self.page_number -= 1
             await self.load_customers()
 
     @rx.var
@@ -69,7 +77,15 @@ class CustomerView(rx.State):
 
     @rx.var
     def current_page(self) -> int:
-        return (self.offset // self.limit) + 1
+        return self.page_number
+
+    @rx.var
+    def is_first_page(self) -> bool:
+        return self.prev_cursor is None
+
+    @rx.var
+    def is_last_page(self) -> bool:
+        return self.next_cursor is None
 
     # ───────────────────────────── Búsqueda ─────────────────────────────
     @rx.event
@@ -78,11 +94,10 @@ class CustomerView(rx.State):
         await self.get_customer_by_parameter()
 
     async def get_customer_by_parameter(self):
-        self.customers = await select_by_parameter_service(self.customer_search)
-        self.total_items = len(self.customers)
-        self.offset = 0
-        self.customers = self.customers[: self.limit]
-        self.set()
+        # nueva búsqueda: vuelve a la primera página de los resultados
+        self.page_cursor = None
+        self.page_number = 1
+        await self.load_customers()
 
     # ──────────────────────────── CRUD: CREATE ──────────────────────────
     @rx.event
@@ -419,11 +434,11 @@ def main_actions_bar():
 def pagination_controls():
     return rx.hstack(
         rx.button(rx.icon("arrow-left", size=22), on_click=CustomerView.prev_page,
-                  is_disabled=CustomerView.offset <= 0,
+                  is_disabled=CustomerView.is_first_page,
                   background_color="#3E2723", size="2", variant="solid"),
         rx.text(CustomerView.current_page, " de ", CustomerView.num_total_pages),
         rx.button(rx.icon("arrow-right", size=22), on_click=CustomerView.next_page,
-                  is_disabled=CustomerView.offset + CustomerView.limit >= CustomerView.total_items,
+                  is_disabled=CustomerView.is_last_page,
                   background_color="#3E2723", size="2", variant="solid"),
         justify="center",
         color="#3E2723",
@@ -1,10 +1,16 @@
+import asyncio
 import reflex as rx
+from datetime import date
 
 from ..services.DashboardService import (
+    RANGE_CUSTOM,
+    RANGE_MONTH,
+    RANGE_WEEK,
     get_stock_rotation_data_month,
     get_top_products_month,
     get_orders_per_day_month,
 )
+from ..services.EventProfiler import profile_events
 from .ReportPDF import (
     generate_stock_rotation_pdf,
     generate_top_products_pdf,
@@ -14,6 +20,7 @@ from .ReportPDF import (
 MESSAGE_NOT_FOUND="No hay datos para mostrar."
 MESSAGE_DOWNLOAD="Descargar PDF"
 
+@profile_events
 class DashboardState(rx.State):
     stock_rotation_data: list = []
     top_products_data: list = []
@@ -23,11 +30,16 @@ class DashboardState(rx.State):
     resumen_top: str = ""
     resumen_orders: str = ""
 
+    # ventana del gráfico de pedidos por día
+    orders_range: str = RANGE_MONTH
+    orders_start: str = date.today().isoformat()
+    orders_end: str = date.today().isoformat()
+
     @rx.event
     async def load_dashboard_data(self):
-        self.stock_rotation_data = get_stock_rotation_data_month()
-        self.top_products_data = get_top_products_month()
-        self.orders_by_day_data = get_orders_per_day_month()
+        self.stock_rotation_data = await get_stock_rotation_data_month()
+        self.top_products_data = await get_top_products_month()
+        await self._refresh_orders_per_day()
 
         if self.stock_rotation_data:
             prod_mas_vendido = max(self.stock_rotation_data, key=lambda x: x["Cantidad Vendida (Rotación)"])
@@ -46,31 +58,61 @@ class DashboardState(rx.State):
         else:
             self.resumen_top = MESSAGE_NOT_FOUND
 
+        self.set()
+
+    async def _refresh_orders_per_day(self) -> str | None:
+        """Consulta solo la ventana elegida; devuelve el error si el rango es inválido."""
+        try:
+            start = date.fromisoformat(self.orders_start)
+            end = date.fromisoformat(self.orders_end)
+            self.orders_by_day_data = await get_orders_per_day_month(
+                self.orders_range, start, end
+            )
+        except ValueError as err:
+            return str(err)
+
         if self.orders_by_day_data:
             total_pedidos = sum(x["Pedidos"] for x in self.orders_by_day_data)
-            self.resumen_orders = f'Total de pedidos este mes: {total_pedidos}.'
+            self.resumen_orders = f'Total de pedidos ({self.orders_range}): {total_pedidos}.'
         else:
             self.resumen_orders = MESSAGE_NOT_FOUND
+        return None
 
+    @rx.event
+    async def load_orders_per_day(self):
+        error = await self._refresh_orders_per_day()
+        if error:
+            yield rx.toast(error)
         self.set()
 
     @rx.event
-    def download_stock_rotation_pdf(self):
-        data = list(self.stock_rotation_data)
-        url = generate_stock_rotation_pdf(data)
-        return rx.download(url)
+    async def set_orders_range(self, value: str):
+        self.orders_range = value
+        if value != RANGE_CUSTOM:
+            yield DashboardState.load_orders_per_day
 
     @rx.event
-    def download_top_products_pdf(self):
-        data = list(self.top_products_data)
-        url = generate_top_products_pdf(data)
-        return rx.download(url)
+    def set_orders_start(self, value: str):
+        self.orders_start = value
 
     @rx.event
-    def download_orders_per_day_pdf(self):
-        data = list(self.orders_by_day_data)
-        url = generate_orders_per_day_pdf(data)
-        return rx.download(url)
+    def set_orders_end(self, value: str):
+        self.orders_end = value
+
+    @rx.event
+    async def download_stock_rotation_pdf(self):
+        report = await asyncio.to_thread(generate_stock_rotation_pdf, list(self.stock_rotation_data))
+        return rx.download(data=report.content, filename=report.filename)
+
+    @rx.event
+    async def download_top_products_pdf(self):
+        report = await asyncio.to_thread(generate_top_products_pdf, list(self.top_products_data))
+        return rx.download(data=report.content, filename=report.filename)
+
+    @rx.event
+    async def download_orders_per_day_pdf(self):
+        report = await asyncio.to_thread(generate_orders_per_day_pdf, list(self.orders_by_day_data))
+        return rx.download(data=report.content, filename=report.filename)
 
 def dashboard_view() -> rx.Component:
     return rx.box(
@@ -106,6 +148,25 @@ def dashboard_view() -> rx.Component:
 
         rx.card(
             rx.heading("Reporte: Pedidos por Día", size="5"),
+            rx.hstack(
+                rx.select(
+                    [RANGE_WEEK, RANGE_MONTH, RANGE_CUSTOM],
+                    value=DashboardState.orders_range,
+                    on_change=DashboardState.set_orders_range,
+                ),
+                rx.cond(
+                    DashboardState.orders_range == RANGE_CUSTOM,
+                    rx.hstack(
+                        rx.input(type="date", value=DashboardState.orders_start,
+                                 on_change=DashboardState.set_orders_start),
+                        rx.input(type="date", value=DashboardState.orders_end,
+                                 on_change=DashboardState.set_orders_end),
+                        rx.button("Aplicar", on_click=DashboardState.load_orders_per_day,
+                                  color="#fff", background_color="#3E2723"),
+                    ),
+                ),
+                margin_y="0.5em",
+            ),
             rx.text(DashboardState.resumen_orders),
             rx.button(
                 MESSAGE_DOWNLOAD,
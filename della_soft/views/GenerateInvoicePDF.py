@@ -0,0 +1,206 @@
+# della_soft/views/GenerateInvoicePDF.py
+import os
+from hashlib import sha256
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ..models import (
+    Invoice,
+    Order,
+    Customer,
+    ProductOrder,
+    Product,
+    Stamped,
+)
+from ..repositories.ConnectDB import get_engine
+from ..services.InvoiceNumberService import next_invoice_number
+from .InvoiceRender import InvoiceData, render_invoice_pdf
+from .PDFOutput import RenderedPDF
+
+INVOICE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "public", "facturas"
+)
+
+
+def generate_invoice_pdf(order_id: int) -> str:
+    """Genera (o recupera) la factura para un pedido y devuelve la ruta del PDF."""
+    path = find_invoice_pdf(order_id)
+    if path is not None:
+        return path
+    data = prepare_invoice_data(order_id)
+    return store_invoice_pdf(data.invoice_id, render_invoice_pdf(data))
+
+
+def invoice_pdf_path(invoice_id: int) -> str:
+    return os.path.join(INVOICE_DIR, f"factura_{invoice_id}.pdf")
+
+
+def find_invoice_pdf(order_id: int) -> str | None:
+    """
+    Ruta del PDF ya emitido del pedido si el archivo en disco coincide con
+    Invoice.pdf_hash; None si no hay factura, falta el archivo o cambió.
+    Solo hace una consulta de lectura: ni escribe en la BD ni maqueta.
+    """
+    with Session(get_engine()) as session:
+        row = session.exec(
+            select(Invoice.id, Invoice.pdf_hash).where(Invoice.id_order == order_id)
+        ).first()
+    if row is None or not row.pdf_hash:
+        return None
+    path = invoice_pdf_path(row.id)
+    try:
+        with open(path, "rb") as fh:
+            file_hash = sha256(fh.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+    return path if file_hash == row.pdf_hash else None
+
+
+def prepare_invoice_data(order_id: int, *, session: Session | None = None) -> InvoiceData:
+    """
+    Paso de datos: crea (o recupera) el Invoice del pedido, reservando el
+    número del timbrado activo, y junta lo que se imprime. El maquetado
+    queda para render_invoice_pdf, que no necesita la BD.
+
+    La fila del pedido se bloquea (FOR UPDATE) antes de buscar su Invoice,
+    así que dos descargas o una descarga y el lote no lo facturan a la vez.
+    Si igual choca con uq_invoice_id_order, se revierte (el número vuelve
+    al timbrado) y se usa la factura que ganó.
+
+    Con `session` se trabaja dentro de esa transacción y solo se hace
+    flush: confirmar o revertir (y con eso el número) lo decide quien la
+    abrió.
+    """
+    if session is not None:
+        return _invoice_data(session, order_id)
+
+    with Session(get_engine()) as session:
+        try:
+            data = _invoice_data(session, order_id)
+            session.commit()        # guarda Invoice y el número reservado
+        except IntegrityError:
+            # Otro proceso facturó el pedido entretanto: ahora se lo encuentra
+            session.rollback()
+            data = _invoice_data(session, order_id)
+        return data
+
+
+def _invoice_data(session: Session, order_id: int) -> InvoiceData:
+    # ── 1. Datos básicos ──────────────────────────────────────────────────────
+    order: Order | None = session.exec(
+        select(Order).where(Order.id == order_id).with_for_update()
+    ).one_or_none()
+    if not order:
+        raise ValueError(f"No se encontró la orden con ID {order_id}")
+
+    customer: Customer | None = session.get(Customer, order.id_customer)
+    if not customer:
+        raise ValueError(
+            f"No se encontró el cliente con ID {order.id_customer}"
+        )
+
+    productos = load_invoice_lines([order_id], session)[order_id]
+    total, iva = invoice_totals(productos)
+
+    # ── 2. Invoice ya emitido: se reutiliza su número, sin escribir ─────────
+    invoice = session.exec(
+        select(Invoice).where(Invoice.id_order == order_id)
+    ).one_or_none()
+
+    if invoice is not None and invoice.nro_factura and invoice.id_stamped:
+        timbrado = session.get(Stamped, invoice.id_stamped).stamped_number
+    else:
+        # ── 3. Número del timbrado activo (solo facturas nuevas) ────────────
+        # UPDATE … RETURNING atómico; va al final de la transacción para
+        # que el bloqueo de la fila de stamped dure solo hasta el commit.
+        block, numero_factura = next_invoice_number(session=session)
+        timbrado = block.stamped_number
+
+        if invoice is None:
+            invoice = Invoice(
+                iva=iva,
+                invoice_date=datetime.now(),
+                id_order=order_id,
+                id_stamped=block.stamped_id,
+                nro_factura=numero_factura,
+            )
+            session.add(invoice)
+        else:
+            # Invoice incompleto (sin número o sin timbrado)
+            invoice.iva = iva
+            invoice.invoice_date = invoice.invoice_date or datetime.now()
+            invoice.id_stamped = block.stamped_id
+            invoice.nro_factura = invoice.nro_factura or numero_factura
+        session.flush()             # id del Invoice; choca acá si ya hay otro
+
+    # ── 4. Valores simples, utilizables fuera de la sesión ──────────────────
+    return build_invoice_data(invoice, timbrado, customer, productos)
+
+
+def load_invoice_lines(order_ids: list[int], session: Session) -> dict[int, list[dict]]:
+    """
+    Líneas de varios pedidos con nombre y precio del producto, en una sola
+    consulta (JOIN product) en vez de un session.get por línea.
+    """
+    lines: dict[int, list[dict]] = {order_id: [] for order_id in order_ids}
+    rows = session.exec(
+        select(ProductOrder.id_order, Product.name, ProductOrder.quantity, Product.price)
+        .join(Product, Product.id == ProductOrder.id_product)
+        .where(ProductOrder.id_order.in_(order_ids))
+        .order_by(ProductOrder.id_order, ProductOrder.id)
+    ).all()
+    for order_id, name, quantity, price in rows:
+        lines[order_id].append(
+            {
+                "nombre": name,
+                "cantidad": quantity,
+                "precio_unitario": price,
+                "subtotal": quantity * price,
+            }
+        )
+    return lines
+
+
+def invoice_totals(productos: list[dict]) -> tuple[int, float]:
+    total = sum(p["subtotal"] for p in productos)
+    iva = round(total / 11, 2)  # 10 % IVA incluido → 1/11 del total
+    return total, iva
+
+
+def build_invoice_data(invoice, timbrado: str, customer, productos: list[dict]) -> InvoiceData:
+    """InvoiceData a partir del Invoice (o fila con id, nro_factura e invoice_date) y el cliente."""
+    total, iva = invoice_totals(productos)
+    return InvoiceData(
+        invoice_id=invoice.id,
+        nro_factura=invoice.nro_factura,
+        timbrado=timbrado,
+        fecha_emision=invoice.invoice_date.strftime("%d/%m/%Y"),
+        cliente=f"{customer.first_name} {customer.last_name}",
+        cliente_ruc=(
+            f"{customer.ci}"
+            if customer.div is None
+            else f"{customer.ci}-{customer.div}"
+        ),
+        total=total,
+        iva=iva,
+        productos=productos,
+    )
+
+
+def store_invoice_pdf(invoice_id: int, pdf_bytes: bytes) -> str:
+    """Guarda el PDF en public/facturas y registra su hash; devuelve la ruta."""
+    rendered = RenderedPDF.from_bytes(pdf_bytes, os.path.basename(invoice_pdf_path(invoice_id)))
+    filename = rendered.save(INVOICE_DIR)
+
+    # Hash del PDF (útil para auditoría y para reutilizar el archivo). El
+    # render es determinista, así que al regenerar un archivo perdido el
+    # hash no cambia y no se escribe.
+    with Session(get_engine()) as session:
+        inv: Invoice | None = session.get(Invoice, invoice_id)
+        if inv and inv.pdf_hash != rendered.sha256:
+            inv.pdf_hash = rendered.sha256
+            session.add(inv)
+            session.commit()
+
+    return filename
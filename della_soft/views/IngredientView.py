@@ -167,7 +167,7 @@ class IngredientView(rx.State):
 
     @rx.event
     async def load_measures(self):
-        measures = await select_all_measure_service()
+        measures = select_all_measure_service()
         opts, mmap = [], {}
         for m in measures:
             label = f"({m.description})"
@@ -0,0 +1,127 @@
+# della_soft/views/InvoiceRender.py
+"""
+Maquetado de la factura: recibe los datos ya resueltos y devuelve el PDF.
+
+No toca la BD ni el disco, así que puede ejecutarse en otro proceso
+(ver services/InvoiceJobService.py); por eso este módulo solo importa
+fpdf y num2words, y no los modelos ni reflex.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from fpdf import FPDF
+from num2words import num2words
+
+
+@dataclass(frozen=True)
+class InvoiceData:
+    """Todo lo que se imprime en la factura (valores simples, se puede serializar)."""
+
+    invoice_id: int
+    nro_factura: str
+    timbrado: str
+    fecha_emision: str          # dd/mm/aaaa
+    cliente: str
+    cliente_ruc: str
+    total: int
+    iva: float
+    # dicts con nombre, cantidad, precio_unitario y subtotal
+    productos: list[dict] = field(default_factory=list)
+
+
+def render_invoice_pdf(data: InvoiceData) -> bytes:
+    """Arma el PDF de la factura en memoria y devuelve sus bytes."""
+    total_letras = num2words(data.total, lang="es").capitalize() + " guaranies"
+
+    pdf = FPDF()
+    # Misma factura → mismos bytes: la fecha de creación del PDF es la de
+    # emisión, no la de este render (así el hash guardado sigue valiendo).
+    emitida = datetime.strptime(data.fecha_emision, "%d/%m/%Y")
+    pdf.set_creation_date(emitida.replace(tzinfo=timezone.utc))
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 12)
+
+    # Encabezado del negocio
+    pdf.cell(0, 10, "DELLA CAMPAGNA PASTELERIA", ln=True, align="C")
+    pdf.set_font("Arial", "", 9)
+    pdf.cell(
+        0,
+        5,
+        "de Monique Augustini Lucienne Campagna Lalane",
+        ln=True,
+        align="C",
+    )
+    pdf.cell(
+        0,
+        5,
+        "TORTAS FALSAS - FONDANT - MERENGUE - CHOCOLATE - FIGURAS DE AZUCAR - MESA DE DULCE",
+        ln=True,
+        align="C",
+    )
+    pdf.cell(
+        0,
+        5,
+        "Sargento Ferreira N 195 c/ Tuyuti - Capiata, Paraguay",
+        ln=True,
+        align="C",
+    )
+    pdf.cell(
+        0,
+        5,
+        "Tel: (0228) 631 209 / (0982) 493 185 / (0981) 446 692",
+        ln=True,
+        align="C",
+    )
+    pdf.ln(3)
+
+    # Datos de la factura
+    pdf.cell(0, 6, "RUC: 1005125-2", ln=True)
+    pdf.cell(0, 6, f"Factura N: {data.nro_factura}", ln=True)
+    pdf.cell(0, 6, f"Timbrado N: {data.timbrado}", ln=True)
+    pdf.cell(0, 6, "Autorizado por Resolucion General N 90/2024", ln=True)
+    pdf.cell(0, 6, f"Fecha de Emision: {data.fecha_emision}", ln=True)
+    pdf.cell(0, 6, "Condicion de Venta: CONTADO", ln=True)
+    pdf.ln(5)
+
+    # Datos del cliente
+    pdf.cell(0, 8, f"Cliente: {data.cliente}", ln=True)
+    pdf.cell(0, 8, f"RUC: {data.cliente_ruc}", ln=True)
+    pdf.ln(4)
+
+    # Detalle de productos
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(20, 8, "CANT.", 1)
+    pdf.cell(90, 8, "DESCRIPCION", 1)
+    pdf.cell(40, 8, "PRECIO UNIT.", 1)
+    pdf.cell(40, 8, "SUBTOTAL", 1)
+    pdf.ln()
+
+    pdf.set_font("Arial", "", 10)
+    for p in data.productos:
+        pdf.cell(20, 8, str(p["cantidad"]), 1)
+        pdf.cell(90, 8, p["nombre"], 1)
+        pdf.cell(40, 8, f"{p['precio_unitario']:,}", 1)
+        pdf.cell(40, 8, f"{p['subtotal']:,}", 1)
+        pdf.ln()
+
+    pdf.ln(3)
+    pdf.cell(0, 8, f"TOTAL IVA (10%): {data.iva:,.0f} Gs", ln=True)
+    pdf.cell(0, 8, f"TOTAL A PAGAR: {data.total:,.0f} Gs", ln=True)
+    pdf.multi_cell(0, 8, f"SON: {total_letras}", border="B")
+
+    return bytes(pdf.output())
+
+
+def render_invoice_pdfs(datas: list[InvoiceData]) -> list[bytes | Exception]:
+    """
+    Maqueta varias facturas en una sola llamada (un envío por lote al pool
+    de procesos en vez de uno por factura). Un error no corta el lote: se
+    devuelve en la posición de esa factura.
+    """
+    results: list[bytes | Exception] = []
+    for data in datas:
+        try:
+            results.append(render_invoice_pdf(data))
+        except Exception as exc:
+            results.append(exc)
+    return results
@@ -3,9 +3,9 @@ import reflex as rx
 from typing import List
 
 from ..services.ProductService import (
-    select_all_product_service,
+    select_all_product_service_async,
     create_product,
-    get_product,
+    select_product_async,
     delete_product_service,
 )
 from ..models.ProductModel import Product
@@ -31,7 +31,7 @@ class OrderDetailView(rx.State):
     @rx.event
     async def load_OrderDetails(self):
         # Al abrir el modal: recargar todos los productos y reiniciar contadores a cero
-        products = await select_all_product_service()
+        products = await select_all_product_service_async()
         self.plain_data = products[:]  # copia completa
         # Inicializar cada contador en 0
         for p in products:
@@ -43,7 +43,7 @@ class OrderDetailView(rx.State):
 
     @rx.event
     async def reset_product_counts(self):
-        products = await select_all_product_service()
+        products = await select_all_product_service_async()
         self.plain_data = products[:]
         self.product_counts = {p.id: 0 for p in products}
         self.total_items = len(products)
@@ -54,7 +54,7 @@ class OrderDetailView(rx.State):
 
     @rx.event
     async def preserve_product_counts(self):
-        products = await select_all_product_service()
+        products = await select_all_product_service_async()
 
         if not self.product_counts:
             # Si está vacío, inicializamos en 0
@@ -121,7 +121,7 @@ class OrderDetailView(rx.State):
         await self.get_product()
 
     async def get_product(self):
-        self.data = await get_product(self.input_search)
+        self.data = await select_product_async(self.input_search)
         # Asegurar contador para cada producto cargado
         for p in self.data:
             self.product_counts.setdefault(p.id, 0)
@@ -1,23 +1,25 @@
 # OrderView.py
 import reflex as rx
-from typing import List
+from typing import List, Optional
 
 import asyncio
 import aiofiles
 
-from della_soft.services.ProductService import select_all_product_service
-from della_soft.views.GenerateInvoicePDF import generate_invoice_pdf
+from della_soft.services.ProductService import select_all_product_service_async
+from della_soft.services.InvoiceJobService import READY, submit_invoice_job, wait_invoice_job
 
 from ..models.ProductOrderModel import ProductOrder
-from ..services.ProductOrderService import (
-    insert_product_order_service,
-    select_by_order_id_service,
-    update_product_orders,
+from ..services.ProductOrderService import select_by_order_id_service_async
+from ..services.OrderService import (
+    get_order_by_id_service,
+    select_orders_keyset_service,
+    count_orders_service,
+    create_order_with_lines_service,
+    update_order_with_lines_service,
 )
-from ..repositories.OrderRepository import insert_order
-from ..services.OrderService import select_all_order_service, update_order_service
-from ..services.CustomerService import select_name_by_id, select_all_customer_service
+from ..services.CustomerService import select_name_by_id_async, select_all_customer_service_async
 from ..services.SystemService import get_sys_date_to_string, get_sys_date
+from ..services.EventProfiler import profile_events
 from ..repositories.ProductRepository import get_product
 
 from .OrderDetailView import OrderDetailView, order_details
@@ -30,7 +32,24 @@ TOTAL_ORDER_LABEL="Total Pedido:"
 TOTAL_PAID_LABEL="Total Pagado:"
 SYS_DATE_LABEL="Fecha de Ingreso:"
 DELIVERY_DATE_LABEL="Fecha de Entrega:"
-
+DATE_FMT="%Y-%m-%d %H:%M:%S"
+
+
+def format_order_row(row: dict) -> dict:
+    """Convierte una fila de `select_order_rows_service` al dict de la tabla."""
+    return {
+        "id": row["id"],
+        "id_customer": row["id_customer"],
+        "customer_name": row["customer_name"] or "",
+        "observation": row["observation"] or "",
+        "total_order": row["total_order"],
+        "total_paid": row["total_paid"],
+        "order_date": row["order_date"].strftime(DATE_FMT) if row["order_date"] else "",
+        "delivery_date": row["delivery_date"].strftime(DATE_FMT) if row["delivery_date"] else "",
+        "pending": row["pending"],
+    }
+
+@profile_events
 class OrderView(rx.State):
     # Tabla de pedidos
     data: List[dict] = []
@@ -66,7 +85,10 @@ class OrderView(rx.State):
     # Búsqueda y paginación
     sys_date = ""
     input_search = ""
-    offset = 0
+    page_cursor: Optional[str] = None   # keyset: cursor de la página visible
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_number = 1
     limit = 5
     total_items = 0
 
@@ -74,7 +96,7 @@ class OrderView(rx.State):
 
     @rx.event
     async def load_customers(self):
-        customers = await select_all_customer_service()
+        customers = await select_all_customer_service_async()
         opts, cmap = [], {}
         for c in customers:
             label = f"({c.ci or 0}) {c.first_name} {c.last_name}"
@@ -109,14 +131,13 @@ class OrderView(rx.State):
 
     @rx.event
     async def open_view_modal(self, order_id: int):
-        orders = await select_all_order_service()
-        order = next((o for o in orders if o.id == order_id), None)
+        order = await get_order_by_id_service(order_id)
         if not order:
             return
 
         # Rellenar datos del modal
         self.modal_order = order
-        self.modal_customer_name = select_name_by_id(order.id_customer)
+        self.modal_customer_name = await select_name_by_id_async(order.id_customer)
         self.modal_order_date_str = (
             order.order_date.strftime("%Y-%m-%d %H:%M:%S") if order.order_date else ""
         )
@@ -127,8 +148,8 @@ class OrderView(rx.State):
         self.modal_total_paid_str = f"{order.total_paid}"
 
         # Sólo detalles con cantidad > 0
-        details = select_by_order_id_service(order_id)
-        products = await select_all_product_service()
+        details = await select_by_order_id_service_async(order_id)
+        products = await select_all_product_service_async()
         lst = []
         for d in details:
             if d.quantity > 0:
@@ -152,37 +173,31 @@ class OrderView(rx.State):
         self.set()
 
     async def get_all_orders(self):
-        orders = await select_all_order_service()
-        lst = []
-        for o in orders:
-            lst.append({
-                "id": o.id,
-                "id_customer": o.id_customer,
-                "customer_name": select_name_by_id(o.id_customer),
-                "observation": o.observation or "",
-                "total_order": o.total_order,
-                "total_paid": o.total_paid,
-                "order_date": o.order_date.strftime("%Y-%m-%d %H:%M:%S") if o.order_date else "",
-                "delivery_date": o.delivery_date.strftime("%Y-%m-%d %H:%M:%S") if o.delivery_date else "",
-                "pending": o.total_order - o.total_paid,
-            })
-        self.total_items = len(lst)
-        return lst[self.offset : self.offset + self.limit]
+        """Trae solo la página visible; búsqueda, orden y corte los hace la BD."""
+        page = await select_orders_keyset_service(
+            self.input_search, self.page_cursor, self.limit
+        )
+        self.next_cursor = page.next_cursor
+        self.prev_cursor = page.prev_cursor
+        return [format_order_row(r) for r in page.rows]
 
     @rx.event
     async def load_orders(self):
+        self.total_items = await count_orders_service(self.input_search)
         self.data = await self.get_all_orders()
         self.set()
 
     async def next_page(self):
-        if self.offset + self.limit < self.total_items:
-            self.offset += self.limit
+        if self.next_cursor:
+            self.page_cursor = self.next_cursor
+            self.page_number += 1
             self.data = await self.get_all_orders()
             self.set()
 
     async def prev_page(self):
-        if self.offset > 0:
-            self.offset -= self.limit
+        if self.prev_cursor:
+            self.page_cursor = self.prev_cursor
+            self.page_number -= 1
             self.data = await self.get_all_orders()
             self.set()
 
@@ -192,7 +207,15 @@ class OrderView(rx.State):
 
     @rx.var
     def current_page(self) -> int:
-        return (self.offset // self.limit) + 1
+        return self.page_number
+
+    @rx.var
+    def is_first_page(self) -> bool:
+        return self.prev_cursor is None
+
+    @rx.var
+    def is_last_page(self) -> bool:
+        return self.next_cursor is None
 
     @rx.event
     async def load_order_information(self, value: str):
@@ -200,42 +223,10 @@ class OrderView(rx.State):
         await self.get_order()
 
     async def get_order(self):
-        orders = await select_all_order_service()
-        q = (self.input_search or "").lower()
-        resultados = []
-        for o in orders:
-            cliente = select_name_by_id(o.id_customer) or ""
-            obs     = o.observation or ""
-            fecha_o = o.order_date.strftime("%Y-%m-%d %H:%M:%S") if o.order_date else ""
-            fecha_d = o.delivery_date.strftime("%Y-%m-%d %H:%M:%S") if o.delivery_date else ""
-            # calculamos el estado que mostramos en la columna ¿Pagado Totalmente?
-            estado = "PAGADO" if o.total_paid == o.total_order else "FALTA PAGO"
-            # armamos la lista de campos para buscar
-            campos = [
-                str(o.id),
-                cliente,
-                obs,
-                f"{o.total_order}",
-                f"{o.total_paid}",
-                estado,            # <-- aquí lo añadimos
-                fecha_o,
-                fecha_d,
-            ]
-            # si coincide en alguno, lo añadimos a resultados
-            if any(q in campo.lower() for campo in campos):
-                resultados.append({
-                    "id": o.id,
-                    "id_customer": o.id_customer,
-                    "customer_name": cliente,
-                    "observation": obs,
-                    "total_order": o.total_order,
-                    "total_paid": o.total_paid,
-                    "delivery_date": fecha_d,
-                    "pending": o.total_order - o.total_paid,
-                })
-        self.total_items = len(resultados)
-        self.offset = 0
-        self.data = resultados[self.offset : self.offset + self.limit]
+        self.page_cursor = None
+        self.page_number = 1
+        self.total_items = await count_orders_service(self.input_search)
+        self.data = await self.get_all_orders()
         self.set()
 
 
@@ -253,25 +244,25 @@ class OrderView(rx.State):
             order_date=form_data["order_date"],
             delivery_date=form_data["delivery_date"],
         )
-        new_order = insert_order(order_save)
         detail_state = await self.get_state(OrderDetailView)
-        for prod in detail_state.plain_data:
-            qty = detail_state.product_counts.get(prod.id, 0)
-            if qty > 0:
-                po = ProductOrder(id=None, quantity=qty, id_product=prod.id, id_order=new_order.id)
-                insert_product_order_service(po)
+        lines = [
+            ProductOrder(id=None, quantity=qty, id_product=prod.id, id_order=None)
+            for prod in detail_state.plain_data
+            if (qty := detail_state.product_counts.get(prod.id, 0)) > 0
+        ]
+        # Cabecera y líneas en una sola transacción
+        await asyncio.to_thread(create_order_with_lines_service, order_save, lines)
         yield OrderView.load_orders()
         self.set()
 
     @rx.event
     async def edit_order(self, order_id: int):
-        orders = await select_all_order_service()
-        order = next((o for o in orders if o.id == order_id), None)
+        order = await get_order_by_id_service(order_id)
         if not order:
             return
 
         self.modal_order = order
-        self.modal_customer_name = select_name_by_id(order.id_customer)
+        self.modal_customer_name = await select_name_by_id_async(order.id_customer)
         self.modal_order_date_str = (
             order.order_date.strftime("%Y-%m-%d %H:%M:%S") if order.order_date else ""
         )
@@ -281,7 +272,7 @@ class OrderView(rx.State):
         self.modal_total_paid_str = f"{order.total_paid}"
 
         detail_state = await self.get_state(OrderDetailView)
-        products = await select_all_product_service()
+        products = await select_all_product_service_async()
         detail_state.plain_data = products[:]
         detail_state.product_counts = {p.id: 0 for p in products}
         detail_state.total_items = len(products)
@@ -289,7 +280,7 @@ class OrderView(rx.State):
         detail_state.limit = 3
         detail_state.data = products[:detail_state.limit]
 
-        details = select_by_order_id_service(order_id)
+        details = await select_by_order_id_service_async(order_id)
         for d in details:
             prod = next((p for p in products if p.id == d.id_product), None)
             if prod:
@@ -308,9 +299,21 @@ class OrderView(rx.State):
         self.set()
 
     @rx.event
-    async def generate_invoice_pdf_event(self, order_id: int):
-        path = await asyncio.to_thread(generate_invoice_pdf, order_id)
-        async with aiofiles.open(path, "rb") as f:
+    def generate_invoice_pdf_event(self, order_id: int):
+        # Se encola y se vuelve enseguida (p. ej. al cerrar un pago); la
+        # descarga la hace deliver_invoice cuando el PDF está listo.
+        job_id = submit_invoice_job(order_id)
+        yield rx.toast("Generando factura…")
+        yield OrderView.deliver_invoice(job_id, order_id)
+
+    @rx.event(background=True)
+    async def deliver_invoice(self, job_id: str, order_id: int):
+        job = await wait_invoice_job(job_id)
+        if job is None or job.status != READY:
+            detail = job.error if job is not None and job.error else "tiempo de espera agotado"
+            yield rx.toast(f"No se pudo generar la factura: {detail}")
+            return
+        async with aiofiles.open(job.path, "rb") as f:
             pdf_bytes = await f.read()
         yield rx.download(data=pdf_bytes,
                           filename=f"factura_{order_id}.pdf")
@@ -351,8 +354,8 @@ class OrderView(rx.State):
             delivery_date=form_data["delivery_date"],
         )
 
-        update_order_service(updated_order)
-        update_product_orders(self.modal_order.id, new_products)
+        # Cabecera y solo las líneas que cambiaron, en una sola transacción
+        await asyncio.to_thread(update_order_with_lines_service, updated_order, new_products)
 
         self.edit_modal_open = False
         yield rx.toast("Pedido actualizado con éxito")
@@ -736,7 +739,7 @@ def pagination_controls() -> rx.Component:
         rx.button(
             rx.icon("arrow-left", size=22),
             on_click=OrderView.prev_page,
-            is_disabled=OrderView.offset <= 0,
+            is_disabled=OrderView.is_first_page,
             background_color="#3E2723",
             size="2",
             variant="solid",
@@ -745,7 +748,7 @@ def pagination_controls() -> rx.Component:
         rx.button(
             rx.icon("arrow-right", size=22),
             on_click=OrderView.next_page,
-            is_disabled=OrderView.offset + OrderView.limit >= OrderView.total_items,
+            is_disabled=OrderView.is_last_page,
             background_color="#3E2723",
             size="2",
             variant="solid",
@@ -0,0 +1,54 @@
+# della_soft/views/PDFOutput.py
+"""
+PDFs generados en memoria.
+
+Los reportes y facturas se maquetan en un buffer: `RenderedPDF` guarda los
+bytes junto con su SHA-256 (calculado una sola vez, sobre esos mismos
+bytes) y un nombre de archivo único por pedido de descarga. Se envían con
+rx.download(data=…) y guardarlos en disco es opcional (`save`).
+"""
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
+
+from fpdf import FPDF
+
+
+def unique_filename(prefix: str) -> str:
+    """'reporte' → 'reporte_20250619_153012_1a2b3c4d.pdf' (no choca entre descargas simultáneas)."""
+    return f"{prefix}_{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}.pdf"
+
+
+@dataclass(frozen=True)
+class RenderedPDF:
+    content: bytes
+    sha256: str
+    filename: str
+
+    @classmethod
+    def from_bytes(cls, content: bytes, filename: str) -> "RenderedPDF":
+        return cls(content=content, sha256=sha256(content).hexdigest(), filename=filename)
+
+    @classmethod
+    def from_fpdf(cls, pdf: FPDF, filename: str) -> "RenderedPDF":
+        return cls.from_bytes(bytes(pdf.output()), filename)
+
+    def save(self, directory: str) -> str:
+        """
+        Guarda el PDF en `directory` y devuelve la ruta. Se escribe en un
+        temporal y se renombra, así quien lea el archivo nunca ve uno a medias.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.filename)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(self.content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
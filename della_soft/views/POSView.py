@@ -1,3 +1,4 @@
+import asyncio
 import reflex as rx
 from typing import Optional, List
 
@@ -9,16 +10,15 @@ from ..services.SystemService import (
     get_sys_date_three,
 )
 from ..repositories.LoginRepository import AuthState
-from ..services.POSService import pos_is_open, insert_pos_register, update_final_amount
-from ..services.OrderService import select_all_order_service, update_pay_amount_service
-from ..services.CustomerService import select_name_by_id
-from ..services.ProductOrderService import get_fixed_products_by_order_id
-from ..services.ProductStockService import update_stock_with_pay_service, get_stock_by_product_service, update_stock_with_reverse_service
+from ..services.POSService import pos_is_open, insert_pos_register
+from ..services.OrderService import select_order_rows_service
+from ..services.PaymentService import (
+    process_payment_service,
+    process_reverse_service,
+    process_bill_service,
+)
+from ..services.EventProfiler import profile_events
 from ..models.POSModel import POS
-from ..models.OrderModel import Order
-from ..services.TransactionService import create_transaction
-from ..models.TransactionModel import Transaction
-from datetime import datetime
 
 from .OrderView import OrderView, view_order_modal
 
@@ -101,6 +101,7 @@ def get_table_header() -> rx.Component:
         background_color="#A67B5B",
     )
 
+@profile_events
 class POSView(rx.State):
     show_paid: bool = False
     sys_date: str
@@ -273,16 +274,16 @@ class POSView(rx.State):
         self.sys_date = get_sys_date_to_string_two()
         self.pos = pos_is_open(get_sys_date_two(self.sys_date))
         self.is_open = self.pos is not None
-        orders = await select_all_order_service()
+        rows = await select_order_rows_service()
         self.pos_data = [
             {
-                "id": o.id,
-                "customer_name": select_name_by_id(o.id_customer),
-                "total_order": o.total_order,
-                "total_paid": o.total_paid,
-                "pending": o.total_order - o.total_paid,
+                "id": r["id"],
+                "customer_name": r["customer_name"] or "",
+                "total_order": r["total_order"],
+                "total_paid": r["total_paid"],
+                "pending": r["pending"],
             }
-            for o in orders
+            for r in rows
         ]
         self.pos_search = ""
         self.show_paid = False
@@ -340,13 +341,16 @@ class POSView(rx.State):
         if order is None:
             return
 
+        # Stock, transacción, pedido, caja y descuento de stock en una
+        # única transacción (rollback completo si falta stock).
         try:
-            await self._check_stock(order_id)                   # ①
-            await self._record_tx(order_id, amount)             # ②
-            await self._update_order_paid(order, amount)        # ③
-            await self._update_pos(amount)                      # ④
-            await self._update_stock_if_completed(order_id, order, amount)  # ⑤
-            await self._maybe_make_invoice(order_id, order, amount)         # ⑥
+            order["total_paid"] = await asyncio.to_thread(
+                process_payment_service,
+                order_id,
+                amount,
+                self.pos,
+                self._user_id,
+            )
         except ValueError as err:                               # stock insuf.
             yield rx.toast(str(err))
             return
@@ -354,7 +358,11 @@ class POSView(rx.State):
             print("Error en process_payment:", err)
             yield rx.toast("Se produjo un error. Intenta nuevamente.")
             return
+        self.pos.final_amount += amount        # mantener sincronizado
 
+        # total_paid viene de la BD: cuenta los pagos de otras cajas
+        if self._is_paid(order):
+            yield OrderView.generate_invoice_pdf_event(order_id)
         yield POSView.load_date()
 
     # -------------  Helpers  -------------------------
@@ -369,50 +377,8 @@ class POSView(rx.State):
             print(f"Pedido {order_id} no encontrado")
         return order
 
-    async def _check_stock(self, order_id: int) -> None:
-        for po in get_fixed_products_by_order_id(order_id):
-            stock = await get_stock_by_product_service(po.id_product)
-            if stock is None or stock.quantity < po.quantity:
-                raise ValueError(
-                    f"Stock insuficiente – producto {po.id_product} "
-                    f"(disponible: {stock.quantity if stock else 0}, "
-                    f"solicitado: {po.quantity})"
-                )
-
-    async def _record_tx(self, order_id: int, amount: int) -> None:
-        create_transaction(Transaction(
-            id=None,
-            observation=f"Pago por {amount}",
-            amount=amount,
-            transaction_date=datetime.now(),
-            status="PAGO",
-            id_POS=self.pos.id,
-            id_user=self._user_id,
-            id_order=order_id,
-        ))
-
-    async def _update_order_paid(self, order: dict, amount: int) -> None:
-        new_total = order["total_paid"] + amount
-        update_pay_amount_service(Order(id=order["id"], total_paid=new_total))
-        order["total_paid"] = new_total        # reflejar en cache
-
-    async def _update_pos(self, amount: int) -> None:
-        update_final_amount(
-            self.pos.id,
-            self.pos.initial_amount,
-            self.pos.final_amount + amount,
-            self.pos.pos_date,
-        )
-        self.pos.final_amount += amount        # mantener sincronizado
-
-    async def _update_stock_if_completed(self, order_id: int, order: dict, amount: int):
-        if order["total_paid"] >= order["total_order"]:
-            for po in get_fixed_products_by_order_id(order_id):
-                await update_stock_with_pay_service(po.id_product, po.quantity)
-
-    async def _maybe_make_invoice(self, order_id: int, order: dict, amount: int):
-        if amount == order["pending"]:               # era el último pago
-            await OrderView.generate_invoice_pdf_event(order_id)
+    def _is_paid(self, order: dict) -> bool:
+        return order["total_paid"] >= order["total_order"]
 
     @rx.event
     async def process_reverse(self, form_data: dict):
@@ -430,40 +396,18 @@ class POSView(rx.State):
             print(f"Pedido {order_id} no encontrado")
             return
 
-        new_total_paid = order["total_paid"] + amount
         try:
-            create_transaction(
-                Transaction(
-                    id=None,
-                    observation=f"Reverso de {amount}",
-                    amount=amount,
-                    transaction_date=datetime.now(),
-                    status="REVERSO",
-                    id_POS=self.pos.id,
-                    id_user=user_id,
-                    id_order=order_id,
-                )
+            await asyncio.to_thread(
+                process_reverse_service,
+                order_id,
+                amount,
+                self.pos,
+                user_id,
             )
-            update_pay_amount_service(Order(id=order_id, total_paid=new_total_paid))
         except Exception as e:
             print("Error al procesar reverso:", e)
             return
 
-        update_final_amount(
-            self.pos.id,
-            self.pos.initial_amount,
-            self.pos.final_amount + amount,
-            self.pos.pos_date,
-        )
-
-        if order["total_paid"] == order["total_order"] and new_total_paid < order["total_order"]:
-            try:
-                fixed_products = get_fixed_products_by_order_id(order_id)
-                for po in fixed_products:
-                    await update_stock_with_reverse_service(po.id_product, po.quantity)
-            except Exception as e:
-                print("Error al revertir stock:", e)
-
         yield POSView.load_date()
 
 
@@ -477,23 +421,8 @@ class POSView(rx.State):
             yield rx.toast(MESSAGE_KILL_SESSION)
             return
         try:
-            create_transaction(
-                Transaction(
-                    id=None,
-                    observation=observation,
-                    amount=amount,
-                    transaction_date=datetime.now(),
-                    status="GASTO",
-                    id_POS=self.pos.id,
-                    id_user=user_id,
-                    id_order=None,
-                )
-            )
-            update_final_amount(
-                self.pos.id,
-                self.pos.initial_amount,
-                self.pos.final_amount + amount,
-                self.pos.pos_date,
+            await asyncio.to_thread(
+                process_bill_service, amount, observation, self.pos, user_id
             )
         except Exception as e:
             print("Error al ingresar gasto:", e)
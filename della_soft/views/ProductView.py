@@ -6,7 +6,7 @@ from rxconfig import config
 
 from typing import Any, List
 
-from ..services.ProductService import select_all_product_service, create_product, get_product, delete_product_service, update_product_service
+from ..services.ProductService import select_all_product_service, create_product, select_product_async, delete_product_service, update_product_service
 
 from ..models.ProductModel import Product
 
@@ -77,7 +77,7 @@ class ProductView(rx.State):
         await self.get_product()
 
     async def get_product(self):
-        self.data = await get_product(self.input_search)
+        self.data = await select_product_async(self.input_search)
         self.total_items = len(self.data)  # ✅ Guarda total de clientes filtrados
         self.offset = 0  # ✅ Reinicia a la primera página
         self.data = self.data[self.offset : self.offset + self.limit]  # ✅ Aplica paginación
@@ -2,7 +2,7 @@ import reflex as rx
 from typing import List, Dict, Optional
 
 from della_soft.repositories.LoginRepository import AuthState
-from della_soft.repositories.ProductRepository import get_product
+from della_soft.services.ProductService import select_product_async
 
 from .ProductView import ProductView, get_table_header as product_table_header
 from ..services.ProductService import select_all_product_service
@@ -295,7 +295,7 @@ class RecipeView(ProductView):
         await self.open_view_modal(prod)
 
     async def get_product(self):
-        self.data = await get_product(self.recipe_input_search)
+        self.data = await select_product_async(self.recipe_input_search)
         self.total_items = len(self.data) 
         self.offset = 0 
         self.data = self.data[self.offset : self.offset + self.limit]  
@@ -2,8 +2,9 @@ from fpdf import FPDF
 import os
 from datetime import datetime
 
+from .PDFOutput import RenderedPDF, unique_filename
+
 EMPRESA = "Della Campagna Pastelería"
-MES_ACTUAL = datetime.now().strftime('%m/%Y')
 LOGO_PATH = os.path.join("assets", "logo.png")  # El logo debe estar aquí
 
 class PDF(FPDF):
@@ -29,57 +30,37 @@ class PDF(FPDF):
                 self.cell(ancho_col[i], 8, str(valor), 1, 0, "C")
             self.ln()
 
-def generate_stock_rotation_pdf(data):
+def _report_pdf(prefix, titulo, encabezados, filas, ancho_col) -> RenderedPDF:
+    """Maqueta el reporte en memoria; cada llamada tiene su propio nombre de archivo."""
+    mes_actual = datetime.now().strftime('%m/%Y')
     pdf = PDF()
     pdf.add_page()
     # --- Contenido debajo del logo ---
     pdf.set_font("Arial", "B", 18)
     pdf.cell(0, 10, EMPRESA, 0, 1, "C")
     pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 10, f"Reporte de Stock Disponible vs Rotación ({MES_ACTUAL})", 0, 1, "C")
+    pdf.cell(0, 10, f"{titulo} ({mes_actual})", 0, 1, "C")
     pdf.ln(6)
+    pdf.tabla_centrada(encabezados, filas, ancho_col)
+    return RenderedPDF.from_fpdf(pdf, unique_filename(prefix))
+
+def generate_stock_rotation_pdf(data) -> RenderedPDF:
     encabezados = ["Producto", "Stock", "Rotación (Vendido)"]
     ancho_col = [60, 40, 60]
     filas = [[item["Producto"], item["Stock Disponible"], item["Cantidad Vendida (Rotación)"]] for item in data]
-    pdf.tabla_centrada(encabezados, filas, ancho_col)
-    if not os.path.exists("assets"):
-        os.makedirs("assets")
-    output_path = "stock_rotation_report.pdf"
-    pdf.output(os.path.join("assets", output_path))
-    return f"/{output_path}"
+    return _report_pdf("stock_rotation_report", "Reporte de Stock Disponible vs Rotación",
+                       encabezados, filas, ancho_col)
 
-def generate_top_products_pdf(data):
-    pdf = PDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 18)
-    pdf.cell(0, 10, EMPRESA, 0, 1, "C")
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 10, f"Top 5 Productos Más Vendidos ({MES_ACTUAL})", 0, 1, "C")
-    pdf.ln(6)
+def generate_top_products_pdf(data) -> RenderedPDF:
     encabezados = ["Producto", "Cantidad Vendida"]
     ancho_col = [80, 40]
     filas = [[item["Producto"], item["Cantidad Vendida"]] for item in data]
-    pdf.tabla_centrada(encabezados, filas, ancho_col)
-    if not os.path.exists("assets"):
-        os.makedirs("assets")
-    output_path = "top_products_report.pdf"
-    pdf.output(os.path.join("assets", output_path))
-    return f"/{output_path}"
+    return _report_pdf("top_products_report", "Top 5 Productos Más Vendidos",
+                       encabezados, filas, ancho_col)
 
-def generate_orders_per_day_pdf(data):
-    pdf = PDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 18)
-    pdf.cell(0, 10, EMPRESA, 0, 1, "C")
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 10, f"Cantidad de Pedidos por Día ({MES_ACTUAL})", 0, 1, "C")
-    pdf.ln(6)
+def generate_orders_per_day_pdf(data) -> RenderedPDF:
     encabezados = ["Fecha", "Pedidos"]
     ancho_col = [40, 40]
     filas = [[item["Fecha"], item["Pedidos"]] for item in data]
-    pdf.tabla_centrada(encabezados, filas, ancho_col)
-    if not os.path.exists("assets"):
-        os.makedirs("assets")
-    output_path = "orders_per_day_report.pdf"
-    pdf.output(os.path.join("assets", output_path))
-    return f"/{output_path}"
+    return _report_pdf("orders_per_day_report", "Cantidad de Pedidos por Día",
+                       encabezados, filas, ancho_col)
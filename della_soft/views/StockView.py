@@ -5,21 +5,24 @@ from typing import List
 # ─── Servicios ──────────────────────────────────────────────────────────
 from ..services.IngredientService      import select_all_ingredient_service
 from ..services.IngredientStockService import (
-    select_all_stock_service   as select_all_ing_stock_service,
+    select_stock_page_service  as select_ing_stock_page_service,
+    count_stock_service        as count_ing_stock_service,
     insert_ingredient_stock_service,
     update_ingredient_stock_service,
 )
-from ..services.ProductService         import select_all_product_service
+from ..services.ProductService         import select_all_product_service_async
 from ..services.ProductStockService    import (
-    select_all_stock_service   as select_all_prod_stock_service,
+    select_stock_page_service  as select_prod_stock_page_service,
+    count_stock_service        as count_prod_stock_service,
     insert_product_stock_service,
     update_product_stock_service,
 )
+from ..services.EventProfiler import profile_events
 from ..models.ProductModel             import ProductType
-from ..services.MeasureService         import select_name_by_id
 from ..repositories.LoginRepository import AuthState
 
 
+@profile_events
 class StockView(rx.State):
 
     @rx.event
@@ -44,8 +47,11 @@ class StockView(rx.State):
     product_rows:    list[dict] = []
     ingredient_rows: list[dict] = []
 
-    # paginación / búsqueda
-    offset = 0
+    # paginación (keyset) / búsqueda
+    page_cursor: str | None = None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    page_number = 1
     limit  = 5
     total_items = 0
     _page_data: list[dict] = []
@@ -74,25 +80,31 @@ class StockView(rx.State):
     @rx.event
     async def set_tab(self, tab: str):
         self.selected_tab = tab
-        self.offset = 0
+        self._first_page()
         await self.load_stock()
 
     @rx.event
     async def on_search(self, value: str):
         self.search_text = value or ""
-        self.offset = 0
+        self._first_page()
         await self.load_stock()
 
+    def _first_page(self):
+        self.page_cursor = None
+        self.page_number = 1
+
     @rx.event
     async def next_page(self):
-        if self.offset + self.limit < self.total_items:
-            self.offset += self.limit
+        if self.next_cursor:
+            self.page_cursor = self.next_cursor
+            self.page_number += 1
             await self.load_stock()
 
     @rx.event
     async def prev_page(self):
-        if self.offset > 0:
-            self.offset -= self.limit
+        if self.prev_cursor:
+            self.page_cursor = self.prev_cursor
+            self.page_number -= 1
             await self.load_stock()
 
     @rx.var
@@ -101,7 +113,15 @@ class StockView(rx.State):
 
     @rx.var
     def current_page(self) -> int:
-        return (self.offset//self.limit)+1
+        return self.page_number
+
+    @rx.var
+    def is_first_page(self) -> bool:
+        return self.prev_cursor is None
+
+    @rx.var
+    def is_last_page(self) -> bool:
+        return self.next_cursor is None
 
     @rx.var
     def page_rows(self) -> list[dict]:
@@ -110,59 +130,38 @@ class StockView(rx.State):
     # ------------------------------------------------------------------
         
     async def _product_rows(self, filtro: str) -> list[dict]:
-        stocks     = await select_all_prod_stock_service()
-        productos  = {p.id: p for p in select_all_product_service()}
-
+        page = await select_prod_stock_page_service(filtro, self.page_cursor, self.limit)
+        self.total_items = await count_prod_stock_service(filtro)
+        self.next_cursor, self.prev_cursor = page.next_cursor, page.prev_cursor
         return [
-            {
-                "stock_id":  ps.id,
-                "id":        prod.id,
-                "name":      prod.name,
-                "qty":       ps.quantity,
-                "min":       ps.min_quantity,
-                "color":     stock_color(ps.quantity, ps.min_quantity),
-            }
-            for ps in stocks
-            if (prod := productos.get(ps.product_id))               # existe el prod
-            if not filtro or filtro in prod.name.lower()            # pasa filtro
+            {**row, "color": stock_color(row["qty"], row["min"])}
+            for row in page.rows
         ]
 
     async def _ingredient_rows(self, filtro: str) -> list[dict]:
-        stocks      = await select_all_ing_stock_service()
-        ingredientes = {i.id: i for i in await select_all_ingredient_service()}
-
+        page = await select_ing_stock_page_service(filtro, self.page_cursor, self.limit)
+        self.total_items = await count_ing_stock_service(filtro)
+        self.next_cursor, self.prev_cursor = page.next_cursor, page.prev_cursor
         return [
-            {
-                "stock_id":  is_.id,
-                "id":        ing.id,
-                "name":      ing.name,
-                "qty":       is_.quantity,
-                "min":       is_.min_quantity,
-                "measure":   select_name_by_id(ing.measure_id),
-                "color":     stock_color(is_.quantity, is_.min_quantity),
-            }
-            for is_ in stocks
-            if (ing := ingredientes.get(is_.ingredient_id))         # existe ing
-            if not filtro or filtro in ing.name.lower()             # pasa filtro
+            {**row, "color": stock_color(row["qty"], row["min"])}
+            for row in page.rows
         ]
 
 # ---------------------------------- evento -----------------------------------
 
     @rx.event
     async def load_stock(self):
-        """Carga y filtra las filas de stock según la pestaña y la búsqueda."""
+        """Carga la página visible de stock según la pestaña y la búsqueda."""
         filtro = self.search_text.lower()
 
         if self.selected_tab == "product":
-            rows = self._product_rows(filtro)
+            rows = await self._product_rows(filtro)
             self.product_rows = rows
         else:
-            rows = self._ingredient_rows(filtro)
+            rows = await self._ingredient_rows(filtro)
             self.ingredient_rows = rows
 
-        # paginación
-        self.total_items = len(rows)
-        self._page_data  = rows[self.offset : self.offset + self.limit]    
+        self._page_data = rows
 
     # ═══════════════════════ MODAL ALTA ═══════════════════════════════
     @rx.event
@@ -176,7 +175,7 @@ class StockView(rx.State):
                 self.base_options.append(ing.name)
                 self._base_map[ing.name] = str(ing.id)
         else:
-            for p in await select_all_product_service():
+            for p in await select_all_product_service_async():
                 if p.product_type == ProductType.IN_STOCK:
                     self.base_options.append(p.name)
                     self._base_map[p.name] = str(p.id)
@@ -566,12 +565,12 @@ def pagination_controls():
     return rx.hstack(
         rx.button(rx.icon("arrow-left", size=22),
                   on_click=StockView.prev_page,
-                  is_disabled=StockView.offset <= 0,
+                  is_disabled=StockView.is_first_page,
                   background_color="#3E2723", size="2", variant="solid"),
         rx.text(StockView.current_page, " de ", StockView.num_total_pages),
         rx.button(rx.icon("arrow-right", size=22),
                   on_click=StockView.next_page,
-                  is_disabled=StockView.offset + StockView.limit >= StockView.total_items,
+                  is_disabled=StockView.is_last_page,
                   background_color="#3E2723", size="2", variant="solid"),
         justify="center", color="#3E2723",
     )
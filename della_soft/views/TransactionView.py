@@ -1,22 +1,37 @@
 # della_soft/views/TransactionView.py
 import reflex as rx
 from datetime import date
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from ..services.TransactionService import get_transactions_by_date_range_service
-from ..services.CustomerService import select_by_id_service   # para username
+from ..services.TransactionService import (
+    get_transactions_page_service,
+    get_transactions_summary_service,
+)
+from ..services.EventProfiler import profile_events
 
 OBS_TEXT="Observación"
 # ── columnas (sin “Acciones”) ────────────────────────────────────────────────
 TABLE_COLUMNS: List[str] = ["Usuario", OBS_TEXT, "Monto", "Fecha", "Estado"]
 
 
+def _table_row(tx: dict) -> Dict:
+    return {
+        "Usuario": tx["username"],
+        OBS_TEXT: tx["observation"] or "",
+        "Monto": tx["amount"],
+        "Fecha": tx["transaction_date"].strftime("%Y-%m-%d %H:%M")
+        if tx["transaction_date"]
+        else "",
+        "Estado": tx["status"],
+    }
+
+
+@profile_events
 class TransactionView(rx.State):
     """Estado de la pestaña Transacciones con filtros y paginación."""
 
     # datos
     transactions: List[Dict] = []          # ↳ solo la página visible
-    _all_rows: List[Dict] = []             # ↳ todas las filas filtradas
     total_amount: int = 0                  # suma global de Montos
 
     # filtros
@@ -24,8 +39,11 @@ class TransactionView(rx.State):
     end_date: str = date.today().isoformat()
     status_filter: str = "TODOS"
 
-    # paginación
-    offset: int = 0
+    # paginación (keyset: se guarda el cursor de la página, no un offset)
+    page_cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    page_number: int = 1
     limit: int = 5
     total_items: int = 0
 
@@ -48,20 +66,30 @@ class TransactionView(rx.State):
     # ── paginación ──────────────────────────────────────────────────────────
     @rx.event
     def next_page(self):
-        if self.offset + self.limit < self.total_items:
-            self.offset += self.limit
+        if self.next_cursor:
+            self.page_cursor = self.next_cursor
+            self.page_number += 1
             yield self.refresh_page()
 
     @rx.event
     def prev_page(self):
-        if self.offset > 0:
-            self.offset -= self.limit
+        if self.prev_cursor:
+            self.page_cursor = self.prev_cursor
+            self.page_number -= 1
             yield self.refresh_page()
 
+    def _status(self) -> str | None:
+        return None if self.status_filter == "TODOS" else self.status_filter
+
     @rx.event
     def refresh_page(self):
-        """Mueve solo la ventana visible; no vuelve a consultar la BD."""
-        self.transactions = self._all_rows[self.offset : self.offset + self.limit]
+        """Trae de la BD solo la página del cursor actual."""
+        page = get_transactions_page_service(
+            self.start_date, self.end_date, self.page_cursor, self.limit, status=self._status()
+        )
+        self.transactions = [_table_row(tx) for tx in page.rows]
+        self.next_cursor = page.next_cursor
+        self.prev_cursor = page.prev_cursor
         self.set()
 
     @rx.var
@@ -70,7 +98,15 @@ class TransactionView(rx.State):
 
     @rx.var
     def current_page(self) -> int:
-        return (self.offset // self.limit) + 1
+        return self.page_number
+
+    @rx.var
+    def is_first_page(self) -> bool:
+        return self.prev_cursor is None
+
+    @rx.var
+    def is_last_page(self) -> bool:
+        return self.next_cursor is None
 
     # ── carga de datos principal (incluye validaciones y total) ─────────────
     @rx.event
@@ -79,7 +115,8 @@ class TransactionView(rx.State):
         self.start_date = today
         self.end_date = today
         self.status_filter = "TODOS"
-        self.offset = 0
+        self.page_cursor = None
+        self.page_number = 1
         self.set()
 
     @rx.event
@@ -97,43 +134,14 @@ class TransactionView(rx.State):
             return
         # ────────────────────────────────────────────────────────────────────
 
-        txs = get_transactions_by_date_range_service(self.start_date, self.end_date)
-
-        all_rows: List[Dict] = []
-        total = 0
-        for tx in txs:
-            # filtro por estado
-            if self.status_filter != "TODOS" and tx.status != self.status_filter:
-                continue
-
-            # username
-            customer = select_by_id_service(tx.id_user)
-            username = (
-                f"{customer[0].username}"
-                if customer and getattr(customer[0], "username", None)
-                else str(tx.id_user)
-            )
-
-            # fila
-            row = {
-                "Usuario": username,
-                OBS_TEXT: tx.observation or "",
-                "Monto": tx.amount,
-                "Fecha": tx.transaction_date.strftime("%Y-%m-%d %H:%M")
-                if tx.transaction_date
-                else "",
-                "Estado": tx.status,
-            }
-            all_rows.append(row)
-            total += tx.amount
-
-        # guardamos todo
-        self._all_rows = all_rows
-        self.total_amount = total
-
-        # paginación
-        self.total_items = len(all_rows)
-        self.offset = 0  # reinicia a la primera página
+        # Cantidad y total en una consulta; las filas se piden por página
+        self.total_items, self.total_amount = get_transactions_summary_service(
+            self.start_date, self.end_date, status=self._status()
+        )
+
+        # paginación: reinicia a la primera página
+        self.page_cursor = None
+        self.page_number = 1
         yield self.refresh_page()
 
 
@@ -229,7 +237,7 @@ def _pagination_controls() -> rx.Component:
         rx.button(
             rx.icon("arrow-left", size=22),
             on_click=TransactionView.prev_page,
-            is_disabled=TransactionView.offset <= 0,
+            is_disabled=TransactionView.is_first_page,
             background_color="#3E2723",
             size="2",
             variant="solid",
@@ -243,8 +251,7 @@ def _pagination_controls() -> rx.Component:
         rx.button(
             rx.icon("arrow-right", size=22),
             on_click=TransactionView.next_page,
-            is_disabled=TransactionView.offset + TransactionView.limit
-            >= TransactionView.total_items,
+            is_disabled=TransactionView.is_last_page,
             background_color="#3E2723",
             size="2",
             variant="solid",
@@ -7,8 +7,8 @@ from typing import Any, List, Dict
 
 from ..models.CustomerModel import Customer
 from ..services.CustomerService import (
-    delete_customer_service, create_user_service, select_all_users_service,
-    select_users_by_parameter_service, update_user_service
+    delete_customer_service, create_user_service, select_all_users_service_async,
+    select_users_by_parameter_service_async, update_user_service
 )
 from ..services.RolService import select_all_roles_service
 from ..services.SystemService import hash_password
@@ -93,7 +93,7 @@ class UserView(rx.State):
         self.set()
 
     async def load_customers(self):
-        self.customers = select_all_users_service()
+        self.customers = await select_all_users_service_async()
         self.total_items = len(self.customers)
         self.customers = self.customers[self.offset : self.offset + self.limit]
         self.set()
@@ -117,7 +117,7 @@ class UserView(rx.State):
         return (self.offset // self.limit) + 1
 
     async def get_customer_by_parameter(self):
-        self.customers = await select_users_by_parameter_service(self.customer_search)
+        self.customers = await select_users_by_parameter_service_async(self.customer_search)
         self.total_items = len(self.customers)
         self.offset = 0
         self.customers = self.customers[self.offset : self.offset + self.limit]
@@ -0,0 +1,50 @@
+# tests/conftest.py
+from datetime import date
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.scripts.seed_data import SeedSizes, seed
+from della_soft.services.TTLCache import clear_all_caches
+
+
+@pytest.fixture(autouse=True)
+def _clear_service_caches():
+    """Cada test arranca con las cachés de datos de referencia vacías."""
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """
+    SQLite temporal como base de la app (DB_URL, ENV=dev). El engine se
+    crea (con las tablas) la primera vez que se pide y se descarta al
+    terminar; devuelve la ruta del archivo.
+    """
+    path = tmp_path / "test.db"
+    monkeypatch.setenv("DB_URL", f"sqlite:///{path}")
+    monkeypatch.setenv("ENV", "dev")
+    db.dispose_engine()
+    yield path
+    db.dispose_engine()
+
+
+@pytest.fixture
+def seed_sizes() -> SeedSizes:
+    """Volúmenes de `seeded_db`; un módulo lo redefine o lo parametriza."""
+    return SeedSizes(customers=30, products=8, orders=40, lines=100, transactions=100, days=5,
+                     ingredients=6, invoices=5)
+
+
+@pytest.fixture
+def seed_value() -> int:
+    return 1
+
+
+@pytest.fixture
+def seeded_db(sqlite_db, seed_sizes, seed_value) -> dict:
+    """`sqlite_db` cargado con seed_data; devuelve las filas por tabla."""
+    db.get_engine()
+    return seed(seed_sizes, seed=seed_value, today=date.today())
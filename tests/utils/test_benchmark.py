@@ -0,0 +1,131 @@
+# tests/utils/test_benchmark.py
+"""
+Tests para scripts/seed_data.py y scripts/benchmark.py
+------------------------------------------------------
+Se siembra un SQLite temporal con volúmenes chicos (misma semilla → mismos
+datos) y se corre el benchmark completo; la factura se revierte y no
+escribe archivos.
+"""
+
+import json
+from datetime import date
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+import della_soft.views.GenerateInvoicePDF as gen
+from della_soft.models import (
+    Invoice, Order, POS, ProductOrder, ProductStock, Product, Recipe, Stamped, Transaction,
+)
+from della_soft.scripts import benchmark
+from della_soft.scripts.seed_data import SeedSizes, seed
+from sqlmodel import Session, func, select
+
+SMALL = SeedSizes(customers=30, products=8, orders=120, lines=300, transactions=400, days=20,
+                  ingredients=12, invoices=25)
+
+
+@pytest.fixture
+def seed_sizes():
+    return SMALL
+
+
+def test_seed_is_consistent(seeded_db):
+    assert seeded_db["order"] == 120
+    assert seeded_db["product_order"] == 300
+    assert seeded_db["transaction"] == 400
+
+    with Session(db.get_engine()) as session:
+        # el total de cada pedido es la suma de sus líneas
+        line_totals = dict(session.exec(
+            select(ProductOrder.id_order, func.sum(ProductOrder.quantity * Product.price))
+            .join(Product, Product.id == ProductOrder.id_product)
+            .group_by(ProductOrder.id_order)
+        ).all())
+        orders = session.exec(select(Order)).all()
+        for order in orders:
+            assert order.total_order == line_totals[order.id]
+        # lo pagado sale de las transacciones: pagos menos reversos
+        paid = dict(session.exec(
+            select(Transaction.id_order, func.sum(Transaction.amount))
+            .where(Transaction.id_order.is_not(None))
+            .group_by(Transaction.id_order)
+        ).all())
+        assert {o.id: o.total_paid for o in orders} == {o.id: paid.get(o.id, 0) for o in orders}
+        assert all(0 <= o.total_paid <= o.total_order for o in orders)
+        assert session.exec(select(func.count(Transaction.id)).where(Transaction.status == "REVERSO")).one() > 0
+        # saldo final de cada caja = inicial + sus transacciones
+        movements = dict(session.exec(
+            select(Transaction.id_POS, func.sum(Transaction.amount)).group_by(Transaction.id_POS)
+        ).all())
+        for pos in session.exec(select(POS)).all():
+            assert pos.final_amount == pos.initial_amount + movements.get(pos.id, 0)
+        # stock solo para productos de precio fijo
+        stock_types = session.exec(
+            select(Product.product_type).join(ProductStock, ProductStock.product_id == Product.id)
+        ).all()
+        assert {t.name for t in stock_types} == {"IN_STOCK"}
+        # una receta por producto y facturas con la numeración del timbrado
+        assert session.exec(select(func.count(Recipe.id))).one() == 8
+        stamped = session.exec(select(Stamped)).one()
+        numbers = session.exec(select(Invoice.nro_factura).order_by(Invoice.id)).all()
+        assert stamped.current_sequence == len(numbers) == 25
+        assert numbers[-1] == "001-001-000025"
+
+
+def test_seed_is_deterministic(tmp_path, monkeypatch):
+    def _orders(name):
+        monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / name}")
+        db.dispose_engine()
+        db.get_engine()
+        seed(SMALL, seed=7, today=date(2025, 6, 19))
+        with Session(db.get_engine()) as session:
+            rows = session.exec(select(Order.id, Order.total_order, Order.order_date)).all()
+        db.dispose_engine()
+        return rows
+
+    monkeypatch.setenv("ENV", "dev")
+    assert _orders("a.db") == _orders("b.db")
+
+
+def _invoice_state():
+    with Session(db.get_engine()) as session:
+        return (session.exec(select(Stamped.current_sequence)).one(),
+                session.exec(select(func.count(Invoice.id))).one())
+
+
+def test_benchmark_writes_comparable_json(seeded_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(gen, "INVOICE_DIR", str(tmp_path / "facturas"))
+    out = tmp_path / "bench.json"
+    before = _invoice_state()
+    assert benchmark.main(["--salida", str(out), "--repeticiones", "2"]) == 0
+
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert result["meta"]["volumes"]["order"] == 120
+    assert {"orders.list", "pos.load_date", "transactions.load_month", "stock.list",
+            "invoice.generate"} <= set(result["results"])
+    assert result["results"]["pos.load_date"]["queries"] == 2   # caja del día y pedidos
+    # la factura del benchmark no consume números ni deja Invoice ni PDF
+    assert _invoice_state() == before
+    assert not (tmp_path / "facturas").exists()
+
+
+def test_compare_flags_regressions():
+    before = {"results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+    after = {"results": {"a": {"median_ms": 13.0}, "b": {"median_ms": 10.5}, "c": {"median_ms": 1.0}}}
+
+    regressions = benchmark.compare(before, after, tolerance=0.2)
+
+    assert [r["case"] for r in regressions] == ["a"]
+    assert regressions[0]["change"] == pytest.approx(0.3)
+
+
+@pytest.mark.parametrize("seed_sizes", [
+    SeedSizes(customers=20, products=4, orders=50, lines=60, transactions=10, days=3,
+              ingredients=2, invoices=0),
+])
+def test_seed_leaves_orders_unpaid_when_transactions_run_out(seeded_db):
+    with Session(db.get_engine()) as session:
+        payments = session.exec(select(func.count(Transaction.id)).where(Transaction.status == "PAGO")).one()
+        paid_orders = session.exec(select(func.count(Order.id)).where(Order.total_paid > 0)).one()
+    assert payments == paid_orders == 10
@@ -0,0 +1,94 @@
+# tests/utils/test_connect_db.py
+"""
+Tests para repositories/ConnectDB.py
+------------------------------------
+Se usa un SQLite temporal (DB_URL) para comprobar que el engine es único
+por proceso y que el pool reutiliza la conexión entre llamadas.
+"""
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Rol
+from sqlmodel import Session, select
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_db):
+    db.reset_engine_stats()
+
+
+# ------------------------------------------------------------------
+# get_engine – un solo engine aunque se pida muchas veces
+# ------------------------------------------------------------------
+def test_engine_is_shared(sqlite_engine):
+    first = db.get_engine()
+    for _ in range(10):
+        assert db.get_engine() is first
+        assert db.connect() is first
+
+    assert db.engine_stats()["engines_created"] == 1
+
+
+# ------------------------------------------------------------------
+# El pool reutiliza la conexión entre sesiones consecutivas
+# ------------------------------------------------------------------
+def test_connections_are_pooled(sqlite_engine):
+    for _ in range(20):
+        with Session(db.get_engine()) as session:
+            session.exec(select(Rol)).all()
+
+    stats = db.engine_stats()
+    assert stats["engines_created"] == 1
+    assert stats["connections_created"] == 1
+    assert stats["checkouts"] >= 20
+
+
+# ------------------------------------------------------------------
+# get_pool_options – lee la configuración del entorno
+# ------------------------------------------------------------------
+def test_pool_options_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    opts = db.get_pool_options()
+    assert opts["pool_size"] == 12
+    assert opts["max_overflow"] == 3
+    assert opts["pool_recycle"] == 600
+    assert opts["pool_pre_ping"] is False
+
+
+def test_missing_credentials_raise(monkeypatch):
+    monkeypatch.delenv("DB_URL", raising=False)
+    monkeypatch.delenv("DB_USER", raising=False)
+    monkeypatch.delenv("DB_PASSWORD", raising=False)
+    with pytest.raises(RuntimeError):
+        db.get_database_url()
+
+
+# ------------------------------------------------------------------
+# get_async_database_url – mismo destino con driver async
+# ------------------------------------------------------------------
+def test_async_url_uses_async_driver(monkeypatch):
+    monkeypatch.delenv("ASYNC_DB_URL", raising=False)
+    monkeypatch.setenv("DB_URL", "postgresql://u:p@db:5432/DellaSoft")
+    assert db.get_async_database_url() == "postgresql+asyncpg://u:p@db:5432/DellaSoft"
+
+    monkeypatch.setenv("DB_URL", "sqlite:///tmp/x.db")
+    assert db.get_async_database_url() == "sqlite+aiosqlite:///tmp/x.db"
+
+
+# ------------------------------------------------------------------
+# init_db – create_all una sola vez aunque el primer arranque cree el engine
+# ------------------------------------------------------------------
+def test_init_db_creates_schema_once(sqlite_engine, monkeypatch):
+    calls = []
+    monkeypatch.setattr(db.SQLModel.metadata, "create_all", lambda engine: calls.append(engine))
+
+    db.init_db()          # arranque: todavía no hay engine
+    db.init_db()
+    db.get_engine()
+
+    assert calls == [db.get_engine()]
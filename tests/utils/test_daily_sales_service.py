@@ -0,0 +1,96 @@
+# tests/utils/test_daily_sales_service.py
+"""
+Tests para el resumen diario daily_product_sales
+-----------------------------------------------
+SQLite temporal (DB_URL): se cargan líneas de pedido por los services y
+se compara el resumen incremental con una reconstrucción completa.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Customer, DailyProductSales, Order, Product, ProductOrder, Rol
+from della_soft.models.ProductModel import ProductType
+from della_soft.services.DailySalesService import rebuild_daily_sales_service
+from della_soft.services.ProductOrderService import (
+    insert_product_order_service,
+    update_product_orders,
+)
+from della_soft.scripts.rebuild_daily_sales import main as rebuild_main
+from sqlmodel import Session, select
+
+
+@pytest.fixture
+def sales_db(sqlite_db):
+    with Session(db.get_engine()) as session:
+        session.add(Rol(id_rol=1, description="Admin"))
+        session.add(Customer(id=1, first_name="A", last_name="B", contact="0", id_rol=1))
+        session.add(Product(id=1, name="Torta", product_type=ProductType.IN_STOCK, price=100))
+        session.add(Product(id=2, name="Alfajor", product_type=ProductType.IN_STOCK, price=10))
+        for oid, day in ((1, 10), (2, 10), (3, 11)):
+            session.add(Order(id=oid, total_order=0, total_paid=0, id_customer=1,
+                              order_date=datetime(2025, 5, day, 9 + oid)))
+        session.commit()
+
+
+def _rollup() -> dict:
+    with Session(db.get_engine()) as session:
+        rows = session.exec(select(DailyProductSales)).all()
+        return {
+            (str(r.sales_date), r.id_product): (r.quantity, r.revenue, r.order_count)
+            for r in rows
+        }
+
+
+def test_incremental_refresh_matches_rebuild(sales_db):
+    insert_product_order_service(ProductOrder(id=None, quantity=2, id_product=1, id_order=1))
+    insert_product_order_service(ProductOrder(id=None, quantity=1, id_product=1, id_order=2))
+    insert_product_order_service(ProductOrder(id=None, quantity=5, id_product=2, id_order=3))
+
+    incremental = _rollup()
+    assert incremental[("2025-05-10", 1)] == (3, 300, 2)
+    assert incremental[("2025-05-11", 2)] == (5, 50, 1)
+
+    # editar las líneas del pedido 1 recalcula solo su día
+    update_product_orders(1, [ProductOrder(id=None, quantity=4, id_product=2, id_order=1)])
+    incremental = _rollup()
+    assert incremental[("2025-05-10", 1)] == (1, 100, 1)
+    assert incremental[("2025-05-10", 2)] == (4, 40, 1)
+
+    assert rebuild_daily_sales_service() == len(incremental)
+    assert _rollup() == incremental
+
+
+def test_rebuild_command_date_window(sales_db):
+    insert_product_order_service(ProductOrder(id=None, quantity=2, id_product=1, id_order=1))
+    insert_product_order_service(ProductOrder(id=None, quantity=5, id_product=2, id_order=3))
+    with Session(db.get_engine()) as session:
+        for row in session.exec(select(DailyProductSales)).all():
+            session.delete(row)
+        session.commit()
+
+    assert rebuild_main(["--desde", "2025-05-11", "--hasta", "2025-05-11"]) == 0
+    assert list(_rollup()) == [("2025-05-11", 2)]
+    # volver a reconstruir la misma ventana regenera la única fila del día
+    assert rebuild_daily_sales_service(date(2025, 5, 11), date(2025, 5, 11)) == 1
+    assert list(_rollup()) == [("2025-05-11", 2)]
+
+
+def test_refresh_updates_rows_in_place_and_drops_stale(sales_db):
+    insert_product_order_service(ProductOrder(id=None, quantity=2, id_product=1, id_order=1))
+    insert_product_order_service(ProductOrder(id=None, quantity=1, id_product=2, id_order=1))
+    with Session(db.get_engine()) as session:
+        torta_id = session.exec(select(DailyProductSales.id).where(DailyProductSales.id_product == 1)).one()
+
+    # el upsert actualiza la fila existente (no la borra y la vuelve a crear)
+    insert_product_order_service(ProductOrder(id=None, quantity=3, id_product=1, id_order=2))
+    with Session(db.get_engine()) as session:
+        row = session.get(DailyProductSales, torta_id)
+        assert (row.quantity, row.order_count) == (5, 2)
+
+    # el producto 2 ya no tiene líneas ese día: su fila desaparece
+    update_product_orders(1, [ProductOrder(id=None, quantity=2, id_product=1, id_order=1)])
+    assert _rollup() == {("2025-05-10", 1): (5, 500, 2)}
+
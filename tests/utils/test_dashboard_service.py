@@ -7,12 +7,18 @@ Tests for della_soft.services.DashboardService
 """
 from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from types import SimpleNamespace as NS
 
 import pytest
 
 import della_soft.services.DashboardService as ds
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Customer, Order, Product, ProductOrder, ProductStock, Rol
+from della_soft.models.ProductModel import ProductType
+from della_soft.repositories.DailySalesRepository import rebuild as rebuild_daily_sales
+from sqlalchemy import insert
+from sqlmodel import Session
 
 
 # ------------------------------------------------------------------
@@ -42,6 +48,7 @@ def _patch_today(monkeypatch):
 @pytest.mark.anyio
 async def test_stock_rotation(monkeypatch):
     _patch_today(monkeypatch)
+    monkeypatch.setattr(ds, "DASHBOARD_MODE", "python")   # stubs en memoria
 
     prods   = [NS(id=1, name="Café"), NS(id=2, name="Té")]
     stocks  = [NS(product_id=1, quantity=20), NS(product_id=2, quantity=5)]
@@ -81,6 +88,7 @@ async def test_stock_rotation(monkeypatch):
 @pytest.mark.anyio
 async def test_top_products(monkeypatch):
     _patch_today(monkeypatch)
+    monkeypatch.setattr(ds, "DASHBOARD_MODE", "python")   # stubs en memoria
 
     prods = [NS(id=i, name=f"P{i}") for i in range(1, 6)]
     porders = [
@@ -130,10 +138,15 @@ async def test_orders_per_day(monkeypatch):
         make_order(4, 14),  # 15/05
     ]
 
-    async def _fake_orders():
-        return orders
+    # La BD agrupa por día dentro del rango pedido
+    def _fake_per_day(start, end):
+        assert (start.date(), end.date()) == (date(2025, 5, 1), date(2025, 6, 1))
+        counts = {}
+        for o in orders:
+            counts[o.order_date] = counts.get(o.order_date, 0) + 1
+        return sorted(counts.items())
 
-    monkeypatch.setattr(ds, "select_all_orders", _fake_orders)
+    monkeypatch.setattr(ds, "select_orders_per_day", _fake_per_day)
 
     per_day = await ds.get_orders_per_day_month()
     dic = {row["Fecha"]: row["Pedidos"] for row in per_day}
@@ -143,3 +156,117 @@ async def test_orders_per_day(monkeypatch):
     assert dic["15/05"] == 1
     # Día sin pedidos debe reportar 0
     assert dic["10/05"] == 0
+    assert len(per_day) == 31
+
+
+def test_dashboard_range_week_and_custom():
+    hoy = date(2025, 5, 15)   # jueves
+    start, end = ds.dashboard_range(ds.RANGE_WEEK, today=hoy)
+    assert (start.date(), end.date()) == (date(2025, 5, 12), date(2025, 5, 19))
+
+    start, end = ds.dashboard_range(ds.RANGE_CUSTOM, date(2025, 4, 28), date(2025, 5, 2))
+    assert (start.date(), end.date()) == (date(2025, 4, 28), date(2025, 5, 3))
+
+    with pytest.raises(ValueError):
+        ds.dashboard_range(ds.RANGE_CUSTOM, date(2025, 5, 2), date(2025, 4, 28))
+
+
+# ------------------------------------------------------------------
+# Modo "python": agregación con índices en memoria
+# ------------------------------------------------------------------
+MAYO = ds._month_bounds(date(2025, 5, 15))
+
+
+def test_month_bounds_december():
+    start, end = ds._month_bounds(date(2024, 12, 31))
+    assert (start.date(), end.date()) == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+def test_indexed_metrics():
+    prods   = [NS(id=1, name="Café"), NS(id=2, name="Té"), NS(id=3, name="Mate")]
+    stocks  = [NS(product_id=1, quantity=20), NS(product_id=1, quantity=99)]
+    orders  = [NS(id=1, order_date=date(2025, 5, 31)),
+               NS(id=2, order_date=date(2025, 6, 1)),
+               NS(id=3, order_date=None)]
+    porders = [NS(id_product=1, id_order=1, quantity=2),
+               NS(id_product=2, id_order=1, quantity=5),
+               NS(id_product=2, id_order=2, quantity=9),
+               NS(id_product=3, id_order=3, quantity=4)]
+
+    rot = ds.stock_rotation_indexed(prods, stocks, porders, orders, *MAYO)
+    assert [(r["Stock Disponible"], r["Cantidad Vendida (Rotación)"]) for r in rot] == [
+        (20, 2), (0, 5), (0, 0)
+    ]
+
+    top = ds.top_products_indexed(prods, porders, orders, *MAYO, limit=2)
+    assert [r["Producto"] for r in top] == ["Té", "Café"]
+
+
+# ------------------------------------------------------------------
+# SQL agrupado, resumen diario e índices dan lo mismo con 100k líneas
+# (los tiempos se miden en scripts/benchmark.py)
+# ------------------------------------------------------------------
+N_PRODUCTS = 200
+N_ORDERS = 10_000
+
+
+def _synthetic(n_lines: int):
+    prods = [NS(id=i, name=f"P{i}") for i in range(1, N_PRODUCTS + 1)]
+    stocks = [NS(product_id=i, quantity=i % 50) for i in range(1, N_PRODUCTS + 1)]
+    orders = [NS(id=i, order_date=datetime(2025, 4 + i % 2, 1 + i % 28, 10))
+              for i in range(1, N_ORDERS + 1)]
+    porders = [NS(id=i, id_product=1 + (i * 7) % N_PRODUCTS,
+                  id_order=1 + i % N_ORDERS, quantity=1 + i % 3)
+               for i in range(n_lines)]
+    return prods, stocks, porders, orders
+
+
+@pytest.fixture
+def sqlite_dashboard(sqlite_db):
+    prods, stocks, porders, orders = _synthetic(100_000)
+    with Session(db.get_engine()) as session:
+        session.execute(insert(Rol), [{"id_rol": 1, "description": "Admin"}])
+        session.execute(insert(Customer), [{"id": 1, "first_name": "A", "last_name": "B",
+                                            "contact": "0", "id_rol": 1}])
+        session.execute(insert(Product), [
+            {"id": p.id, "name": p.name, "product_type": ProductType.IN_STOCK, "price": 10}
+            for p in prods
+        ])
+        session.execute(insert(ProductStock), [
+            {"product_id": s.product_id, "quantity": s.quantity, "min_quantity": 0}
+            for s in stocks
+        ])
+        session.execute(insert(Order), [
+            {"id": o.id, "order_date": o.order_date, "total_order": 0, "total_paid": 0,
+             "id_customer": 1}
+            for o in orders
+        ])
+        session.execute(insert(ProductOrder), [
+            {"id": po.id + 1, "id_product": po.id_product, "id_order": po.id_order,
+             "quantity": po.quantity}
+            for po in porders
+        ])
+        session.commit()
+    return prods, stocks, porders, orders
+
+
+@pytest.mark.anyio
+async def test_sql_matches_indexed_100k_lines(monkeypatch, sqlite_dashboard):
+    _patch_today(monkeypatch)
+    prods, stocks, porders, orders = sqlite_dashboard
+
+    rot_sql = await ds.get_stock_rotation_data_month(mode="sql")
+    top_sql = await ds.get_top_products_month(mode="sql")
+
+    assert rot_sql == ds.stock_rotation_indexed(prods, stocks, porders, orders, *MAYO)
+    assert top_sql == ds.top_products_indexed(prods, porders, orders, *MAYO)
+
+    # el resumen diario reconstruido da lo mismo que el cálculo sobre los pedidos
+    rebuild_daily_sales()
+    assert await ds.get_stock_rotation_data_month(mode="rollup") == rot_sql
+    assert await ds.get_top_products_month(mode="rollup") == top_sql
+
+    per_day = await ds.get_orders_per_day_month()
+    esperado = sum(1 for o in orders if o.order_date.month == 5)
+    assert sum(r["Pedidos"] for r in per_day) == esperado
+    assert per_day[0]["Fecha"] == "01/05" and per_day[-1]["Fecha"] == "31/05"
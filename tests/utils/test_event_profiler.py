@@ -0,0 +1,102 @@
+# tests/utils/test_event_profiler.py
+"""
+Tests para services/EventProfiler.py
+------------------------------------
+Se simulan eventos de Reflex (nombre + actualizaciones) sobre los
+middlewares y se consulta el endpoint JSON con el TestClient de Starlette.
+"""
+
+from types import SimpleNamespace as NS
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import della_soft.repositories.QueryStats as qs
+import della_soft.services.EventProfiler as prof
+
+
+class _FakeState:
+    @classmethod
+    def get_full_name(cls):
+        return "reflex___state____state.della_soft___views___pos_view___pos_view"
+
+
+EVENT = NS(name=f"{_FakeState.get_full_name()}.process_payment")
+
+
+@pytest.fixture(autouse=True)
+def clean_profile():
+    prof.profile_events(_FakeState)
+    prof.reset_profile()
+    qs.reset_query_stats()
+    yield
+    prof.reset_profile()
+    qs.reset_query_stats()
+
+
+def test_histogram_percentiles():
+    h = prof.Histogram(size=1000)
+    for value in range(1, 101):
+        h.add(value)
+
+    assert (h.percentile(50), h.percentile(95), h.percentile(99)) == (50, 95, 99)
+    assert h.summary()["max"] == 100
+
+
+def test_histogram_keeps_last_window():
+    h = prof.Histogram(size=10)
+    for value in range(100):
+        h.add(value)
+
+    assert h.count == 100
+    assert h.percentile(50) == 94     # solo las últimas 10 muestras (90..99)
+
+
+async def _run_event(event, deltas, db_time=0.0):
+    profiler, stats = prof.EventProfilerMiddleware(), qs.QueryStatsMiddleware()
+    await profiler.preprocess(None, None, event)
+    await stats.preprocess(None, None, event)
+    if db_time:
+        qs.current_scope().record("SELECT 1", db_time)
+    for i, delta in enumerate(deltas):
+        update = NS(delta=delta, final=i == len(deltas) - 1)
+        await profiler.postprocess(None, None, event, update)
+        await stats.postprocess(None, None, event, update)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_middleware_records_wall_db_and_delta():
+    delta = {"pos_view": {"is_open": True}}
+    await _run_event(EVENT, [delta, delta], db_time=0.004)
+
+    report = prof.profile_report()["pos_view.process_payment"]
+    assert report["count"] == 1
+    assert report["db_ms"]["p50"] == pytest.approx(4.0)
+    assert report["wall_ms"]["p50"] >= 0
+    assert report["delta_bytes"]["p50"] == 2 * len('{"pos_view": {"is_open": true}}')
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_unprofiled_states_are_ignored():
+    await _run_event(NS(name="reflex___state____state.otro___otro.cargar"), [{}])
+    assert prof.profile_report() == {}
+
+
+def test_endpoint_percentiles(monkeypatch):
+    for ms in (10, 20, 30):
+        prof.record_event("pos_view.load_date", ms, 1, 100)
+    client = TestClient(Starlette(routes=[Route("/admin/event-stats", prof.profile_endpoint)]))
+
+    monkeypatch.setenv("ENV", "dev")
+    body = client.get("/admin/event-stats").json()
+    assert body["handlers"]["pos_view.load_date"]["wall_ms"]["p50"] == 20
+
+    monkeypatch.setenv("ENV", "prod")
+    monkeypatch.setenv("PROFILE_TOKEN", "secreto")
+    assert client.get("/admin/event-stats").status_code == 404
+    ok = client.get("/admin/event-stats", headers={"X-Profile-Token": "secreto"})
+    assert ok.status_code == 200
@@ -0,0 +1,143 @@
+# tests/utils/test_invoice_batch.py
+"""
+Tests para services/InvoiceBatchService.py
+------------------------------------------
+SQLite temporal sembrado: se facturan todos los pedidos pagados sin
+Invoice y se verifica la numeración contigua, los hashes y que la
+cantidad de consultas no crece con la cantidad de pedidos.
+"""
+
+from hashlib import sha256
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+import della_soft.services.InvoiceBatchService as batch
+import della_soft.views.GenerateInvoicePDF as gen
+from della_soft.models import Invoice, Order, Stamped
+from della_soft.repositories.QueryStats import track_queries
+from della_soft.scripts.seed_data import SeedSizes
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, func, select
+
+
+@pytest.fixture
+def seed_sizes():
+    return SeedSizes(customers=30, products=8, orders=60, lines=150, transactions=60, days=5,
+                     ingredients=4, invoices=5)
+
+
+@pytest.fixture
+def seed_value():
+    return 2
+
+
+@pytest.fixture(autouse=True)
+def invoice_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(gen, "INVOICE_DIR", str(tmp_path / "facturas"))
+
+
+def _uninvoiced_paid() -> int:
+    with Session(db.get_engine()) as session:
+        invoiced = select(Invoice.id_order)
+        return session.exec(
+            select(func.count(Order.id))
+            .where(Order.total_paid >= Order.total_order, Order.id.not_in(invoiced))
+        ).one()
+
+
+def test_batch_invoices_every_paid_order(seeded_db):
+    pending = _uninvoiced_paid()
+    assert pending > 0
+    seen = []
+
+    with track_queries("batch") as scope:
+        result = batch.invoice_paid_orders(workers=0, progress=lambda done, total: seen.append((done, total)))
+
+    assert (result.invoiced, result.rendered, result.failed) == (pending, pending, {})
+    assert seen[-1] == (pending, pending)
+    assert scope.queries <= 10                 # no depende de la cantidad de pedidos
+    assert _uninvoiced_paid() == 0
+
+    with Session(db.get_engine()) as session:
+        new = session.exec(select(Invoice).where(Invoice.id > 5).order_by(Invoice.id)).all()
+        stamped = session.exec(select(Stamped)).one()
+    numbers = [int(inv.nro_factura.rsplit("-", 1)[1]) for inv in new]
+    assert numbers == list(range(6, 6 + pending))          # bloque contiguo tras los 5 sembrados
+    assert stamped.current_sequence == 5 + pending
+    assert (result.first_number, result.last_number) == (new[0].nro_factura, new[-1].nro_factura)
+    for inv in new:
+        with open(gen.invoice_pdf_path(inv.id), "rb") as fh:
+            assert sha256(fh.read()).hexdigest() == inv.pdf_hash
+
+    assert batch.invoice_paid_orders(workers=0).invoiced == 0
+
+
+def test_eligible_orders_are_locked_skipping_busy_ones(monkeypatch):
+    captured = []
+
+    class _Session:
+        def exec(self, stmt):
+            captured.append(stmt)
+            return type("R", (), {"all": lambda self: []})()
+
+    batch._eligible_orders(_Session(), None)
+
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert sql.endswith('FOR UPDATE OF "order" SKIP LOCKED')
+
+
+def test_duplicate_invoice_rolls_back_batch_without_consuming_numbers(seeded_db, monkeypatch):
+    with Session(db.get_engine()) as session:
+        stamped = session.exec(select(Stamped)).one()
+        first = session.exec(
+            select(Order.id)
+            .where(Order.total_paid >= Order.total_order, Order.id.not_in(select(Invoice.id_order)))
+            .order_by(Order.id)
+        ).first()
+    pending = _uninvoiced_paid()
+    real = batch.reserve_invoice_numbers
+
+    def _other_process_wins(count, *, session=None):
+        # Otro proceso factura el primer pedido después de la búsqueda del lote
+        with Session(db.get_engine()) as other:
+            other.add(Invoice(iva=0, id_order=first, id_stamped=stamped.id, nro_factura="manual"))
+            other.commit()
+        return real(count, session=session)
+
+    monkeypatch.setattr(batch, "reserve_invoice_numbers", _other_process_wins)
+    with pytest.raises(IntegrityError):
+        batch.invoice_paid_orders(workers=0)
+
+    assert _uninvoiced_paid() == pending - 1
+    with Session(db.get_engine()) as session:
+        assert session.exec(select(Stamped.current_sequence)).one() == stamped.current_sequence
+
+
+def test_batch_renders_in_process_pool(seeded_db):
+    result = batch.invoice_paid_orders(workers=1)
+    assert result.rendered == result.invoiced > 0
+
+
+def test_failed_render_keeps_invoice_and_regenerates_later(seeded_db, monkeypatch):
+    real = batch.render_invoice_pdfs
+
+    def _first_fails(datas):
+        outcomes = real(datas)
+        outcomes[0] = RuntimeError("sin memoria")
+        return outcomes
+
+    monkeypatch.setattr(batch, "render_invoice_pdfs", _first_fails)
+    result = batch.invoice_paid_orders(workers=0)
+
+    (invoice_id, error), = result.failed.items()
+    assert error == "sin memoria"
+    assert result.rendered == result.invoiced - 1
+
+    with Session(db.get_engine()) as session:
+        invoice = session.get(Invoice, invoice_id)
+        sequence = session.exec(select(Stamped.current_sequence)).one()
+    assert gen.generate_invoice_pdf(invoice.id_order) == gen.invoice_pdf_path(invoice_id)
+    with Session(db.get_engine()) as session:
+        assert session.exec(select(Stamped.current_sequence)).one() == sequence
@@ -0,0 +1,178 @@
+# tests/utils/test_invoice_jobs.py
+"""
+Tests para services/InvoiceJobService.py y views/InvoiceRender.py
+-----------------------------------------------------------------
+La generación completa se prueba contra un SQLite sembrado, con el pool de
+procesos real; el encolado y los errores, con el paso de datos simulado.
+"""
+
+import threading
+from datetime import datetime
+from hashlib import sha256
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+import della_soft.services.InvoiceJobService as jobs
+import della_soft.views.GenerateInvoicePDF as gen
+from della_soft.models import Invoice, Stamped
+from della_soft.repositories.QueryStats import track_queries
+from della_soft.scripts.seed_data import SeedSizes
+from della_soft.views.InvoiceRender import InvoiceData, render_invoice_pdf
+from sqlmodel import Session, select
+
+DATA = InvoiceData(
+    invoice_id=1, nro_factura="001-001-000001", timbrado="12345678", fecha_emision="19/06/2025",
+    cliente="Ana Pérez", cliente_ruc="1234567-8", total=55000, iva=5000.0,
+    productos=[{"nombre": "Torta", "cantidad": 1, "precio_unitario": 55000, "subtotal": 55000}],
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(gen, "INVOICE_DIR", str(tmp_path / "facturas"))
+    jobs.reset_invoice_jobs()
+    yield
+    jobs.shutdown_invoice_jobs()
+    jobs.reset_invoice_jobs()
+
+
+@pytest.fixture
+def seed_sizes():
+    return SeedSizes(customers=20, products=6, orders=10, lines=20, transactions=10, days=3,
+                     ingredients=4, invoices=0)
+
+
+def test_render_is_pure():
+    pdf = render_invoice_pdf(DATA)
+    assert pdf.startswith(b"%PDF")
+    assert render_invoice_pdf(DATA) == pdf     # determinista: mismo hash al regenerar
+
+
+def _sequence() -> int:
+    with Session(db.get_engine()) as session:
+        return session.exec(select(Stamped.current_sequence)).one()
+
+
+def test_reissue_serves_stored_file(seeded_db, monkeypatch):
+    path = gen.generate_invoice_pdf(3)
+    sequence = _sequence()
+
+    def _no_render(data):
+        raise AssertionError("no debería maquetar de nuevo")
+
+    monkeypatch.setattr(gen, "render_invoice_pdf", _no_render)
+    with track_queries("reissue") as scope:
+        assert gen.generate_invoice_pdf(3) == path
+
+    assert scope.queries == 1                   # solo el SELECT del Invoice
+    assert _sequence() == sequence
+
+
+def test_corrupt_file_is_regenerated_with_same_number(seeded_db):
+    path = gen.generate_invoice_pdf(3)
+    with open(path, "rb") as fh:
+        original = fh.read()
+    sequence = _sequence()
+
+    with open(path, "wb") as fh:
+        fh.write(b"basura")
+    assert gen.find_invoice_pdf(3) is None
+
+    assert gen.generate_invoice_pdf(3) == path
+    with open(path, "rb") as fh:
+        assert fh.read() == original
+    assert _sequence() == sequence
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_job_renders_in_process_pool(seeded_db, monkeypatch):
+    monkeypatch.setattr(jobs, "INVOICE_WORKERS", 1)
+
+    job_id = jobs.submit_invoice_job(3)
+    job = await jobs.wait_invoice_job(job_id, timeout=60)
+
+    assert job.status == jobs.READY, job.error
+    with open(job.path, "rb") as fh:
+        content = fh.read()
+    with Session(db.get_engine()) as session:
+        invoice = session.exec(select(Invoice).where(Invoice.id_order == 3)).one()
+    assert invoice.pdf_hash == sha256(content).hexdigest()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_failed_job_keeps_error(monkeypatch):
+    monkeypatch.setattr(jobs, "INVOICE_WORKERS", 0)
+
+    def _missing(order_id):
+        raise ValueError(f"No se encontró la orden con ID {order_id}")
+
+    monkeypatch.setattr(jobs, "find_invoice_pdf", lambda order_id: None)
+    monkeypatch.setattr(jobs, "prepare_invoice_data", _missing)
+
+    job = await jobs.wait_invoice_job(jobs.submit_invoice_job(99))
+
+    assert job.status == jobs.FAILED
+    assert "99" in job.error
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_submit_returns_immediately_and_dedupes(monkeypatch):
+    monkeypatch.setattr(jobs, "INVOICE_WORKERS", 0)
+    release = threading.Event()
+
+    def _slow(order_id):
+        release.wait(5)
+        return DATA
+
+    monkeypatch.setattr(jobs, "find_invoice_pdf", lambda order_id: None)
+    monkeypatch.setattr(jobs, "prepare_invoice_data", _slow)
+    monkeypatch.setattr(jobs, "store_invoice_pdf", lambda invoice_id, pdf: f"/tmp/factura_{invoice_id}.pdf")
+
+    first = jobs.submit_invoice_job(5)
+    assert jobs.submit_invoice_job(5) == first
+    assert jobs.get_invoice_job(first).status in (jobs.PENDING, jobs.RUNNING)
+
+    release.set()
+    job = await jobs.wait_invoice_job(first)
+    assert (job.status, job.path) == (jobs.READY, "/tmp/factura_1.pdf")
+    assert jobs.submit_invoice_job(5) != first     # terminado: un pedido nuevo encola otro trabajo
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_job_serves_issued_invoice_without_rendering(monkeypatch):
+    monkeypatch.setattr(jobs, "find_invoice_pdf", lambda order_id: f"/tmp/factura_{order_id}.pdf")
+
+    def _no_prepare(order_id):
+        raise AssertionError("no debería tocar la BD ni maquetar")
+
+    monkeypatch.setattr(jobs, "prepare_invoice_data", _no_prepare)
+
+    job = await jobs.wait_invoice_job(jobs.submit_invoice_job(8))
+    assert (job.status, job.path) == (jobs.READY, "/tmp/factura_8.pdf")
+
+
+def test_concurrent_issue_keeps_one_invoice_per_order(seeded_db, monkeypatch):
+    real = gen.next_invoice_number
+    sequence = _sequence()
+
+    def _other_process_wins(*, session=None):
+        # Otra descarga factura el pedido entre la búsqueda del Invoice y el commit
+        with Session(db.get_engine()) as other:
+            block, number = real(session=other)
+            other.add(Invoice(iva=0, id_order=3, id_stamped=block.stamped_id, nro_factura=number,
+                              invoice_date=datetime.now()))
+            other.commit()
+        return real(session=session)
+
+    monkeypatch.setattr(gen, "next_invoice_number", _other_process_wins)
+    data = gen.prepare_invoice_data(3)
+
+    with Session(db.get_engine()) as session:
+        invoices = session.exec(select(Invoice).where(Invoice.id_order == 3)).all()
+    assert [(inv.id, inv.nro_factura) for inv in invoices] == [(data.invoice_id, data.nro_factura)]
+    assert _sequence() == sequence + 1          # el número del perdedor vuelve al timbrado
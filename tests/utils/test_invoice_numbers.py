@@ -0,0 +1,107 @@
+# tests/utils/test_invoice_numbers.py
+"""
+Tests para repositories/StampedRepository.py y services/InvoiceNumberService.py
+-------------------------------------------------------------------------------
+SQLite temporal con un timbrado; la concurrencia se prueba con hilos que
+reservan números a la vez.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Stamped
+from della_soft.repositories.StampedRepository import allocate_sequence
+from della_soft.services.InvoiceNumberService import next_invoice_number, reserve_invoice_numbers
+from della_soft.services.UnitOfWork import unit_of_work
+from sqlmodel import Session, select
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def stamped_db(sqlite_db):
+    db.get_engine()
+
+    def _stamped(**overrides):
+        values = dict(stamped_number="12345678", establishment="001", expedition_point="002",
+                      current_sequence=0, max_sequence=1000, date_from=TODAY - timedelta(days=30),
+                      date_to=TODAY + timedelta(days=30), active=True)
+        values.update(overrides)
+        with Session(db.get_engine()) as session:
+            session.add(Stamped(**values))
+            session.commit()
+
+    return _stamped
+
+
+def _current() -> int:
+    with Session(db.get_engine()) as session:
+        return session.exec(select(Stamped.current_sequence)).first()
+
+
+def test_allocates_single_numbers_and_blocks(stamped_db):
+    stamped_db()
+
+    block, number = next_invoice_number()
+    assert number == "001-002-000001"
+    assert block.stamped_number == "12345678"
+
+    block = allocate_sequence(5)
+    assert (block.first, block.last, len(block)) == (2, 6, 5)
+    assert block.numbers()[-1] == "001-002-000006"
+    assert _current() == 6
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"current_sequence": 1000}, "agotó su numeración"),
+    ({"date_to": TODAY - timedelta(days=1)}, "venció"),
+    ({"date_from": TODAY + timedelta(days=1)}, "rige desde"),
+    ({"active": False}, "No hay timbrado activo"),
+])
+def test_allocation_errors(stamped_db, overrides, message):
+    stamped_db(**overrides)
+    before = _current()
+
+    with pytest.raises(RuntimeError, match=message):
+        allocate_sequence(1)
+    assert _current() == before
+
+
+def test_block_larger_than_remaining_is_rejected(stamped_db):
+    stamped_db(current_sequence=998)
+
+    with pytest.raises(RuntimeError, match="quedan 2"):
+        allocate_sequence(5)
+    assert len(allocate_sequence(2)) == 2
+
+
+def test_rollback_returns_the_number(stamped_db):
+    stamped_db()
+
+    with pytest.raises(ValueError):
+        with unit_of_work() as session:
+            next_invoice_number(session=session)
+            raise ValueError("falló el INSERT de la factura")
+
+    assert _current() == 0
+    assert next_invoice_number()[1] == "001-002-000001"
+
+
+def test_concurrent_allocation_never_repeats(stamped_db):
+    stamped_db()
+
+    def _worker(_):
+        numbers = [next_invoice_number()[1] for _ in range(20)]
+        with unit_of_work() as session:
+            block = reserve_invoice_numbers(5, session=session)
+        return numbers + [block.format(n) for n in range(block.first, block.last + 1)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        numbers = [n for chunk in pool.map(_worker, range(8)) for n in chunk]
+
+    # todo lo reservado es un rango sin huecos: 160 sueltos y 8 bloques de 5
+    assert sorted(numbers) == [f"001-002-{n:06d}" for n in range(1, 201)]
+    assert _current() == 200
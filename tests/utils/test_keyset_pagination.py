@@ -0,0 +1,165 @@
+# tests/utils/test_keyset_pagination.py
+"""
+Tests para repositories/KeysetPagination.py
+-------------------------------------------
+Se usa un SQLite temporal (DB_URL) con clientes y transacciones para
+recorrer las páginas hacia adelante y hacia atrás con los cursores, con y
+sin búsqueda.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Customer, Order, Rol
+from della_soft.models.TransactionModel import Transaction
+from della_soft.repositories.CustomerRepository import get_customer_page
+from della_soft.repositories.KeysetPagination import decode_cursor, encode_cursor
+from della_soft.repositories.TransactionRepository import select_transactions_keyset
+from della_soft.repositories.aio import CustomerRepository as aio_customers
+from della_soft.repositories.aio.OrderRepository import select_orders_keyset
+from della_soft.views.CustomerView import CustomerView
+from sqlmodel import Session
+
+
+@pytest.fixture
+def keyset_db(sqlite_db):
+    with Session(db.get_engine()) as session:
+        session.add(Rol(id_rol=1, description="Admin"))
+        for i in range(1, 13):
+            session.add(Customer(id=i, first_name=f"C{i}", last_name="X",
+                                 contact="0981", id_rol=1))
+        base = datetime(2025, 6, 19, 8, 0)
+        for i in range(1, 8):
+            # dos transacciones comparten fecha: el id desempata
+            session.add(Transaction(
+                id=i, observation=f"tx{i}", amount=i * 100,
+                transaction_date=base + timedelta(minutes=i // 2),
+                status="PAGO", id_POS=1, id_user=1, id_order=None,
+            ))
+        session.commit()
+
+
+# ------------------------------------------------------------------
+# encode/decode – ida y vuelta, incluidas fechas
+# ------------------------------------------------------------------
+def test_cursor_roundtrip():
+    when = datetime(2025, 6, 19, 8, 30)
+    assert decode_cursor(encode_cursor(when, 5, "prev")) == (when, 5, "prev")
+
+
+def test_invalid_cursor_raises():
+    with pytest.raises(ValueError):
+        decode_cursor("no-es-un-cursor")
+
+
+# ------------------------------------------------------------------
+# Clientes – adelante hasta el final y de vuelta al inicio
+# ------------------------------------------------------------------
+def test_customer_pages_forward_and_back(keyset_db):
+    first = get_customer_page(None, 5)
+    assert [c.id for c in first.rows] == [1, 2, 3, 4, 5]
+    assert first.prev_cursor is None
+
+    second = get_customer_page(first.next_cursor, 5)
+    third = get_customer_page(second.next_cursor, 5)
+    assert [c.id for c in second.rows] == [6, 7, 8, 9, 10]
+    assert [c.id for c in third.rows] == [11, 12]
+    assert third.next_cursor is None
+
+    back = get_customer_page(third.prev_cursor, 5)
+    assert [c.id for c in back.rows] == [6, 7, 8, 9, 10]
+    start = get_customer_page(back.prev_cursor, 5)
+    assert [c.id for c in start.rows] == [1, 2, 3, 4, 5]
+    assert start.prev_cursor is None
+
+
+# ------------------------------------------------------------------
+# Transacciones – orden por (fecha, id) sin saltear ni repetir filas
+# ------------------------------------------------------------------
+def test_transactions_keyset_ties(keyset_db):
+    seen = []
+    cursor = None
+    while True:
+        page = select_transactions_keyset("2025-06-19", "2025-06-19", cursor, 3)
+        seen.extend(tx.id for tx in page.rows)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == [1, 2, 3, 4, 5, 6, 7]
+
+
+# ------------------------------------------------------------------
+# Variante async (engine aiosqlite): mismas páginas que la sync
+# ------------------------------------------------------------------
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_async_pages_match_sync(keyset_db):
+    try:
+        first = await aio_customers.get_customer_page(None, 5)
+        second = await aio_customers.get_customer_page(first.next_cursor, 5)
+        assert [c.id for c in second.rows] == [c.id for c in get_customer_page(first.next_cursor, 5).rows]
+        assert await aio_customers.get_total_items() == 12
+        assert [c.id for c in await aio_customers.select_by_parameter("C1")] == [1, 10, 11, 12]
+    finally:
+        await db.dispose_async_engine()
+
+
+# ------------------------------------------------------------------
+# Búsqueda de clientes – también paginada por keyset
+# ------------------------------------------------------------------
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_customer_search_pages(keyset_db):
+    state = CustomerView(_reflex_internal_init=True)
+    state.limit = 2
+    try:
+        await state.search_on_change("C1")       # coinciden 1, 10, 11 y 12
+        assert [c.id for c in state.customers] == [1, 10]
+        assert (state.total_items, state.num_total_pages, state.is_last_page) == (4, 2, False)
+
+        await state.next_page()
+        assert [c.id for c in state.customers] == [11, 12]
+        assert (state.current_page, state.is_last_page) == (2, True)
+
+        await state.prev_page()
+        assert [c.id for c in state.customers] == [1, 10]
+        assert state.is_first_page
+    finally:
+        await db.dispose_async_engine()
+
+
+
+# ------------------------------------------------------------------
+# Pedidos por fecha – las fechas NULL no se pierden entre páginas
+# ------------------------------------------------------------------
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+@pytest.mark.parametrize("sort, expected", [
+    ("order_date", [2, 4, 6, 7, 1, 5, 3]),
+    ("-order_date", [3, 5, 1, 7, 6, 4, 2]),
+])
+async def test_order_pages_through_null_dates(keyset_db, sort, expected):
+    dates = {1: datetime(2025, 6, 1), 3: datetime(2025, 6, 3), 5: datetime(2025, 6, 2)}
+    with Session(db.get_engine()) as session:
+        for i in range(1, 8):   # 2, 4, 6 y 7 sin fecha
+            session.add(Order(id=i, total_order=100, total_paid=0, id_customer=1,
+                              order_date=dates.get(i)))
+        session.commit()
+
+    try:
+        seen, cursor = [], None
+        while True:
+            page = await select_orders_keyset("", cursor, 2, sort)
+            seen.extend(row["id"] for row in page.rows)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert seen == expected
+
+        back = await select_orders_keyset("", page.prev_cursor, 2, sort)
+        assert [row["id"] for row in back.rows] == expected[-3:-1]
+    finally:
+        await db.dispose_async_engine()
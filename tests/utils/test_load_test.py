@@ -0,0 +1,74 @@
+# tests/utils/test_load_test.py
+"""
+Tests para scripts/load_test.py
+-------------------------------
+Se siembra un SQLite temporal chico y se corre la carga con uno y con
+varios cajeros (el estado final tiene que ser consistente); la detección
+de inconsistencias se prueba alterando la caja a mano.
+"""
+
+from types import SimpleNamespace as NS
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import POS
+from della_soft.scripts import load_test
+from della_soft.scripts.seed_data import SeedSizes
+from sqlalchemy.exc import OperationalError
+from sqlmodel import update
+
+SMALL = SeedSizes(customers=30, products=8, orders=40, lines=100, transactions=100, days=5,
+                  ingredients=6, invoices=5)
+
+
+@pytest.fixture
+def seed_sizes():
+    return SMALL
+
+
+def test_single_cashier_run_is_consistent(seeded_db):
+    report = load_test.run_load(cashiers=1, operations=40, seed=3)
+
+    assert report["totals"]["ok"] + report["totals"]["rejected"] == 40
+    assert report["totals"]["error"] == 0
+    assert set(report["operations"]) <= set(load_test.OPERATIONS)
+    assert report["operations"]["create_order"]["latency_ms"]["p95"] > 0
+    assert report["consistency"] == {"consistent": True, "issues": [], "issue_count": 0}
+
+
+def test_concurrent_cashiers_do_not_lose_updates(seeded_db):
+    report = load_test.run_load(cashiers=4, operations=25, seed=5)
+
+    assert report["totals"]["error"] == 0
+    assert report["consistency"]["issues"] == []
+
+
+def test_consistency_detects_lost_pos_update(seeded_db):
+    with db.get_engine().connect() as conn:
+        pos = load_test._today_pos()
+        start = load_test._snapshot(conn, pos.id)
+    with db.get_engine().begin() as conn:
+        conn.execute(update(POS).where(POS.id == pos.id).values(final_amount=POS.final_amount + 1000))
+
+    result = load_test.check_consistency(pos.id, start, [])
+
+    assert not result["consistent"]
+    assert result["issues"][0].startswith(f"caja {pos.id}")
+
+
+def test_classify_error():
+    deadlock = OperationalError("UPDATE", {}, NS(pgcode="40P01"))
+    locked = OperationalError("UPDATE", {}, Exception("database is locked"))
+    other = OperationalError("UPDATE", {}, Exception("no such table: x"))
+
+    assert load_test.classify_error(ValueError("Stock insuficiente")) == "rejected"
+    assert load_test.classify_error(deadlock) == "conflict"
+    assert load_test.classify_error(locked) == "conflict"
+    assert load_test.classify_error(other) == "error"
+
+
+def test_parse_weights():
+    assert load_test._parse_weights("bill=0,payment=9") == {**load_test.DEFAULT_WEIGHTS, "bill": 0, "payment": 9}
+    with pytest.raises(ValueError):
+        load_test._parse_weights("vender=1")
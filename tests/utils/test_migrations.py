@@ -0,0 +1,126 @@
+# tests/utils/test_migrations.py
+"""
+Tests para las migraciones de alembic/versions
+----------------------------------------------
+Se aplican sobre un SQLite temporal (DB_URL) creado con los modelos; en
+SQLite los índices se crean sin CONCURRENTLY. Para las tablas nuevas se
+borra la tabla antes de migrar, como en una base anterior a ellas.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Customer, DailyProductSales, Order, Product, ProductOrder, Rol
+from della_soft.models.ProductModel import ProductType
+from della_soft.repositories.DailySalesRepository import rebuild
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from sqlmodel import Session, select
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def alembic_cfg(sqlite_db):
+    cfg = Config(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "alembic"))
+    return cfg
+
+
+def _indexes(table: str) -> set[str]:
+    return {ix["name"] for ix in inspect(db.get_engine()).get_indexes(table)}
+
+
+def test_upgrade_and_downgrade(alembic_cfg):
+    db.get_engine()   # crea las tablas (con los índices de los modelos)
+    command.upgrade(alembic_cfg, "head")
+    assert {"ix_product_order_id_order", "ix_product_order_id_product"} <= _indexes("product_order")
+    assert "ix_order_order_date" in _indexes("order")
+
+    command.downgrade(alembic_cfg, "base")
+    assert "ix_product_order_id_order" not in _indexes("product_order")
+
+
+def test_duplicate_stock_rows_stop_the_migration(alembic_cfg):
+    engine = db.get_engine()
+    with engine.begin() as conn:
+        # tabla de stock "vieja", sin la restricción única
+        conn.execute(text("DROP TABLE product_stock"))
+        conn.execute(text(
+            "CREATE TABLE product_stock (id INTEGER PRIMARY KEY, product_id INTEGER NOT NULL, "
+            "quantity INTEGER NOT NULL, min_quantity INTEGER NOT NULL)"
+        ))
+    with Session(engine) as session:
+        session.add(Product(id=1, name="Torta", product_type=ProductType.IN_STOCK, price=10))
+        session.commit()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO product_stock VALUES (1, 1, 5, 0), (2, 1, 3, 0)"))
+
+    with pytest.raises(RuntimeError, match="product_stock"):
+        command.upgrade(alembic_cfg, "head")
+
+
+def test_creates_and_backfills_daily_sales(alembic_cfg):
+    engine = db.get_engine()
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE daily_product_sales"))   # base anterior al resumen
+    with Session(engine) as session:
+        session.add(Rol(id_rol=1, description="Admin"))
+        session.add(Customer(id=1, first_name="A", last_name="B", contact="0", id_rol=1))
+        session.add(Product(id=1, name="Torta", product_type=ProductType.IN_STOCK, price=100))
+        session.add(Order(id=1, total_order=300, total_paid=0, id_customer=1,
+                          order_date=datetime(2025, 5, 10, 9)))
+        session.add(Order(id=2, total_order=100, total_paid=0, id_customer=1,
+                          order_date=datetime(2025, 5, 10, 18)))
+        session.add(Order(id=3, total_order=100, total_paid=0, id_customer=1, order_date=None))
+        session.add(ProductOrder(id=1, quantity=3, id_product=1, id_order=1))
+        session.add(ProductOrder(id=2, quantity=1, id_product=1, id_order=2))
+        session.add(ProductOrder(id=3, quantity=1, id_product=1, id_order=3))
+        session.commit()
+
+    command.upgrade(alembic_cfg, "head")
+    engine.dispose()   # la conexión del pool guarda el esquema de antes del DROP
+
+    assert "ix_daily_product_sales_sales_date" in _indexes("daily_product_sales")
+    uniques = inspect(engine).get_unique_constraints("daily_product_sales")
+    assert [u["column_names"] for u in uniques] == [["sales_date", "id_product"]]
+    def _rows():
+        with Session(engine) as session:
+            return [(str(r.sales_date), r.id_product, r.quantity, r.revenue, r.order_count)
+                    for r in session.exec(select(DailyProductSales)).all()]
+
+    backfilled = _rows()
+    assert backfilled == [("2025-05-10", 1, 4, 400, 2)]
+    rebuild()   # la carga de la migración coincide con el agregado de la app
+    assert _rows() == backfilled
+
+
+
+def test_unique_invoice_per_order(alembic_cfg):
+    db.get_engine()
+    command.upgrade(alembic_cfg, "head")
+    assert "uq_invoice_id_order" in _indexes("invoice")
+
+    command.downgrade(alembic_cfg, "0004_daily_product_sales")
+    assert "uq_invoice_id_order" not in _indexes("invoice")
+
+
+def test_duplicate_invoices_stop_the_migration(alembic_cfg):
+    engine = db.get_engine()
+    with engine.begin() as conn:
+        # tabla de facturas "vieja", sin la restricción única
+        conn.execute(text("DROP TABLE invoice"))
+        conn.execute(text(
+            "CREATE TABLE invoice (id INTEGER PRIMARY KEY, iva FLOAT NOT NULL, invoice_date DATETIME, "
+            "id_order INTEGER NOT NULL, id_stamped INTEGER NOT NULL, nro_factura VARCHAR(20) NOT NULL, "
+            "pdf_hash VARCHAR(64), canceled BOOLEAN NOT NULL)"
+        ))
+        conn.execute(text("INSERT INTO invoice VALUES (1, 0, NULL, 7, 1, 'a', NULL, 0), "
+                          "(2, 0, NULL, 7, 1, 'b', NULL, 0)"))
+
+    with pytest.raises(RuntimeError, match="id_order = \\[7\\]"):
+        command.upgrade(alembic_cfg, "head")
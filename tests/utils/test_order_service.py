@@ -95,3 +95,18 @@ def test_update_order_passthrough(monkeypatch):
 def test_update_pay_amount_passthrough(monkeypatch):
     monkeypatch.setattr(osvc, "update_pay_amount", lambda o: "UPDATED$")
     assert osvc.update_pay_amount_service(NS()) == "UPDATED$"
+
+
+# ------------------------------------------------------------------
+# select_order_rows_service – filas ya unidas con el cliente
+# ------------------------------------------------------------------
+async def test_select_order_rows_service(monkeypatch):
+    rows = [{"id": 1, "customer_name": "Ana Paz", "pending": 50}]
+
+    async def _fake_rows():
+        return rows
+
+    monkeypatch.setattr(osvc, "select_orders_with_customer", _fake_rows)
+
+    out = await osvc.select_order_rows_service()
+    assert out == rows
@@ -0,0 +1,185 @@
+# tests/utils/test_payment_service.py
+"""
+Tests para services/PaymentService.py
+-------------------------------------
+Se reemplaza la unidad de trabajo por una sesión falsa y los repositorios
+por stubs que registran con qué sesión fueron llamados.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace as NS
+
+import pytest
+
+import della_soft.services.PaymentService as pay
+from della_soft.models.POSModel import POS
+
+
+class _FakeSession:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+
+
+@pytest.fixture
+def uow(monkeypatch):
+    state = {"sessions": []}
+
+    @contextmanager
+    def _fake_uow():
+        session = _FakeSession()
+        state["sessions"].append(session)
+        try:
+            yield session
+            session.committed = True
+        except Exception:
+            session.rolled_back = True
+            raise
+
+    monkeypatch.setattr(pay, "unit_of_work", _fake_uow)
+    return state
+
+
+@pytest.fixture
+def order():
+    """Pedido en la BD falsa: add_to_total_paid le suma el monto."""
+    return NS(total_paid=0, total_order=1000)
+
+
+@pytest.fixture
+def calls(monkeypatch, order):
+    log = []
+
+    def _rec(name, result=None):
+        def _fn(*args, session=None):
+            log.append((name, args, session))
+            return result
+        return _fn
+
+    def _add_to_total_paid(order_id, amount, session=None):
+        log.append(("order", (order_id, amount), session))
+        order.total_paid += amount
+        return order.total_paid, order.total_order
+
+    monkeypatch.setattr(pay, "insert_transaction", _rec("tx"))
+    monkeypatch.setattr(pay, "add_to_total_paid", _add_to_total_paid)
+    monkeypatch.setattr(pay, "add_to_final_amount", _rec("pos"))
+    monkeypatch.setattr(pay, "decrement_stock", _rec("stock_pay", NS(ok=True, failed=[])))
+    monkeypatch.setattr(pay, "restore_stock", _rec("stock_rev", NS(ok=True, failed=[])))
+    monkeypatch.setattr(
+        pay, "select_fixed_products",
+        lambda oid, session=None: [NS(id_product=7, quantity=2)],
+    )
+    return log
+
+
+def _pos():
+    return POS(id=1, initial_amount=100, final_amount=500,
+               pos_date=datetime(2025, 6, 19, 8, 0))
+
+
+# ------------------------------------------------------------------
+# Pago final: todo en una sola sesión y se descuenta stock
+# ------------------------------------------------------------------
+def test_final_payment_single_transaction(monkeypatch, uow, calls, order):
+    monkeypatch.setattr(pay, "select_quantities",
+                        lambda ids, session=None: {pid: 10 for pid in ids})
+    order.total_paid = 400
+
+    new_total = pay.process_payment_service(order_id=3, amount=600, pos=_pos(), user_id=9)
+
+    assert new_total == 1000
+    assert len(uow["sessions"]) == 1
+    session = uow["sessions"][0]
+    assert session.committed
+    assert [c[0] for c in calls] == ["tx", "order", "pos", "stock_pay"]
+    assert all(c[2] is session for c in calls)
+    assert calls[1][1] == (3, 600)
+    assert calls[2][1] == (1, 600)             # solo el id de la caja y el monto
+    assert calls[3][1] == ([(7, 2)],)
+
+
+# ------------------------------------------------------------------
+# Pago parcial: no toca stock
+# ------------------------------------------------------------------
+def test_partial_payment_keeps_stock(monkeypatch, uow, calls):
+    monkeypatch.setattr(pay, "select_quantities",
+                        lambda ids, session=None: {pid: 10 for pid in ids})
+
+    pay.process_payment_service(3, 200, _pos(), 9)
+
+    assert [c[0] for c in calls] == ["tx", "order", "pos"]
+
+
+# ------------------------------------------------------------------
+# Stock insuficiente: rollback y ninguna escritura
+# ------------------------------------------------------------------
+def test_insufficient_stock_rolls_back(monkeypatch, uow, calls):
+    monkeypatch.setattr(pay, "select_quantities",
+                        lambda ids, session=None: {pid: 1 for pid in ids})
+
+    with pytest.raises(ValueError):
+        pay.process_payment_service(3, 1000, _pos(), 9)
+
+    session = uow["sessions"][0]
+    assert session.rolled_back and not session.committed
+    assert calls == []
+
+
+# ------------------------------------------------------------------
+# Otra caja vendió el stock entre la validación y el UPDATE: rollback
+# ------------------------------------------------------------------
+def test_guarded_decrement_failure_rolls_back(monkeypatch, uow, calls):
+    monkeypatch.setattr(pay, "select_quantities",
+                        lambda ids, session=None: {pid: 10 for pid in ids})
+    monkeypatch.setattr(pay, "decrement_stock",
+                        lambda lines, session=None: NS(ok=False, failed=[(7, 2)]))
+
+    with pytest.raises(ValueError, match="producto 7"):
+        pay.process_payment_service(3, 1000, _pos(), 9)
+
+    assert uow["sessions"][0].rolled_back
+    assert not uow["sessions"][0].committed
+
+
+# ------------------------------------------------------------------
+# Reverso de un pedido pagado: devuelve stock
+# ------------------------------------------------------------------
+def test_reverse_restores_stock(uow, calls, order):
+    order.total_paid = 1000
+    new_total = pay.process_reverse_service(3, -300, _pos(), 9)
+
+    assert new_total == 700
+    assert [c[0] for c in calls] == ["tx", "order", "pos", "stock_rev"]
+    assert calls[3][1] == ([(7, 2)],)
+    assert uow["sessions"][0].committed
+
+
+def test_bill_updates_pos(uow, calls):
+    pay.process_bill_service(-50, "Harina", _pos(), 9)
+
+    assert [c[0] for c in calls] == ["tx", "pos"]
+    assert calls[1][1] == (1, -50)
+
+
+# ------------------------------------------------------------------
+# Otra caja ya completó el pedido: este pago no vuelve a descontar stock
+# ------------------------------------------------------------------
+def test_stock_moves_only_when_payment_completes_order(monkeypatch, uow, calls, order):
+    monkeypatch.setattr(pay, "select_quantities",
+                        lambda ids, session=None: {pid: 10 for pid in ids})
+    order.total_paid = 1000
+
+    assert pay.process_payment_service(3, 500, _pos(), 9) == 1500
+
+    assert "stock_pay" not in [c[0] for c in calls]
+
+
+def test_partial_reverse_of_unpaid_order_keeps_stock(uow, calls, order):
+    order.total_paid = 600
+
+    assert pay.process_reverse_service(3, -100, _pos(), 9) == 500
+
+    assert "stock_rev" not in [c[0] for c in calls]
+
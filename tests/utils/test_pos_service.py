@@ -6,11 +6,15 @@ Se utilizan monkey-patches para simular acceso al repositorio
 y evitar operaciones reales con la base de datos.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 import pytest
 from types import SimpleNamespace as NS
 
+import della_soft.repositories.ConnectDB as db
 import della_soft.services.POSService as psvc
+from della_soft.models.POSModel import POS
+from della_soft.repositories.POSRepository import get_by_pos_date
+from sqlmodel import Session
 
 # No se necesita asyncio porque no hay funciones async
 
@@ -80,3 +84,38 @@ def test_update_final_amount(monkeypatch):
     assert pos.initial_amount == 8000
     assert pos.final_amount == 12000
     assert pos.pos_date == datetime(2025, 6, 19, 18, 0)
+
+
+# ------------------------------------------------------------------
+# pos_is_open – la caja de hoy se lee siempre de la BD (sin caché)
+# ------------------------------------------------------------------
+def test_today_pos_is_not_cached(monkeypatch):
+    today = date.today().isoformat()
+    lookups = []
+
+    def fake_get_by_pos_date(value):
+        lookups.append(value)
+        return POS(id=1, initial_amount=100, final_amount=100 + len(lookups),
+                   pos_date=datetime.now())
+
+    monkeypatch.setattr(psvc, "get_by_pos_date", fake_get_by_pos_date)
+
+    assert psvc.pos_is_open(today).final_amount == 101
+    assert psvc.pos_is_open(today).final_amount == 102   # el pago de otra caja se ve enseguida
+    assert lookups == [today, today]
+
+
+# ------------------------------------------------------------------
+# get_by_pos_date – rango [día, día siguiente) sobre SQLite temporal
+# ------------------------------------------------------------------
+def test_get_by_pos_date_range(sqlite_db):
+    with Session(db.get_engine()) as session:
+        session.add(POS(id=1, initial_amount=0, final_amount=0,
+                        pos_date=datetime(2025, 6, 19, 23, 59, 59)))
+        session.add(POS(id=2, initial_amount=0, final_amount=0,
+                        pos_date=datetime(2025, 6, 20, 0, 0)))
+        session.commit()
+
+    assert get_by_pos_date("2025-06-19").id == 1
+    assert get_by_pos_date("20/06/2025").id == 2
+    assert get_by_pos_date(date(2025, 6, 21)) is None
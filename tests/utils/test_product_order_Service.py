@@ -2,13 +2,24 @@
 """
 Tests para services/ProductOrderService.py
 -------------------------------------------
-Se simula el acceso a base de datos mediante monkey-patches.
+Se simula el acceso a base de datos mediante monkey-patches; el alta y la
+edición de pedidos con líneas se prueban sobre un SQLite temporal.
 """
 
 import pytest
+from contextlib import contextmanager
+from datetime import datetime
 from types import SimpleNamespace as NS
 
+import della_soft.repositories.ConnectDB as db
 import della_soft.services.ProductOrderService as posvc
+from della_soft.models import Customer, Order, Product, ProductOrder, Rol
+from della_soft.models.ProductModel import ProductType
+from della_soft.services.OrderService import (
+    create_order_with_lines_service,
+    update_order_with_lines_service,
+)
+from sqlmodel import Session, select
 
 # No requiere async
 
@@ -51,12 +62,15 @@ def test_insert_product_order_service(monkeypatch):
         return "INSERTED"
 
     monkeypatch.setattr(posvc, "insert_repo_product_order", fake_insert)
+    monkeypatch.setattr(posvc, "refresh_for_order",
+                        lambda oid: captured.setdefault("refreshed", oid))
 
-    fake_order = NS(id=1, name="FakeProduct")
+    fake_order = NS(id=1, name="FakeProduct", id_order=7)
     result = posvc.insert_product_order_service(fake_order)
 
     assert result == "INSERTED"
     assert captured["product_order"] == fake_order
+    assert captured["refreshed"] == 7   # resumen diario del pedido
 
 
 # ------------------------------------------------------------------
@@ -69,26 +83,93 @@ def test_delete_product_order_service(monkeypatch):
 
 
 # ------------------------------------------------------------------
-# update_product_orders – elimina los existentes e inserta los nuevos
+# diff_order_lines – solo cambia lo que cambió
+# ------------------------------------------------------------------
+def test_diff_order_lines():
+    existing = [
+        NS(id=1, id_product=10, quantity=2),   # sin cambios
+        NS(id=2, id_product=11, quantity=1),   # cambia la cantidad
+        NS(id=3, id_product=12, quantity=4),   # se quita
+        NS(id=4, id_product=10, quantity=1),   # repetida → se borra
+    ]
+    new = [NS(id_product=10, quantity=2), NS(id_product=11, quantity=5),
+           NS(id_product=13, quantity=1)]
+
+    diff = posvc.diff_order_lines(7, existing, new)
+
+    assert diff.to_update == [(2, 5)]
+    assert diff.to_delete == [3, 4]
+    assert [(po.id_product, po.quantity, po.id_order) for po in diff.to_insert] == [(13, 1, 7)]
+
+
+# ------------------------------------------------------------------
+# update_product_orders – aplica el diff en una sola transacción
 # ------------------------------------------------------------------
 def test_update_product_orders(monkeypatch):
-    called = {"deleted": [], "inserted": []}
+    called = {}
+    session = object()
+
+    @contextmanager
+    def fake_uow():
+        yield session
 
-    def fake_select_by_order_id(oid):
-        return [NS(id=1), NS(id=2)]
+    def rec(name):
+        def _fn(arg, session=None):
+            called[name] = (list(arg), session)
+        return _fn
 
-    def fake_delete_product_order(pid):
-        called["deleted"].append(pid)
+    monkeypatch.setattr(posvc, "unit_of_work", fake_uow)
+    monkeypatch.setattr(posvc, "select_by_order_id",
+                        lambda oid, session=None: [NS(id=1, id_product=10, quantity=2),
+                                                   NS(id=2, id_product=11, quantity=1)])
+    monkeypatch.setattr(posvc, "delete_product_orders", rec("deleted"))
+    monkeypatch.setattr(posvc, "update_product_order_quantities", rec("updated"))
+    monkeypatch.setattr(posvc, "insert_product_orders", rec("inserted"))
+    monkeypatch.setattr(posvc, "refresh_for_order",
+                        lambda oid, session=None: called.setdefault("refreshed", (oid, session)))
 
-    def fake_insert_product_order(po):
-        called["inserted"].append(po)
+    posvc.update_product_orders(order_id=1, new_product_orders=[NS(id_product=10, quantity=3)])
 
-    monkeypatch.setattr(posvc, "select_by_order_id", fake_select_by_order_id)
-    monkeypatch.setattr(posvc, "delete_product_order", fake_delete_product_order)
-    monkeypatch.setattr(posvc, "insert_product_order", fake_insert_product_order)
+    assert called["deleted"] == ([2], session)
+    assert called["updated"] == ([(1, 3)], session)
+    assert called["inserted"] == ([], session)
+    assert called["refreshed"] == (1, session)
 
-    new_orders = [NS(id=3), NS(id=4)]
-    posvc.update_product_orders(order_id=1, new_product_orders=new_orders)
 
-    assert called["deleted"] == [1, 2]
-    assert called["inserted"] == new_orders
+# ------------------------------------------------------------------
+# Alta y edición de pedido con líneas (SQLite temporal)
+# ------------------------------------------------------------------
+@pytest.fixture
+def order_db(sqlite_db):
+    with Session(db.get_engine()) as session:
+        session.add(Rol(id_rol=1, description="Admin"))
+        session.add(Customer(id=1, first_name="A", last_name="B", contact="0", id_rol=1))
+        for pid in (1, 2, 3):
+            session.add(Product(id=pid, name=f"P{pid}", product_type=ProductType.IN_STOCK, price=10))
+        session.commit()
+
+
+def _lines(order_id: int) -> dict:
+    with Session(db.get_engine()) as session:
+        rows = session.exec(select(ProductOrder).where(ProductOrder.id_order == order_id)).all()
+        return {po.id_product: (po.id, po.quantity) for po in rows}
+
+
+def test_create_and_edit_order_with_lines(order_db):
+    order = Order(id=None, id_customer=1, observation="", total_order=30, total_paid=0,
+                  order_date=datetime(2025, 6, 19, 9, 0), delivery_date=datetime(2025, 6, 20))
+    lines = [ProductOrder(id=None, quantity=q, id_product=p, id_order=None) for p, q in ((1, 1), (2, 2))]
+
+    new_order = create_order_with_lines_service(order, lines)
+    before = _lines(new_order.id)
+    assert {p: q for p, (_, q) in before.items()} == {1: 1, 2: 2}
+
+    order.total_order = 50
+    update_order_with_lines_service(order, [
+        ProductOrder(id=None, quantity=1, id_product=1, id_order=new_order.id),
+        ProductOrder(id=None, quantity=4, id_product=3, id_order=new_order.id),
+    ])
+    after = _lines(new_order.id)
+    assert after[1] == before[1]            # la línea sin cambios conserva su id
+    assert 2 not in after
+    assert after[3][1] == 4
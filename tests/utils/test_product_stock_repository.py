@@ -0,0 +1,82 @@
+# tests/utils/test_product_stock_repository.py
+"""
+Tests para los movimientos de stock en bloque de ProductStockRepository
+----------------------------------------------------------------------
+SQLite temporal (DB_URL): todas las líneas de un pedido se aplican en un
+único UPDATE … RETURNING; las que dejarían stock negativo se informan.
+"""
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Product
+from della_soft.models.ProductModel import ProductType
+from della_soft.models.ProductStockModel import ProductStock
+from della_soft.repositories.ProductStockRepository import (
+    decrement_stock,
+    restore_stock,
+    select_quantities,
+    update_stock_with_pay,
+)
+from della_soft.repositories.QueryStats import track_queries
+from della_soft.services.UnitOfWork import unit_of_work
+from sqlmodel import Session, select
+
+
+@pytest.fixture
+def stock_db(sqlite_db):
+    with Session(db.get_engine()) as session:
+        for pid, qty in ((1, 5), (2, 3), (3, 0)):
+            session.add(Product(id=pid, name=f"P{pid}", product_type=ProductType.IN_STOCK, price=10))
+            session.add(ProductStock(product_id=pid, quantity=qty, min_quantity=0))
+        session.commit()
+
+
+def _stock() -> dict:
+    with Session(db.get_engine()) as session:
+        return {r.product_id: r.quantity for r in session.exec(select(ProductStock)).all()}
+
+
+def test_decrement_applies_all_lines_in_one_statement(stock_db):
+    # el producto 1 aparece dos veces: se suma antes de descontar
+    result = decrement_stock([(1, 2), (2, 3), (1, 1)])
+
+    assert result.ok
+    assert result.applied == {1: 2, 2: 0}
+    assert _stock() == {1: 2, 2: 0, 3: 0}
+
+
+def test_decrement_never_goes_below_zero(stock_db):
+    result = decrement_stock([(1, 1), (2, 4), (3, 1), (99, 1)])
+
+    assert not result.ok
+    assert sorted(result.failed) == [(2, 4), (3, 1), (99, 1)]
+    assert result.applied == {1: 4}
+    assert _stock() == {1: 4, 2: 3, 3: 0}
+
+
+def test_failed_lines_roll_back_with_unit_of_work(stock_db):
+    with pytest.raises(ValueError):
+        with unit_of_work() as session:
+            result = decrement_stock([(1, 1), (2, 4)], session=session)
+            if not result.ok:
+                raise ValueError(result.failed)
+
+    assert _stock() == {1: 5, 2: 3, 3: 0}
+
+
+def test_restore_and_single_line_wrapper(stock_db):
+    restore_stock([(3, 2), (2, 1)])
+    assert _stock() == {1: 5, 2: 4, 3: 2}
+
+    assert update_stock_with_pay(3, 2).quantity == 0
+    with pytest.raises(ValueError):
+        update_stock_with_pay(3, 1)
+    assert _stock()[3] == 0
+
+
+def test_select_quantities_in_one_query(stock_db):
+    with track_queries("stock") as scope:
+        assert select_quantities([1, 3, 99, 1]) == {1: 5, 3: 0}
+    assert scope.queries == 1
+    assert select_quantities([]) == {}
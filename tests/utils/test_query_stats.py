@@ -0,0 +1,85 @@
+# tests/utils/test_query_stats.py
+"""
+Tests para repositories/QueryStats.py
+-------------------------------------
+SQLite temporal (DB_URL): se cuentan las consultas de un bloque, se
+detectan las sentencias repetidas (N+1) y se prueba el middleware con un
+evento falso.
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace as NS
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+import della_soft.repositories.QueryStats as qs
+from della_soft.models import Customer, Rol
+from della_soft.repositories.CustomerRepository import select_by_id
+from sqlmodel import Session, select
+
+
+@pytest.fixture
+def customers_db(sqlite_db):
+    qs.reset_query_stats()
+    with Session(db.get_engine()) as session:
+        session.add(Rol(id_rol=1, description="Admin"))
+        for i in range(1, 16):
+            session.add(Customer(id=i, first_name=f"C{i}", last_name="X", contact="0", id_rol=1))
+        session.commit()
+    yield
+    qs.reset_query_stats()
+
+
+def test_fingerprint_normalizes_literals_and_lists():
+    a = qs.fingerprint("SELECT * FROM customer WHERE id = 5 AND name = 'Ana'")
+    b = qs.fingerprint("SELECT *  FROM customer\nWHERE id = 12 AND name = 'Luis'")
+    assert a == b == "SELECT * FROM customer WHERE id = ? AND name = ?"
+    assert qs.fingerprint("SELECT 1 WHERE id IN (?, ?, ?)") == qs.fingerprint("SELECT 1 WHERE id IN (%(id_1)s)")
+    assert qs.fingerprint("INSERT INTO t VALUES (?, ?), (?, ?)") == "INSERT INTO t VALUES (?)"
+
+
+def test_per_row_lookups_warn(customers_db, caplog):
+    with caplog.at_level(logging.WARNING, logger=qs.__name__):
+        with qs.track_queries("pantalla.clientes") as scope:
+            for i in range(1, 16):          # N+1: una consulta por fila
+                select_by_id(i)
+
+    assert scope.queries == 15
+    assert scope.db_time > 0
+    assert list(scope.repeated().values()) == [15]
+    assert "Posible N+1 en pantalla.clientes" in caplog.text
+
+    stats = qs.query_stats()["pantalla.clientes"]
+    assert stats["events"] == 1 and stats["queries"] == 15 and stats["n_plus_one"] == 1
+
+
+def test_single_query_does_not_warn(customers_db, caplog):
+    with caplog.at_level(logging.WARNING, logger=qs.__name__):
+        with qs.track_queries("pantalla.lista") as scope:
+            with Session(db.get_engine()) as session:
+                session.exec(select(Customer)).all()
+
+    assert scope.queries == 1
+    assert caplog.text == ""
+    # fuera de un scope no se cuenta nada
+    select_by_id(1)
+    assert qs.query_stats()["pantalla.lista"]["queries"] == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_middleware_scopes_each_event(customers_db):
+    middleware = qs.QueryStatsMiddleware()
+    event = NS(name="state.order_view.load_orders")
+
+    await middleware.preprocess(None, None, event)
+    # el trabajo delegado a un hilo también cuenta
+    await asyncio.to_thread(select_by_id, 1)
+    await middleware.postprocess(None, None, event, NS(final=False))
+    select_by_id(2)
+    await middleware.postprocess(None, None, event, NS(final=True))
+
+    assert qs.current_scope() is None
+    assert qs.query_stats()["state.order_view.load_orders"]["queries"] == 2
@@ -0,0 +1,50 @@
+# tests/utils/test_report_pdf.py
+"""
+Tests para views/ReportPDF.py y views/PDFOutput.py
+--------------------------------------------------
+Los reportes se generan en memoria: no deben escribir en assets/ y cada
+descarga tiene su propio nombre de archivo.
+"""
+
+from hashlib import sha256
+
+from della_soft.views.PDFOutput import RenderedPDF
+from della_soft.views.ReportPDF import (
+    generate_orders_per_day_pdf,
+    generate_stock_rotation_pdf,
+    generate_top_products_pdf,
+)
+
+STOCK = [{"Producto": "Torta", "Stock Disponible": 4, "Cantidad Vendida (Rotación)": 10}]
+
+
+def test_reports_render_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    reports = [
+        generate_stock_rotation_pdf(STOCK),
+        generate_top_products_pdf([{"Producto": "Torta", "Cantidad Vendida": 10}]),
+        generate_orders_per_day_pdf([{"Fecha": "19/06/2025", "Pedidos": 3}]),
+    ]
+
+    for report in reports:
+        assert report.content.startswith(b"%PDF")
+        assert report.sha256 == sha256(report.content).hexdigest()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_concurrent_downloads_get_distinct_names():
+    first, second = generate_stock_rotation_pdf(STOCK), generate_stock_rotation_pdf(STOCK)
+
+    assert first.filename != second.filename
+    assert first.filename.startswith("stock_rotation_report_") and first.filename.endswith(".pdf")
+
+
+def test_save_is_optional_and_complete(tmp_path):
+    rendered = RenderedPDF.from_bytes(b"%PDF-1.3 prueba", "prueba.pdf")
+
+    path = rendered.save(str(tmp_path / "salida"))
+
+    with open(path, "rb") as fh:
+        assert fh.read() == rendered.content
+    assert [p.name for p in (tmp_path / "salida").iterdir()] == ["prueba.pdf"]
@@ -0,0 +1,97 @@
+# tests/utils/test_transaction_service.py
+"""
+Tests para services/TransactionService.py
+-----------------------------------------
+SQLite temporal (DB_URL): el reporte de transacciones trae usuario,
+filtro de estado y total en una sola consulta. La carga de la pantalla
+(TransactionView.load_transactions) se corre sobre la misma base.
+"""
+
+from datetime import datetime
+
+import pytest
+
+import della_soft.repositories.ConnectDB as db
+from della_soft.models import Customer, Rol, Transaction
+from della_soft.services.TransactionService import get_transactions_by_date_range_service
+from della_soft.views.TransactionView import TransactionView
+from sqlmodel import Session
+
+
+@pytest.fixture
+def tx_db(sqlite_db):
+    with Session(db.get_engine()) as session:
+        session.add(Rol(id_rol=1, description="Admin"))
+        session.add(Customer(id=1, first_name="A", last_name="B", contact="0",
+                             username="cajero", id_rol=1))
+        session.add(Customer(id=2, first_name="C", last_name="D", contact="0", id_rol=1))
+        rows = [
+            (1, 1, 500, "PAGO", datetime(2025, 6, 19, 8, 0)),
+            (2, 2, -100, "GASTO", datetime(2025, 6, 19, 23, 59, 59)),
+            (3, 1, 300, "PAGO", datetime(2025, 6, 20, 0, 0)),   # fuera del rango
+        ]
+        for tid, user, amount, status, when in rows:
+            session.add(Transaction(id=tid, observation=f"tx{tid}", amount=amount,
+                                    transaction_date=when, status=status,
+                                    id_POS=1, id_user=user, id_order=None))
+        session.commit()
+    db.reset_engine_stats()
+
+
+def test_report_rows_with_username_and_total(tx_db):
+    rows = get_transactions_by_date_range_service(
+        "2025-06-19", "2025-06-19", with_username=True
+    )
+
+    assert [(r.username, r.amount, r.status) for r in rows] == [
+        ("cajero", 500, "PAGO"),
+        ("2", -100, "GASTO"),      # sin username → id del usuario
+    ]
+    assert rows[0].total_amount == 400
+    assert db.engine_stats()["checkouts"] == 1   # una sola consulta
+
+
+def test_report_status_filter(tx_db):
+    rows = get_transactions_by_date_range_service(
+        "2025-06-19", "2025-06-20", status="PAGO", with_username=True
+    )
+
+    assert [r.amount for r in rows] == [500, 300]
+    assert rows[0].total_amount == 800
+
+
+def test_entities_still_available(tx_db):
+    txs = get_transactions_by_date_range_service("2025-06-19", "2025-06-19")
+    assert [tx.id for tx in txs] == [1, 2]
+
+
+def test_view_loads_first_page_and_total(tx_db):
+    state = TransactionView(_reflex_internal_init=True)
+    state.start_date = state.end_date = "2025-06-19"
+
+    list(state.load_transactions())
+
+    assert [row["Monto"] for row in state.transactions] == [500, -100]
+    assert state.transactions[0]["Usuario"] == "cajero"
+    assert (state.total_items, state.total_amount, state.current_page) == (2, 400, 1)
+
+
+
+def test_view_pages_by_cursor(tx_db):
+    state = TransactionView(_reflex_internal_init=True)
+    state.start_date, state.end_date, state.limit = "2025-06-19", "2025-06-20", 2
+    list(state.load_transactions())
+    assert (state.num_total_pages, state.is_first_page, state.is_last_page) == (2, True, False)
+
+    list(state.next_page())
+    assert [row["Monto"] for row in state.transactions] == [300]
+    assert (state.current_page, state.is_last_page) == (2, True)
+
+    list(state.prev_page())
+    assert [row["Monto"] for row in state.transactions] == [500, -100]
+    assert state.is_first_page
+
+    state.status_filter = "GASTO"
+    list(state.load_transactions())
+    assert (state.total_items, state.total_amount) == (1, -100)
+
@@ -0,0 +1,130 @@
+# tests/utils/test_ttl_cache.py
+"""
+Tests para services/TTLCache.py
+-------------------------------
+Reloj falso para controlar el vencimiento; repositorios con monkeypatch
+para contar cuántas veces se consulta la BD.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import della_soft.services.ProductService as psvc
+import della_soft.services.RolService as rsvc
+from della_soft.services.TTLCache import TTLCache, cache_stats
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ------------------------------------------------------------------
+# TTL, aciertos/fallos y límite de tamaño
+# ------------------------------------------------------------------
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = TTLCache("test_ttl", ttl=10, maxsize=8, clock=clock)
+    loads = []
+
+    def loader():
+        loads.append(clock.now)
+        return len(loads)
+
+    assert cache.get_or_load("k", loader) == 1
+    clock.now = 9.9
+    assert cache.get_or_load("k", loader) == 1
+    clock.now = 10.0
+    assert cache.get_or_load("k", loader) == 2
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = TTLCache("test_lru", ttl=60, maxsize=2, clock=_Clock())
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+    cache.get_or_load("a", lambda: 1)       # "a" pasa a ser la más reciente
+    cache.get_or_load("c", lambda: 3)       # se descarta "b"
+
+    assert cache.stats()["size"] == 2
+    assert cache.get_or_load("b", lambda: "recargado") == "recargado"
+
+
+def test_errors_are_not_cached():
+    cache = TTLCache("test_err", ttl=60, clock=_Clock())
+
+    def boom():
+        raise ValueError("sin datos")
+
+    with pytest.raises(ValueError):
+        cache.get_or_load("k", boom)
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+
+# ------------------------------------------------------------------
+# Services: una consulta por TTL, invalidación al modificar
+# ------------------------------------------------------------------
+def test_roles_hit_db_once(monkeypatch):
+    queries = []
+    monkeypatch.setattr(rsvc, "select_all", lambda: queries.append(1) or ["Admin"])
+
+    for _ in range(5):
+        assert rsvc.select_all_roles_service() == ["Admin"]
+
+    assert len(queries) == 1
+    assert cache_stats()["roles"]["hits"] == 4
+
+
+def test_product_writes_invalidate(monkeypatch):
+    rows = ["P1"]
+    queries = []
+    monkeypatch.setattr(psvc, "select_all", lambda: queries.append(1) or list(rows))
+    monkeypatch.setattr(psvc, "insert_product", lambda p: rows.append(p.name) or p)
+
+    assert psvc.select_all_product_service() == ["P1"]
+    assert psvc.select_all_product_service() == ["P1"]
+    psvc.create_product(id=None, name="P2", description="", product_type="IN_STOCK", price=1)
+
+    assert psvc.select_all_product_service() == ["P1", "P2"]
+    assert len(queries) == 2
+
+
+# ------------------------------------------------------------------
+# Carga async: un fallo consulta en un hilo, un acierto no
+# ------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_async_load_runs_only_misses_in_a_thread(monkeypatch):
+    threads = []
+    real_to_thread = asyncio.to_thread
+
+    async def _to_thread(fn, *args):
+        threads.append(fn)
+        return await real_to_thread(fn, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", _to_thread)
+    loader_threads = []
+    monkeypatch.setattr(psvc, "select_all",
+                        lambda: loader_threads.append(threading.current_thread()) or ["P1"])
+
+    assert await psvc.select_all_product_service_async() == ["P1"]
+    assert await psvc.select_all_product_service_async() == ["P1"]
+    assert await psvc.select_product_async("") == ["P1"]
+
+    assert len(threads) == 1
+    assert loader_threads[0] is not threading.main_thread()
+    assert cache_stats()["products"]["hits"] == 2
+    # el listado async y el sync comparten la caché
+    assert psvc.select_all_product_service() == ["P1"]
+    assert len(loader_threads) == 1